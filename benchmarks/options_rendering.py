@@ -0,0 +1,70 @@
+"""
+Micro-benchmark: OptionsModel.to_sql_options through the public API, on the
+first call of a freshly built instance and memoized on a reused one, versus
+the previous dict()-and-dispatch implementation.
+
+Run from the repository root:  python benchmarks/options_rendering.py
+"""
+import os
+import sys
+import time
+import timeit
+from enum import Enum
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from snowflake_module import CSVFileFormatOptions, CopyOptions, PutOptions
+
+def legacy_to_sql_options(options):
+    sql_parts = []
+    for key, value in options.dict(exclude_none=True).items():
+        if isinstance(value, bool):
+            val_str = "TRUE" if value else "FALSE"
+        elif isinstance(value, (int, float)):
+            val_str = str(value)
+        elif isinstance(value, (list, tuple)):
+            formatted_list = ", ".join(f"'{v}'" for v in value)
+            val_str = f"({formatted_list})"
+        elif isinstance(value, Enum):
+            val_str = f"'{value.value}'"
+        else:
+            val_str = f"'{value}'"
+        key_sql = "COMPRESSION" if key.lower() == "parquetcompression" else key.upper()
+        sql_parts.append(f"{key_sql} = {val_str}")
+    return sql_parts
+
+CASES = {
+    "CSVFileFormatOptions": CSVFileFormatOptions(
+        compression="GZIP",
+        record_delimiter="\n",
+        field_delimiter=",",
+        multi_line=True,
+        parse_header=True,
+        skip_header=1,
+        field_optionally_enclosed_by='"',
+        null_if=["NULL", ""],
+        encoding="UTF8",
+    ),
+    "CopyOptions": CopyOptions(on_error="CONTINUE", purge=True, size_limit=1000),
+    "PutOptions": PutOptions(auto_compress=True, overwrite=True, parallel=8),
+}
+
+def main(number: int = 20000) -> None:
+    for name, options in CASES.items():
+        assert options.to_sql_options() == legacy_to_sql_options(options)
+        legacy = timeit.timeit(lambda: legacy_to_sql_options(options), number=number)
+        # Built outside the timed loop so only the first render of each is measured.
+        fresh_instances = [type(options)(**options.dict(exclude_none=True)) for _ in range(number)]
+        start = time.perf_counter()
+        for instance in fresh_instances:
+            instance.to_sql_options()
+        first = time.perf_counter() - start
+        memoized = timeit.timeit(options.to_sql_options, number=number)
+        print(
+            f"{name:<22} legacy {legacy / number * 1e6:7.2f} us  "
+            f"first {first / number * 1e6:7.2f} us ({legacy / first:4.1f}x)  "
+            f"memoized {memoized / number * 1e6:7.2f} us ({legacy / memoized:5.1f}x)"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+"""
+Benchmark suite: SQL generation and upload orchestration.
+
+Covers OptionsModel.to_sql_options for every options class,
+FileFormat.generate_create_sql, Stage.to_sql, COPY generation for 1k-100k
+files, directory scanning over synthetic trees and concurrent uploads
+against the latency-simulating FakeSnowflake backend. Results are written as
+JSON (by default to benchmarks/results/latest.json, which git ignores);
+``--compare`` checks them against an earlier run and exits non-zero when a
+benchmark got slower than ``--tolerance`` allows.
+
+Run from the repository root:
+    python benchmarks/suite.py                     # default sizes
+    python benchmarks/suite.py --quick             # smoke run
+    python benchmarks/suite.py --full              # up to 1M-file trees
+    python benchmarks/suite.py --output new.json --compare old.json
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional, Tuple, get_args, get_origin, get_type_hints
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from snowflake_module import (
+    AvroFileFormat,
+    AWSExternalStageParams,
+    AzureExternalStageParams,
+    CopyIntoCommand,
+    CSVFileFormat,
+    CursorPool,
+    DirectoryTableParams,
+    FakeSnowflake,
+    FileTransform,
+    GCPExternalStageParams,
+    InternalStageParams,
+    JSONFileFormat,
+    ORCFileFormat,
+    ParquetFileFormat,
+    PutCommand,
+    PutCopyPipeline,
+    Stage,
+    XMLFileFormat,
+)
+from snowflake_module import options as options_module
+from snowflake_module.options import OptionsModel
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+SIZES = {
+    "quick": {"copy_files": [1000, 10000], "tree_files": [10000], "upload_files": 200, "workers": [1, 8]},
+    "default": {"copy_files": [1000, 10000, 100000], "tree_files": [10000, 100000], "upload_files": 1000, "workers": [1, 8, 32]},
+    "full": {"copy_files": [1000, 10000, 100000], "tree_files": [10000, 100000, 1000000], "upload_files": 5000, "workers": [1, 8, 32, 64]},
+}
+
+class _NullCursor:
+    def execute(self, sql: str) -> None:
+        pass
+
+class _CountingTransform(FileTransform):
+    """Consumes the scanned paths without yielding any, so nothing is uploaded."""
+    def __init__(self) -> None:
+        self.count = 0
+
+    def transform(self, file_paths):
+        for _ in file_paths:
+            self.count += 1
+        return iter(())
+
+class Suite:
+    def __init__(self, only: Optional[str] = None, repeat: int = 5) -> None:
+        self.only = only
+        self.repeat = repeat
+        self.results: List[Dict[str, Any]] = []
+
+    def measure(
+        self,
+        name: str,
+        params: Dict[str, Any],
+        func: Callable[[], Any],
+        number: Optional[int] = None,
+        repeat: Optional[int] = None,
+        items: int = 1,
+    ) -> None:
+        """Best of ``repeat`` runs of ``number`` calls; ``items`` is the work per call (e.g. files)."""
+        if self.only and self.only not in name:
+            return
+        repeat = min(repeat or self.repeat, self.repeat)
+        if number is None:
+            number, _ = timeit.Timer(func).autorange()
+        best = min(timeit.repeat(func, number=number, repeat=repeat)) / number
+        result = {
+            "name": name,
+            "params": params,
+            "seconds": best,
+            "items_per_second": items / best if best > 0 else None,
+            "number": number,
+            "repeat": repeat,
+        }
+        self.results.append(result)
+        label = ", ".join(f"{key}={value}" for key, value in params.items())
+        print(f"{name:<28} {label:<48} {best * 1e6:12.2f} us  {result['items_per_second'] or 0:14.0f} items/s")
+
+def sample_options(cls: type) -> Dict[str, Any]:
+    """A value for every field of an options class, derived from its annotations."""
+    values: Dict[str, Any] = {}
+    for name, annotation in get_type_hints(cls).items():
+        if name not in cls.__fields__:
+            continue
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        annotation = args[0] if args else annotation
+        if annotation is bool:
+            values[name] = True
+        elif annotation is int:
+            values[name] = 1
+        elif get_origin(annotation) in (list, List, tuple, Tuple):
+            values[name] = ["NULL", ""]
+        elif isinstance(annotation, type) and issubclass(annotation, Enum):
+            values[name] = next(iter(annotation))
+        else:
+            values[name] = "x"
+    return values
+
+def bench_options(suite: Suite) -> None:
+    classes = [
+        value for value in vars(options_module).values()
+        if isinstance(value, type) and issubclass(value, OptionsModel) and value is not OptionsModel
+    ]
+    for cls in classes:
+        values = sample_options(cls)
+        options = cls(**values)
+        # A new instance pays validation and its first render; a reused one
+        # returns its memoized fragments.
+        suite.measure("to_sql_options", {"class": cls.__name__, "mode": "fresh"}, lambda: cls(**values).to_sql_options())
+        suite.measure("to_sql_options", {"class": cls.__name__, "mode": "memoized"}, options.to_sql_options)
+
+def bench_ddl(suite: Suite) -> None:
+    cursor = _NullCursor()
+    for cls in (CSVFileFormat, JSONFileFormat, AvroFileFormat, ORCFileFormat, ParquetFileFormat, XMLFileFormat):
+        file_format = cls("fmt", "DB", "S", cursor, {})
+        file_format.options = type(file_format.options)(**sample_options(type(file_format.options)))
+        suite.measure("generate_create_sql", {"class": cls.__name__}, file_format.generate_create_sql)
+    stages = {
+        "internal": Stage(name="DB.S.st", type="internal", file_format="DB.S.fmt", comment="c",
+                          internal_params=InternalStageParams(encryption_type="SNOWFLAKE_SSE"),
+                          directory_params=DirectoryTableParams(enable=True, auto_refresh=True)),
+        "aws": Stage(name="DB.S.st", type="aws", aws_params=AWSExternalStageParams(
+            url="s3://bucket/path", storage_integration="INT", encryption_type="AWS_SSE_S3")),
+        "gcp": Stage(name="DB.S.st", type="gcp", gcp_params=GCPExternalStageParams(
+            url="gcs://bucket/path", storage_integration="INT")),
+        "azure": Stage(name="DB.S.st", type="azure", azure_params=AzureExternalStageParams(
+            url="azure://account.blob.core.windows.net/container", storage_integration="INT")),
+    }
+    for stage_type, stage in stages.items():
+        suite.measure("stage_to_sql", {"type": stage_type}, stage.to_sql)
+
+def bench_copy(suite: Suite, sizes: List[int]) -> None:
+    cursor = _NullCursor()
+    for count in sizes:
+        files = [f"daily/part-{index:07d}.csv.gz" for index in range(count)]
+        file_sizes = {file: 1024 + (index * 7919) % 65536 for index, file in enumerate(files)}
+        command = CopyIntoCommand("DB", "S", "T", cursor, "@st", copy_options={"on_error": "CONTINUE"},
+                                  files=files, file_sizes=file_sizes)
+        if count <= command.max_files_per_copy:
+            suite.measure("generate_copy_sql", {"files": count}, command.generate_copy_sql, items=count)
+        suite.measure("generate_copy_statements", {"files": count}, command.generate_copy_statements,
+                      repeat=3, items=count)
+
+def make_tree(root: str, count: int, per_directory: int = 1000, content: bytes = b"") -> None:
+    for index in range(count):
+        directory = os.path.join(root, f"d{index // per_directory:05d}")
+        if index % per_directory == 0:
+            os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, f"f{index:07d}.csv"), "wb") as handle:
+            handle.write(content)
+
+def bench_scan(suite: Suite, sizes: List[int], scratch: str) -> None:
+    # PutCommand.execute with a transform that drops every path: the scan
+    # plus the fixed per-run setup, without any PUT.
+    command = PutCommand("DB", "S", _NullCursor(), "@st", {})
+
+    def scan(root: str, expected: int) -> None:
+        counter = _CountingTransform()
+        command.execute(root, transforms=[counter])
+        assert counter.count == expected, counter.count
+
+    for count in sizes:
+        root = os.path.join(scratch, f"tree_{count}")
+        started = time.perf_counter()
+        make_tree(root, count)
+        print(f"  built {count}-file tree in {time.perf_counter() - started:.1f}s")
+        suite.measure("scan_directory", {"files": count},
+                      lambda: scan(root, count), number=1, repeat=3, items=count)
+        shutil.rmtree(root)
+
+def bench_upload(suite: Suite, count: int, workers: List[int], scratch: str, latency: float) -> None:
+    root = os.path.join(scratch, "upload")
+    make_tree(root, count, content=b"a,b,c\n" * 16)
+    for max_workers in workers:
+        backend = FakeSnowflake(root=os.path.join(scratch, f"stage_{max_workers}"), latency=latency)
+        pool = CursorPool(backend.cursor, max_size=max_workers)
+        command = PutCommand("DB", "S", pool, "@DB.S.st", {"overwrite": True})
+        suite.measure("put_concurrent", {"files": count, "workers": max_workers, "latency": latency},
+                      lambda: command.execute_concurrent(root, max_workers=max_workers),
+                      number=1, repeat=1, items=count)
+        pool.close()
+    backend = FakeSnowflake(root=os.path.join(scratch, "stage_pipeline"), latency=latency)
+    pool = CursorPool(backend.cursor, max_size=max(workers) + 2)
+    pipeline = PutCopyPipeline(
+        PutCommand("DB", "S", pool, "@DB.S.st", {"overwrite": True}),
+        CopyIntoCommand("DB", "S", "T", pool, "@DB.S.st", copy_options={"force": True}),
+        batch_size=100, put_workers=max(workers), copy_workers=2,
+    )
+    suite.measure("put_copy_pipeline", {"files": count, "workers": max(workers), "latency": latency},
+                  lambda: pipeline.run(root), number=1, repeat=1, items=count)
+    pool.close()
+
+def metadata() -> Dict[str, Any]:
+    try:
+        revision = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        revision = None
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "revision": revision,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+def _key(result: Dict[str, Any]) -> str:
+    return result["name"] + json.dumps(result["params"], sort_keys=True)
+
+def compare(results: List[Dict[str, Any]], baseline_path: str, tolerance: float) -> int:
+    """Print per-benchmark ratios against a baseline run; return the number of regressions."""
+    with open(baseline_path, "r", encoding="utf-8") as handle:
+        baseline = {_key(result): result for result in json.load(handle)["results"]}
+    regressions = 0
+    print(f"\nComparison with {baseline_path} (tolerance {tolerance:.0%}):")
+    for result in results:
+        previous = baseline.get(_key(result))
+        if previous is None:
+            continue
+        ratio = result["seconds"] / previous["seconds"]
+        flag = ""
+        if ratio > 1 + tolerance:
+            flag = "  REGRESSION"
+            regressions += 1
+        label = ", ".join(f"{key}={value}" for key, value in result["params"].items())
+        print(f"{result['name']:<28} {label:<48} {ratio:6.2f}x{flag}")
+    return regressions
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    scale = parser.add_mutually_exclusive_group()
+    scale.add_argument("--quick", action="store_true", help="small sizes for a smoke run")
+    scale.add_argument("--full", action="store_true", help="largest sizes, including a 1M-file tree")
+    parser.add_argument("--only", help="run benchmarks whose name contains this string")
+    parser.add_argument("--latency", type=float, default=0.002, help="fake per-statement latency in seconds")
+    parser.add_argument(
+        "--output", default=os.path.join(RESULTS_DIR, "latest.json"), help="where to write the JSON results"
+    )
+    parser.add_argument("--compare", help="baseline JSON results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown before flagging")
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.INFO)
+    sizes = SIZES["quick" if args.quick else "full" if args.full else "default"]
+    suite = Suite(args.only, repeat=2 if args.quick else 5)
+    scratch = tempfile.mkdtemp(prefix="snowflake_bench_")
+    try:
+        bench_options(suite)
+        bench_ddl(suite)
+        bench_copy(suite, sizes["copy_files"])
+        if not args.only or "scan" in args.only:
+            bench_scan(suite, sizes["tree_files"], scratch)
+        if not args.only or "put" in args.only:
+            bench_upload(suite, sizes["upload_files"], sizes["workers"], scratch, args.latency)
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as handle:
+        json.dump({"metadata": metadata(), "results": suite.results}, handle, indent=2)
+    print(f"\nWrote {len(suite.results)} results to {args.output}")
+    if args.compare:
+        return 1 if compare(suite.results, args.compare, args.tolerance) else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,38 +1,138 @@
-from .base import SnowflakeObject, SnowflakeError
-from .options import (
-    OptionsModel,
-    CSVFileFormatOptions,
-    JSONFileFormatOptions,
-    AvroFileFormatOptions,
-    ORCFileFormatOptions,
-    ParquetFileFormatOptions,
-    XMLFileFormatOptions,
-    StageOptions,
-    CopyOptions,
-    PutOptions,
-    CompressionEnum,
-    BinaryFormatEnum,
-    ParquetCompressionEnum,
-    EncryptionTypeEnum,
-)
-from .file_formats import (
-    FileFormat,
-    CSVFileFormat,
-    JSONFileFormat,
-    AvroFileFormat,
-    ORCFileFormat,
-    ParquetFileFormat,
-    XMLFileFormat,
-)
-from .stages import (
-    Stage,
-    InternalStageParams,
-    DirectoryTableParams,
-    AWSExternalStageParams,
-    GCPExternalStageParams,
-    AzureExternalStageParams,
-)
-from .data_operations import CopyIntoCommand, PutCommand
+# Public names are resolved lazily (PEP 562) so that importing one command
+# does not build every pydantic model in the package. Measure with
+#   python -X importtime -c "from snowflake_module import PutCommand"
+import importlib
+from typing import TYPE_CHECKING, Any, Dict, List
+
+if TYPE_CHECKING:
+    from .base import SnowflakeObject, SnowflakeError
+    from .options import (
+        OptionsModel,
+        CSVFileFormatOptions,
+        JSONFileFormatOptions,
+        AvroFileFormatOptions,
+        ORCFileFormatOptions,
+        ParquetFileFormatOptions,
+        XMLFileFormatOptions,
+        StageOptions,
+        CopyOptions,
+        PutOptions,
+        CompressionEnum,
+        BinaryFormatEnum,
+        ParquetCompressionEnum,
+        EncryptionTypeEnum,
+    )
+    from .file_formats import (
+        FileFormat,
+        CSVFileFormat,
+        JSONFileFormat,
+        AvroFileFormat,
+        ORCFileFormat,
+        ParquetFileFormat,
+        XMLFileFormat,
+    )
+    from .stages import (
+        Stage,
+        InternalStageParams,
+        DirectoryTableParams,
+        AWSExternalStageParams,
+        GCPExternalStageParams,
+        AzureExternalStageParams,
+    )
+    from .data_operations import CopyIntoCommand, CopyBatchResult, CopySummary, PutCommand, PutResult, PutSummary, FileTransform
+    from .coalescing import FileCoalescer, CoalescedBundle
+    from .splitting import FileSplitter
+    from .manifest import UploadManifest
+    from .pool import CursorPool
+    from .batch import SqlBatch, BatchResult
+    from .compression import FileCompressor, CodecSampler, CodecChoice, CodecEstimate
+    from .provisioning import ProvisioningPlan, ProvisioningReport, NodeResult, load_spec
+    from .deployment import Deployer, DeploymentPlan, PlannedChange, StateCache
+    from .pipeline import PutCopyPipeline, PipelineSummary
+    from .load_report import CopyLoadReport, CopyFileResult
+    from .instrumentation import StatementHook, StatementEvent, LatencyHistogram, JsonlExporter, register_hook, unregister_hook, instrument
+    from .flight_recorder import FlightRecorder, ProgressLogger, enable_flight_recorder, disable_flight_recorder
+    from .fake import FakeSnowflake, FakeCursor, FakeProgrammingError
+    from .profiling import RunProfiler
+    from .journal import JobJournal
+
+_EXPORTS: Dict[str, str] = {
+    "SnowflakeObject": "base",
+    "SnowflakeError": "base",
+    "OptionsModel": "options",
+    "CSVFileFormatOptions": "options",
+    "JSONFileFormatOptions": "options",
+    "AvroFileFormatOptions": "options",
+    "ORCFileFormatOptions": "options",
+    "ParquetFileFormatOptions": "options",
+    "XMLFileFormatOptions": "options",
+    "StageOptions": "options",
+    "CopyOptions": "options",
+    "PutOptions": "options",
+    "CompressionEnum": "options",
+    "BinaryFormatEnum": "options",
+    "ParquetCompressionEnum": "options",
+    "EncryptionTypeEnum": "options",
+    "FileFormat": "file_formats",
+    "CSVFileFormat": "file_formats",
+    "JSONFileFormat": "file_formats",
+    "AvroFileFormat": "file_formats",
+    "ORCFileFormat": "file_formats",
+    "ParquetFileFormat": "file_formats",
+    "XMLFileFormat": "file_formats",
+    "Stage": "stages",
+    "InternalStageParams": "stages",
+    "DirectoryTableParams": "stages",
+    "AWSExternalStageParams": "stages",
+    "GCPExternalStageParams": "stages",
+    "AzureExternalStageParams": "stages",
+    "CopyIntoCommand": "data_operations",
+    "CopyBatchResult": "data_operations",
+    "CopySummary": "data_operations",
+    "PutCommand": "data_operations",
+    "PutResult": "data_operations",
+    "PutSummary": "data_operations",
+    "FileTransform": "data_operations",
+    "FileCoalescer": "coalescing",
+    "CoalescedBundle": "coalescing",
+    "FileSplitter": "splitting",
+    "UploadManifest": "manifest",
+    "FileCompressor": "compression",
+    "CodecSampler": "compression",
+    "CodecChoice": "compression",
+    "CodecEstimate": "compression",
+    "CursorPool": "pool",
+    "SqlBatch": "batch",
+    "BatchResult": "batch",
+    "ProvisioningPlan": "provisioning",
+    "ProvisioningReport": "provisioning",
+    "NodeResult": "provisioning",
+    "load_spec": "provisioning",
+    "Deployer": "deployment",
+    "DeploymentPlan": "deployment",
+    "PlannedChange": "deployment",
+    "StateCache": "deployment",
+    "PutCopyPipeline": "pipeline",
+    "PipelineSummary": "pipeline",
+    "CopyLoadReport": "load_report",
+    "CopyFileResult": "load_report",
+    "StatementHook": "instrumentation",
+    "StatementEvent": "instrumentation",
+    "LatencyHistogram": "instrumentation",
+    "JsonlExporter": "instrumentation",
+    "register_hook": "instrumentation",
+    "unregister_hook": "instrumentation",
+    "instrument": "instrumentation",
+    "FlightRecorder": "flight_recorder",
+    "ProgressLogger": "flight_recorder",
+    "enable_flight_recorder": "flight_recorder",
+    "disable_flight_recorder": "flight_recorder",
+    "FakeSnowflake": "fake",
+    "FakeCursor": "fake",
+    "FakeProgrammingError": "fake",
+    "RunProfiler": "profiling",
+    "JobJournal": "journal",
+}
 
 __all__ = [
     "SnowflakeObject",
@@ -65,5 +165,60 @@ __all__ = [
     "GCPExternalStageParams",
     "AzureExternalStageParams",
     "CopyIntoCommand",
+    "CopyBatchResult",
+    "CopySummary",
     "PutCommand",
+    "PutResult",
+    "PutSummary",
+    "FileTransform",
+    "FileCoalescer",
+    "CoalescedBundle",
+    "FileSplitter",
+    "UploadManifest",
+    "FileCompressor",
+    "CodecSampler",
+    "CodecChoice",
+    "CodecEstimate",
+    "CursorPool",
+    "SqlBatch",
+    "BatchResult",
+    "ProvisioningPlan",
+    "ProvisioningReport",
+    "NodeResult",
+    "load_spec",
+    "Deployer",
+    "DeploymentPlan",
+    "PlannedChange",
+    "StateCache",
+    "PutCopyPipeline",
+    "PipelineSummary",
+    "CopyLoadReport",
+    "CopyFileResult",
+    "StatementHook",
+    "StatementEvent",
+    "LatencyHistogram",
+    "JsonlExporter",
+    "register_hook",
+    "unregister_hook",
+    "instrument",
+    "FlightRecorder",
+    "ProgressLogger",
+    "enable_flight_recorder",
+    "disable_flight_recorder",
+    "FakeSnowflake",
+    "FakeCursor",
+    "FakeProgrammingError",
+    "RunProfiler",
+    "JobJournal",
 ]
+
+def __getattr__(name: str) -> Any:
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -1,5 +1,11 @@
 import logging
-from typing import Any, Optional
+from contextlib import nullcontext
+from typing import TYPE_CHECKING, Any, Callable, ContextManager, Optional
+
+from . import flight_recorder, instrumentation, profiling
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
 
 logger = logging.getLogger(__name__)
 
@@ -7,11 +13,57 @@ class SnowflakeError(Exception):
     """Custom exception for Snowflake operations."""
     pass
 
+def checkout_cursor(cursor: Any) -> ContextManager[Any]:
+    """
+    Context manager yielding a usable cursor: a checked-out cursor when
+    ``cursor`` is a CursorPool, otherwise ``cursor`` itself.
+    """
+    pool_checkout = getattr(cursor, "checkout", None)
+    if callable(pool_checkout):
+        return pool_checkout()
+    return nullcontext(cursor)
+
+def run_statement(
+    obj: Any,
+    sql: str,
+    cursor: Any,
+    consume: Optional[Callable[[Any], Any]] = None,
+    **execute_kwargs: Any,
+) -> Any:
+    """
+    Run ``sql`` on ``cursor`` (a cursor or CursorPool) with the logging,
+    flight recording, statement hooks and profiling every statement of this
+    package goes through; ``obj`` is the object the statement is reported
+    for. ``execute_kwargs`` are passed on to ``cursor.execute``. Failures
+    are raised as SnowflakeError.
+    """
+    sql = sql.strip()
+    hooks = instrumentation._HOOKS
+    event = instrumentation.start_event(obj, sql, hooks) if hooks else None
+    recorder = flight_recorder._RECORDER
+    try:
+        _log_statement(obj, sql, recorder)
+        with checkout_cursor(cursor) as active_cursor, profiling.phase("execute"):
+            active_cursor.execute(sql, **execute_kwargs)
+            result = consume(active_cursor) if consume is not None else None
+        if recorder is None:
+            logger.info("SQL executed successfully.")
+    except Exception as exc:
+        _log_failure(exc, recorder)
+        if event is not None:
+            instrumentation.fail_event(event, hooks, exc)
+        raise SnowflakeError(f"SQL execution failed: {exc}") from exc
+    if event is not None:
+        instrumentation.finish_event(event, hooks, result)
+    return result
+
 class SnowflakeObject:
     """
     Base class for all Snowflake objects.
     
     Provides basic initialization and SQL execution functionality.
+    ``cursor`` may be a plain cursor or a CursorPool, in which case a cursor
+    is checked out of the pool for every statement.
     """
     def __init__(
         self,
@@ -42,15 +94,133 @@ class SnowflakeObject:
         """
         return f"{self.database}.{self.schema}.{self.name}" if self.name else f"{self.database}.{self.schema}"
 
-    def execute_sql(self, sql: str) -> None:
+    def checkout(self, cursor: Any = None) -> ContextManager[Any]:
+        """
+        Context manager yielding the cursor to run a statement on: ``cursor``
+        when given, a pooled cursor when this object was built with a pool,
+        otherwise the object's own cursor.
+        """
+        return checkout_cursor(cursor if cursor is not None else self.cursor)
+
+    def execute_sql(self, sql: str, cursor: Any = None, consume: Optional[Callable[[Any], Any]] = None) -> Any:
         """
         Executes the provided SQL while logging the command and any errors.
+        An explicit cursor may be passed to run on something other than the
+        object's own cursor (e.g. a per-thread cursor in concurrent uploads).
+        ``consume`` is called with the cursor after the statement ran, while
+        it is still checked out, to read the result set; its return value is
+        returned.
+        """
+        return run_statement(self, sql, cursor if cursor is not None else self.cursor, consume)
+
+    async def execute_sql_async(
+        self,
+        sql: str,
+        cursor: Any = None,
+        executor: Optional["Executor"] = None,
+        poll_interval: float = 0.5,
+        submit_async: bool = True,
+        consume: Optional[Callable[[Any], Any]] = None,
+    ) -> Any:
+        """
+        Async counterpart of execute_sql.
+
+        When the cursor supports asynchronous query submission (Snowflake's
+        ``execute_async`` plus ``connection.get_query_status_throw_if_error``)
+        the query is submitted and its status polled every ``poll_interval``
+        seconds without blocking the event loop. Otherwise execute_sql runs
+        on ``executor`` (the loop's default executor when None), which bounds
+        how many statements are in flight.
+        """
+        import asyncio  # deferred: asyncio is costly to import and only needed here
+
+        loop = asyncio.get_running_loop()
+        if cursor is None and callable(getattr(self.cursor, "acquire", None)):
+            pool = self.cursor
+            if submit_async:
+                pooled_cursor = await loop.run_in_executor(executor, pool.acquire)
+                if _supports_async_submission(pooled_cursor):
+                    try:
+                        return await self._submit_and_poll(pooled_cursor, sql.strip(), poll_interval, consume, executor)
+                    finally:
+                        pool.release(pooled_cursor)
+                # Hand the cursor back before queueing the blocking call, or
+                # executor threads waiting on the pool could starve it.
+                pool.release(pooled_cursor)
+            return await loop.run_in_executor(executor, profiling.carry(self.execute_sql), sql, None, consume)
+        active_cursor = cursor if cursor is not None else self.cursor
+        if submit_async and _supports_async_submission(active_cursor):
+            return await self._submit_and_poll(active_cursor, sql.strip(), poll_interval, consume, executor)
+        return await loop.run_in_executor(executor, profiling.carry(self.execute_sql), sql, active_cursor, consume)
+
+    async def _submit_and_poll(
+        self,
+        cursor: Any,
+        sql: str,
+        poll_interval: float,
+        consume: Optional[Callable[[Any], Any]] = None,
+        executor: Optional["Executor"] = None,
+    ) -> Any:
+        """
+        Submit ``sql`` and poll until it finishes. Every connector call may do
+        a network round trip, so each one runs on ``executor``; only the
+        sleeps between polls happen on the event loop.
         """
-        sql = sql.strip()
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        connection = cursor.connection
+        hooks = instrumentation._HOOKS
+        event = instrumentation.start_event(self, sql, hooks) if hooks else None
+        recorder = flight_recorder._RECORDER
         try:
-            logger.info(f"Executing SQL:\n{sql}")
-            self.cursor.execute(sql)
-            logger.info("SQL executed successfully.")
+            _log_statement(self, sql, recorder, "Submitting SQL asynchronously")
+            with profiling.phase("execute"):
+                await loop.run_in_executor(executor, cursor.execute_async, sql)
+                query_id = cursor.sfqid
+                while True:
+                    status = await loop.run_in_executor(
+                        executor, connection.get_query_status_throw_if_error, query_id
+                    )
+                    if not connection.is_still_running(status):
+                        break
+                    await asyncio.sleep(poll_interval)
+                await loop.run_in_executor(executor, cursor.get_results_from_sfqid, query_id)
+                result = await loop.run_in_executor(executor, consume, cursor) if consume is not None else None
+            if recorder is None:
+                logger.info("SQL executed successfully.")
         except Exception as exc:
-            logger.error(f"SQL execution failed: {exc}", exc_info=True)
+            _log_failure(exc, recorder)
+            if event is not None:
+                instrumentation.fail_event(event, hooks, exc)
             raise SnowflakeError(f"SQL execution failed: {exc}") from exc
+        if event is not None:
+            instrumentation.finish_event(event, hooks, result)
+        return result
+
+def _log_statement(
+    obj: Any,
+    sql: str,
+    recorder: Optional["flight_recorder.FlightRecorder"],
+    action: str = "Executing SQL",
+) -> None:
+    # Lazy %-formatting: nothing is rendered unless the record is emitted.
+    if recorder is None:
+        logger.info("%s:\n%s", action, sql)
+    else:
+        recorder.record(getattr(obj, "full_name", ""), sql)
+        logger.debug("%s: %s", action, recorder.truncate(sql))
+
+def _log_failure(exc: Exception, recorder: Optional["flight_recorder.FlightRecorder"]) -> None:
+    logger.error("SQL execution failed: %s", exc, exc_info=True)
+    if recorder is not None:
+        recorder.dump(exc)
+
+def _supports_async_submission(cursor: Any) -> bool:
+    connection = getattr(cursor, "connection", None)
+    return (
+        callable(getattr(cursor, "execute_async", None))
+        and callable(getattr(cursor, "get_results_from_sfqid", None))
+        and callable(getattr(connection, "get_query_status_throw_if_error", None))
+        and callable(getattr(connection, "is_still_running", None))
+    )
@@ -0,0 +1,124 @@
+import inspect
+from dataclasses import dataclass
+from typing import Any, List, Optional
+
+from .base import SnowflakeError, checkout_cursor, logger, run_statement
+
+@dataclass
+class BatchResult:
+    """
+    Outcome of one statement in a SqlBatch.
+
+    ``status`` is ``"pending"`` before execution, then ``"success"``,
+    ``"failed"`` (its chunk raised) or ``"skipped"`` (an earlier chunk failed).
+    """
+    sql: str
+    source: Any = None
+    status: str = "pending"
+    error: Optional[str] = None
+    chunk: Optional[int] = None
+
+class SqlBatch:
+    """
+    Collects generated SQL and sends it as multi-statement scripts.
+
+    Objects added with ``add`` are rendered with the generator this package
+    already uses for them (FileFormat.generate_create_sql, Stage.to_sql,
+    CopyIntoCommand.generate_copy_sql); plain SQL goes through ``add_sql``.
+    On ``execute`` (or on leaving the ``with`` block without an exception)
+    statements are sent in chunks of ``chunk_size`` as one script each, using
+    the Snowflake connector's ``num_statements`` argument when the cursor
+    supports it and one ``execute`` per statement otherwise. Every script or
+    statement is logged, recorded and reported to statement hooks like any
+    other statement (see run_statement).
+
+    Every statement gets a BatchResult pointing back at the object that
+    produced it. A failing chunk marks all of its statements failed, since a
+    script does not report which statement broke, and stops the batch with a
+    SnowflakeError; statements after it are marked skipped. Without
+    multi-statement support failures are attributed to the exact statement.
+    """
+    def __init__(
+        self,
+        cursor: Any,
+        chunk_size: int = 50,
+        multi_statement: Optional[bool] = None,
+    ) -> None:
+        if not hasattr(cursor, "execute"):
+            raise ValueError("Cursor must have an 'execute' method.")
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1.")
+        self.cursor = cursor
+        self.chunk_size = chunk_size
+        self.multi_statement = multi_statement
+        self.results: List[BatchResult] = []
+
+    def __enter__(self) -> "SqlBatch":
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        if exc_type is None:
+            self.execute()
+
+    def add(self, obj: Any, if_not_exists: bool = False) -> BatchResult:
+        """
+        Queue the SQL generated by a file format, stage or COPY command.
+        ``if_not_exists`` applies to the CREATE statements only.
+        """
+        if hasattr(obj, "generate_create_sql"):
+            sql = obj.generate_create_sql(if_not_exists)
+        elif hasattr(obj, "generate_copy_sql"):
+            if if_not_exists:
+                raise ValueError("if_not_exists does not apply to COPY statements.")
+            sql = obj.generate_copy_sql()
+        elif hasattr(obj, "to_sql"):
+            sql = obj.to_sql(if_not_exists=if_not_exists)
+        else:
+            raise ValueError(f"Cannot generate SQL for object of type {type(obj).__name__}.")
+        return self.add_sql(sql, source=obj)
+
+    def add_sql(self, sql: str, source: Any = None) -> BatchResult:
+        result = BatchResult(sql=sql.strip().rstrip(";"), source=source)
+        self.results.append(result)
+        return result
+
+    def execute(self) -> List[BatchResult]:
+        """Run every pending statement and return all results."""
+        pending = [result for result in self.results if result.status == "pending"]
+        chunks = [pending[i:i + self.chunk_size] for i in range(0, len(pending), self.chunk_size)]
+        with checkout_cursor(self.cursor) as cursor:
+            multi_statement = self._supports_multi_statement(cursor)
+            for index, chunk in enumerate(chunks):
+                for result in chunk:
+                    result.chunk = index
+                failed = chunk
+                try:
+                    logger.info(f"Executing batch chunk {index + 1}/{len(chunks)} ({len(chunk)} statements).")
+                    if multi_statement:
+                        script = ";\n".join(result.sql for result in chunk) + ";"
+                        run_statement(self, script, cursor, num_statements=len(chunk))
+                    else:
+                        for result in chunk:
+                            failed = [result]
+                            run_statement(self, result.sql, cursor)
+                            result.status = "success"
+                except SnowflakeError as exc:
+                    logger.error(f"Batch chunk {index + 1} failed: {exc}")
+                    for result in failed:
+                        result.status, result.error = "failed", str(exc.__cause__ or exc)
+                    for result in pending:
+                        if result.status == "pending":
+                            result.status = "skipped"
+                    raise
+                for result in chunk:
+                    result.status = "success"
+        logger.info(f"Batch executed {len(pending)} statements in {len(chunks)} chunks.")
+        return self.results
+
+    def _supports_multi_statement(self, cursor: Any) -> bool:
+        if self.multi_statement is not None:
+            return self.multi_statement
+        try:
+            return "num_statements" in inspect.signature(cursor.execute).parameters
+        except (TypeError, ValueError):
+            return False
@@ -0,0 +1,174 @@
+import gzip
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+from .base import logger
+from .data_operations import FileTransform
+from .options import CSVFileFormatOptions, JSONFileFormatOptions
+
+# Extensions of files that are already compressed and therefore never merged.
+COMPRESSED_EXTENSIONS = {".gz", ".bz2", ".br", ".zst", ".deflate", ".raw_deflate", ".zip"}
+
+@dataclass
+class CoalescedBundle:
+    """
+    A gzip bundle produced by FileCoalescer and the files packed into it.
+    """
+    path: str
+    extension: str
+    source_files: List[str] = field(default_factory=list)
+    source_bytes: int = 0
+    compressed_bytes: int = 0
+
+def _header_line_count(options: Optional[CSVFileFormatOptions]) -> int:
+    """Number of leading header records in each file for these CSV options."""
+    if options is None:
+        return 0
+    if options.skip_header:
+        return options.skip_header
+    return 1 if options.parse_header else 0
+
+def _record_delimiter(options: Optional[CSVFileFormatOptions]) -> bytes:
+    delimiter = options.record_delimiter if options is not None else None
+    return (delimiter or "\n").encode(getattr(options, "encoding", None) or "utf-8")
+
+def _strip_header(data: bytes, delimiter: bytes, header_lines: int) -> bytes:
+    position = 0
+    for _ in range(header_lines):
+        index = data.find(delimiter, position)
+        if index == -1:
+            return b""
+        position = index + len(delimiter)
+    return data[position:]
+
+class FileCoalescer(FileTransform):
+    """
+    Packs many small files of the same format into target-sized gzip bundles.
+
+    When ``file_format_options`` are given, only files with that format's
+    extension (``file_extension``, else ``.csv``/``.json``) are merged unless
+    ``extensions`` says otherwise; without options every uncompressed file is
+    eligible. Files are grouped by extension; each group gets its own open
+    bundle, which is closed and yielded once its compressed size reaches
+    ``target_size``.
+    Files at or above ``small_file_threshold`` and already-compressed files
+    are passed through untouched. For CSV, the header records of the first
+    file in a bundle are kept and those of every following file dropped, so
+    ``skip_header``/``parse_header`` still apply exactly once per bundle.
+
+    Every closed bundle is appended to ``bundles.jsonl`` in ``output_dir``
+    (and kept in ``self.bundles``) so staged bundles can be traced back to
+    their original files; ``sources`` reports the same mapping.
+    """
+    def __init__(
+        self,
+        output_dir: str,
+        file_format_options: Optional[Union[CSVFileFormatOptions, JSONFileFormatOptions]] = None,
+        target_size: int = 128 * 1024 * 1024,
+        small_file_threshold: int = 16 * 1024 * 1024,
+        extensions: Optional[Sequence[str]] = None,
+        compresslevel: int = 6,
+        manifest_name: str = "bundles.jsonl",
+    ) -> None:
+        if target_size <= 0:
+            raise ValueError("target_size must be positive.")
+        if isinstance(file_format_options, JSONFileFormatOptions) and file_format_options.strip_outer_array:
+            raise ValueError("JSON files with strip_outer_array cannot be concatenated into bundles.")
+        os.makedirs(output_dir, exist_ok=True)
+        self.output_dir = output_dir
+        self.csv_options = file_format_options if isinstance(file_format_options, CSVFileFormatOptions) else None
+        self.target_size = target_size
+        self.small_file_threshold = small_file_threshold
+        if extensions is None and file_format_options is not None:
+            default = ".csv" if self.csv_options is not None else ".json"
+            extensions = [file_format_options.file_extension or default]
+        self.extensions = {ext.lower() for ext in extensions} if extensions else None
+        self.compresslevel = compresslevel
+        self.manifest_path = os.path.join(output_dir, manifest_name)
+        self.bundles: List[CoalescedBundle] = []
+        self._sources: Dict[str, Dict[str, int]] = {}
+        self._header_lines = _header_line_count(self.csv_options)
+        self._delimiter = _record_delimiter(self.csv_options)
+        self._sequence = 0
+
+    def transform(self, file_paths: Iterable[str]) -> Iterator[str]:
+        open_bundles: Dict[str, "_OpenBundle"] = {}
+        try:
+            for file_path in file_paths:
+                extension = os.path.splitext(file_path)[1].lower()
+                if not self._is_mergeable(file_path, extension):
+                    yield file_path
+                    continue
+                bundle = open_bundles.get(extension)
+                if bundle is None:
+                    bundle = open_bundles[extension] = self._open_bundle(extension)
+                bundle.add(file_path, self._header_lines, self._delimiter)
+                if bundle.compressed_size() >= self.target_size:
+                    del open_bundles[extension]
+                    yield self._close_bundle(bundle)
+            for extension in list(open_bundles):
+                yield self._close_bundle(open_bundles.pop(extension))
+        finally:
+            for bundle in open_bundles.values():
+                bundle.abort()
+
+    def sources(self, output_path: str) -> Dict[str, int]:
+        return self._sources.get(output_path) or {output_path: 1}
+
+    def _is_mergeable(self, file_path: str, extension: str) -> bool:
+        if extension in COMPRESSED_EXTENSIONS:
+            return False
+        if self.extensions is not None and extension not in self.extensions:
+            return False
+        return os.path.getsize(file_path) < self.small_file_threshold
+
+    def _open_bundle(self, extension: str) -> "_OpenBundle":
+        self._sequence += 1
+        suffix = extension or ".dat"
+        path = os.path.join(self.output_dir, f"bundle_{self._sequence:06d}{suffix}.gz")
+        return _OpenBundle(CoalescedBundle(path=path, extension=extension), self.compresslevel)
+
+    def _close_bundle(self, bundle: "_OpenBundle") -> str:
+        record = bundle.close()
+        self.bundles.append(record)
+        self._sources[record.path] = {source: 1 for source in record.source_files}
+        with open(self.manifest_path, "a", encoding="utf-8") as manifest:
+            manifest.write(json.dumps(record.__dict__) + "\n")
+        logger.info(
+            f"Coalesced {len(record.source_files)} files into {record.path} "
+            f"({record.source_bytes} -> {record.compressed_bytes} bytes)."
+        )
+        return record.path
+
+class _OpenBundle:
+    def __init__(self, record: CoalescedBundle, compresslevel: int) -> None:
+        self.record = record
+        self._raw = open(record.path, "wb")
+        self._gzip = gzip.GzipFile(fileobj=self._raw, mode="wb", compresslevel=compresslevel)
+
+    def add(self, file_path: str, header_lines: int, delimiter: bytes) -> None:
+        with open(file_path, "rb") as source:
+            data = source.read()
+        if self.record.source_files and header_lines:
+            data = _strip_header(data, delimiter, header_lines)
+        if data and not data.endswith(delimiter):
+            data += delimiter
+        self._gzip.write(data)
+        self.record.source_files.append(file_path)
+        self.record.source_bytes += len(data)
+
+    def compressed_size(self) -> int:
+        return self._raw.tell()
+
+    def close(self) -> CoalescedBundle:
+        self._gzip.close()
+        self.record.compressed_bytes = self._raw.tell()
+        self._raw.close()
+        return self.record
+
+    def abort(self) -> None:
+        self._gzip.close()
+        self._raw.close()
+        os.remove(self.record.path)
@@ -0,0 +1,328 @@
+import bz2
+import hashlib
+import multiprocessing
+import os
+import time
+import zlib
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .base import logger
+from .coalescing import COMPRESSED_EXTENSIONS
+from .data_operations import FileTransform
+from .options import CompressionEnum
+
+_READ_SIZE = 1024 * 1024
+
+# File extension Snowflake associates with each codec.
+CODEC_EXTENSIONS: Dict[CompressionEnum, str] = {
+    CompressionEnum.GZIP: ".gz",
+    CompressionEnum.BZ2: ".bz2",
+    CompressionEnum.BROTLI: ".br",
+    CompressionEnum.ZSTD: ".zst",
+    CompressionEnum.DEFLATE: ".deflate",
+    CompressionEnum.RAW_DEFLATE: ".raw_deflate",
+}
+
+_DEFAULT_LEVELS: Dict[CompressionEnum, int] = {
+    CompressionEnum.GZIP: 6,
+    CompressionEnum.BZ2: 9,
+    CompressionEnum.BROTLI: 5,
+    CompressionEnum.ZSTD: 3,
+    CompressionEnum.DEFLATE: 6,
+    CompressionEnum.RAW_DEFLATE: 6,
+}
+
+class _BrotliCompressor:
+    def __init__(self, level: int) -> None:
+        import brotli
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.finish()
+
+def compressor(codec: Union[CompressionEnum, str], level: Optional[int] = None) -> Any:
+    """
+    Return a streaming compressor (``compress``/``flush``) for a codec.
+
+    GZIP, BZ2, DEFLATE and RAW_DEFLATE use the standard library; ZSTD and
+    BROTLI need the optional ``zstandard`` and ``brotli`` packages.
+    """
+    codec = CompressionEnum(codec)
+    if codec not in CODEC_EXTENSIONS:
+        raise ValueError(f"Unsupported local compression codec: {codec.value}")
+    level = _DEFAULT_LEVELS[codec] if level is None else level
+    if codec == CompressionEnum.GZIP:
+        return zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    if codec == CompressionEnum.DEFLATE:
+        return zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS)
+    if codec == CompressionEnum.RAW_DEFLATE:
+        return zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    if codec == CompressionEnum.BZ2:
+        return bz2.BZ2Compressor(level)
+    try:
+        if codec == CompressionEnum.ZSTD:
+            import zstandard
+            return zstandard.ZstdCompressor(level=level).compressobj()
+        return _BrotliCompressor(level)
+    except ImportError as e:
+        raise ImportError(
+            f"{codec.value} compression requires the optional "
+            f"'{'zstandard' if codec == CompressionEnum.ZSTD else 'brotli'}' package."
+        ) from e
+
+def _compress_file(source_path: str, target_path: str, codec: str, level: Optional[int]) -> Tuple[int, int]:
+    """Compress one file; runs inside a worker process."""
+    engine = compressor(codec, level)
+    temporary_path = f"{target_path}.tmp"
+    read = 0
+    with open(source_path, "rb") as source, open(temporary_path, "wb") as target:
+        for block in iter(lambda: source.read(_READ_SIZE), b""):
+            read += len(block)
+            target.write(engine.compress(block))
+        target.write(engine.flush())
+        written = target.tell()
+    os.replace(temporary_path, target_path)
+    return read, written
+
+def _worker_context() -> Any:
+    """
+    Start method for compression workers. The pool is created while upload
+    threads may hold locks, and a forked child inherits those locks held
+    forever, so workers are started by a forkserver (spawn where that is
+    unavailable) instead of being forked from the uploading process.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+class FileCompressor(FileTransform):
+    """
+    Compresses files locally across a process pool before PUT.
+
+    Compressed copies are written to ``output_dir`` (one subdirectory per
+    source directory, so equal file names never collide) and yielded in scan
+    order. Up to ``max_pending`` files are compressed ahead of the upload, so
+    the next batch is being compressed while the current one is uploading.
+    The PUT is issued with ``SOURCE_COMPRESSION`` set to the codec and
+    ``AUTO_COMPRESS = FALSE``; files that already carry the codec's extension
+    are passed through. Files compressed with a different codec cannot share
+    that SOURCE_COMPRESSION: they are left out of the upload, logged and
+    listed in ``self.rejected`` so the rest of the run goes on.
+
+    ``output_dir`` is scratch space owned by the caller and is not cleaned up.
+    """
+    def __init__(
+        self,
+        output_dir: str,
+        codec: Union[CompressionEnum, str] = CompressionEnum.GZIP,
+        level: Optional[int] = None,
+        max_workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+    ) -> None:
+        self.codec = CompressionEnum(codec)
+        compressor(self.codec, level)  # fail fast on unsupported codecs or missing packages
+        os.makedirs(output_dir, exist_ok=True)
+        self.output_dir = output_dir
+        self.level = level
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_pending = max_pending or 2 * self.max_workers
+        self.extension = CODEC_EXTENSIONS[self.codec]
+        self.rejected: List[str] = []
+        self._sources: Dict[str, Dict[str, int]] = {}
+
+    def put_options(self) -> Dict[str, Any]:
+        return {"source_compression": self.codec.value, "auto_compress": False}
+
+    def sources(self, output_path: str) -> Dict[str, int]:
+        return self._sources.get(output_path) or {output_path: 1}
+
+    def transform(self, file_paths: Iterable[str]) -> Iterator[str]:
+        pending: Deque[Tuple[str, Future]] = deque()
+        source_bytes = compressed_bytes = 0
+        with ProcessPoolExecutor(max_workers=self.max_workers, mp_context=_worker_context()) as executor:
+            try:
+                for file_path in file_paths:
+                    extension = os.path.splitext(file_path)[1].lower()
+                    if extension == self.extension:
+                        yield file_path
+                        continue
+                    if extension in COMPRESSED_EXTENSIONS:
+                        self.rejected.append(file_path)
+                        logger.error(
+                            "Skipping %s: already compressed, cannot upload it with SOURCE_COMPRESSION = %s.",
+                            file_path, self.codec.value,
+                        )
+                        continue
+                    target_path = self._target_path(file_path)
+                    self._sources[target_path] = {file_path: 1}
+                    future = executor.submit(_compress_file, file_path, target_path, self.codec.value, self.level)
+                    pending.append((target_path, future))
+                    while len(pending) >= self.max_pending:
+                        target_path, future = pending.popleft()
+                        read, written = future.result()
+                        source_bytes += read
+                        compressed_bytes += written
+                        yield target_path
+                while pending:
+                    target_path, future = pending.popleft()
+                    read, written = future.result()
+                    source_bytes += read
+                    compressed_bytes += written
+                    yield target_path
+            finally:
+                for _, future in pending:
+                    future.cancel()
+        logger.info(
+            f"Compressed {source_bytes} bytes to {compressed_bytes} bytes with {self.codec.value}."
+        )
+
+    def _target_path(self, file_path: str) -> str:
+        directory, name = os.path.split(os.path.abspath(file_path))
+        bucket = hashlib.sha1(directory.encode("utf-8")).hexdigest()[:12]
+        target_directory = os.path.join(self.output_dir, bucket)
+        os.makedirs(target_directory, exist_ok=True)
+        return os.path.join(target_directory, name + self.extension)
+
+@dataclass
+class CodecEstimate:
+    """
+    Measured behavior of one codec on the sampled data.
+    """
+    codec: CompressionEnum
+    ratio: float
+    throughput: float
+    estimated_seconds: float
+
+@dataclass
+class CodecChoice:
+    """
+    Result of CodecSampler.select: the winning codec and all estimates.
+    """
+    codec: CompressionEnum
+    estimates: List[CodecEstimate] = field(default_factory=list)
+
+    def apply(
+        self,
+        put_command: Any = None,
+        file_format: Any = None,
+        output_dir: Optional[str] = None,
+        level: Optional[int] = None,
+        max_workers: Optional[int] = None,
+    ) -> Optional["FileCompressor"]:
+        """
+        Configure a load for the chosen codec and return the FileCompressor
+        that produces it, to be passed in the PutCommand's ``transforms``.
+
+        The compressor's put_options set SOURCE_COMPRESSION and turn
+        AUTO_COMPRESS off for its run, so ``put_command`` is left alone unless
+        NONE won: then it gets ``AUTO_COMPRESS = FALSE``, keeping PUT from
+        gzipping the files, and None is returned. ``file_format`` gets the
+        matching COMPRESSION. ``output_dir`` (scratch space for the compressed
+        copies) is required unless NONE won.
+        """
+        if self.codec != CompressionEnum.NONE and output_dir is None:
+            raise ValueError(f"output_dir is required to compress files locally with {self.codec.value}.")
+        if file_format is not None:
+            if "compression" not in type(file_format.options).__fields__:
+                raise ValueError(f"File format type '{file_format.format_type}' has no COMPRESSION option.")
+            file_format.options = _replace_options(file_format.options, {"compression": self.codec})
+        if self.codec != CompressionEnum.NONE:
+            return FileCompressor(output_dir, self.codec, level=level, max_workers=max_workers)
+        if put_command is not None:
+            put_command.options = _replace_options(
+                put_command.options, {"source_compression": CompressionEnum.NONE.value, "auto_compress": False}
+            )
+        return None
+
+def _replace_options(options: Any, overrides: Dict[str, Any]) -> Any:
+    # Options models are immutable; build a validated copy instead.
+    return type(options)(**{**options.dict(exclude_none=True), **overrides})
+
+class CodecSampler:
+    """
+    Picks a compression codec by compressing samples of the input locally.
+
+    From up to ``max_files`` files spread over the input, ``samples_per_file``
+    chunks of ``sample_size`` bytes (start, middle, end, ...) are compressed
+    with every candidate codec to measure ratio and single-core throughput.
+    The estimated time for the whole input is
+    ``size / (throughput * compress_workers) + size * ratio / bandwidth``;
+    the codec minimizing it wins. ``NONE`` is always a candidate. Codecs
+    whose optional package is missing are skipped unless named explicitly.
+    """
+    def __init__(
+        self,
+        bandwidth: float,
+        codecs: Optional[Sequence[Union[CompressionEnum, str]]] = None,
+        compress_workers: int = 1,
+        sample_size: int = 1024 * 1024,
+        samples_per_file: int = 3,
+        max_files: int = 5,
+    ) -> None:
+        if bandwidth <= 0:
+            raise ValueError("bandwidth must be positive (bytes per second).")
+        if codecs is None:
+            candidates = []
+            for codec in CODEC_EXTENSIONS:
+                try:
+                    compressor(codec)
+                except ImportError:
+                    continue
+                candidates.append(codec)
+        else:
+            candidates = [CompressionEnum(codec) for codec in codecs if CompressionEnum(codec) != CompressionEnum.NONE]
+            for codec in candidates:
+                compressor(codec)
+        self.bandwidth = bandwidth
+        self.codecs = candidates
+        self.compress_workers = max(1, compress_workers)
+        self.sample_size = sample_size
+        self.samples_per_file = max(1, samples_per_file)
+        self.max_files = max(1, max_files)
+
+    def select(self, file_paths: Sequence[str]) -> CodecChoice:
+        if not file_paths:
+            raise ValueError("No files to sample.")
+        total_size = sum(os.path.getsize(path) for path in file_paths)
+        samples = self._read_samples(file_paths)
+        sampled = sum(len(sample) for sample in samples) or 1
+        estimates = [CodecEstimate(CompressionEnum.NONE, 1.0, float("inf"), total_size / self.bandwidth)]
+        for codec in self.codecs:
+            compressed = 0
+            start = time.perf_counter()
+            for sample in samples:
+                engine = compressor(codec)
+                compressed += len(engine.compress(sample)) + len(engine.flush())
+            elapsed = max(time.perf_counter() - start, 1e-9)
+            ratio = compressed / sampled
+            throughput = sampled / elapsed
+            seconds = total_size / (throughput * self.compress_workers) + total_size * ratio / self.bandwidth
+            estimates.append(CodecEstimate(codec, ratio, throughput, seconds))
+        best = min(estimates, key=lambda estimate: estimate.estimated_seconds)
+        logger.info(
+            f"Selected {best.codec.value} compression: ratio {best.ratio:.3f}, "
+            f"estimated {best.estimated_seconds:.1f}s for {total_size} bytes."
+        )
+        return CodecChoice(best.codec, estimates)
+
+    def _read_samples(self, file_paths: Sequence[str]) -> List[bytes]:
+        step = max(1, len(file_paths) // self.max_files)
+        samples = []
+        for file_path in list(file_paths)[::step][: self.max_files]:
+            size = os.path.getsize(file_path)
+            with open(file_path, "rb") as source:
+                for index in range(self.samples_per_file):
+                    span = max(0, size - self.sample_size)
+                    offset = index * span // max(1, self.samples_per_file - 1)
+                    source.seek(offset)
+                    sample = source.read(self.sample_size)
+                    if sample:
+                        samples.append(sample)
+                    if size <= self.sample_size:
+                        break
+        return samples
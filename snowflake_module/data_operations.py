@@ -1,14 +1,105 @@
+import functools
+import heapq
+import math
 import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from queue import Queue
 from textwrap import dedent
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 
 from pydantic import ValidationError
-from .base import SnowflakeObject, logger
+from .base import SnowflakeError, SnowflakeObject, logger
+from .flight_recorder import ProgressLogger
+from .journal import statement_key
+from .load_report import CopyLoadReport, collect_copy_report
 from .options import CopyOptions, PutOptions, OptionsModel
+from .profiling import carry, profiled, timed, timed_phase
+
+if TYPE_CHECKING:
+    from .journal import JobJournal
+    from .manifest import UploadManifest
+
+# Snowflake accepts at most this many entries in a COPY INTO ... FILES list.
+MAX_FILES_PER_COPY = 1000
+
+@dataclass
+class CopyBatchResult:
+    """
+    Outcome of one COPY statement; ``files`` is None for a pattern or
+    whole-stage load without a FILES list.
+    """
+    files: Optional[List[str]]
+    sql: str
+    success: bool
+    error: Optional[str] = None
+    elapsed: float = 0.0
+    report: Optional[CopyLoadReport] = None
+
+@dataclass
+class CopySummary:
+    """
+    Aggregated outcome of a COPY INTO split into several statements.
+    """
+    results: List[CopyBatchResult] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def total(self) -> int:
+        return len(self.results)
+
+    @property
+    def succeeded(self) -> List[CopyBatchResult]:
+        return [result for result in self.results if result.success]
+
+    @property
+    def failed(self) -> List[CopyBatchResult]:
+        return [result for result in self.results if not result.success]
+
+    @property
+    def ok(self) -> bool:
+        return all(result.success for result in self.results)
+
+    @property
+    def failed_files(self) -> List[str]:
+        return [file for result in self.failed for file in (result.files or [])]
+
+    def load_report(self, table: str = "") -> CopyLoadReport:
+        """The per-batch load reports merged into one, timed over the whole run."""
+        report = CopyLoadReport(table=table, elapsed=self.elapsed)
+        for result in self.results:
+            if result.report is not None:
+                report.merge(result.report)
+        return report
+
+    def __str__(self) -> str:
+        return (
+            f"{len(self.succeeded)}/{self.total} COPY batches succeeded, "
+            f"{len(self.failed)} failed in {self.elapsed:.2f}s"
+        )
 
 class CopyIntoCommand(SnowflakeObject):
     """
     Represents a COPY INTO command.
+
+    A ``files`` list longer than ``max_files_per_copy`` (Snowflake's limit is
+    1000) is split into batches balanced by ``file_sizes`` (bytes per entry of
+    ``files``; entries without a known size count as the average), each loaded
+    by its own COPY statement. See ``execute_batches``.
+
+    ``execute`` returns a CopyLoadReport built by streaming the COPY result
+    set (``fetch_size`` rows at a time): per-file status and row counts,
+    totals, and rows/s and bytes/s throughput.
+
+    ``profile`` (an output directory, or True for the working directory)
+    profiles ``execute`` and ``execute_batches`` runs; see RunProfiler. When
+    None, the SNOWFLAKE_MODULE_PROFILE environment variable decides.
+
+    With a JobJournal, every COPY statement that succeeds is recorded and a
+    rerun of the same command skips the statements already recorded.
     """
     def __init__(
         self,
@@ -22,13 +113,24 @@ class CopyIntoCommand(SnowflakeObject):
         copy_options: Dict[str, Any] = {},
         files: Optional[List[str]] = None,
         pattern: Optional[str] = None,
+        file_sizes: Optional[Dict[str, int]] = None,
+        max_files_per_copy: int = MAX_FILES_PER_COPY,
+        fetch_size: int = 1000,
+        profile: Union[bool, str, None] = None,
     ) -> None:
         super().__init__(name="", database=database, schema=schema, cursor=cursor, no_name=True)
+        if not 1 <= max_files_per_copy <= MAX_FILES_PER_COPY:
+            raise ValueError(f"max_files_per_copy must be between 1 and {MAX_FILES_PER_COPY}.")
         self.table_name = table_name.strip()
         self.source = source.strip()
         self.files = files
         self.pattern = pattern
+        self.file_sizes = file_sizes or {}
+        self.max_files_per_copy = max_files_per_copy
+        self.fetch_size = fetch_size
         self.file_format = file_format
+        self.profile = profile
+        start = time.perf_counter()
         try:
             self.options = OptionsModel.parse_obj(options)
         except ValidationError as e:
@@ -37,20 +139,184 @@ class CopyIntoCommand(SnowflakeObject):
             self.copy_options = CopyOptions(**copy_options)
         except ValidationError as e:
             raise ValueError(f"Invalid copy_options: {e}") from e
+        self._validation_time = time.perf_counter() - start
+
+    @profiled("copy")
+    def execute(self, journal: Optional["JobJournal"] = None) -> CopyLoadReport:
+        if len(self.files or ()) > self.max_files_per_copy:
+            summary = self.execute_batches(journal=journal)
+            if not summary.ok:
+                raise SnowflakeError(f"COPY INTO '{self.table_name}' failed: {summary}")
+            report = summary.load_report(self.table_name)
+        else:
+            sql = self.generate_copy_sql()
+            key = statement_key(sql)
+            if journal is not None and journal.done("copy", self.full_table_name, key):
+                logger.info("COPY INTO '%s' already completed according to the journal.", self.table_name)
+                return CopyLoadReport(table=self.table_name)
+            start = time.perf_counter()
+            report = self.execute_sql(sql, consume=self._collect_report)
+            report.elapsed = time.perf_counter() - start
+            if journal is not None:
+                journal.record("copy", self.full_table_name, [key])
+        logger.info(f"COPY INTO command executed: {report}")
+        return report
+
+    async def execute_async(self, executor: Optional[Executor] = None, poll_interval: float = 0.5) -> CopyLoadReport:
+        """
+        Async counterpart of execute; see SnowflakeObject.execute_sql_async.
+        File batches run concurrently when the command uses a CursorPool and
+        one after another on a plain cursor.
+        """
+        import asyncio
+
+        start = time.perf_counter()
+        run = functools.partial(
+            self.execute_sql_async, executor=executor, poll_interval=poll_interval, consume=self._collect_report
+        )
+        if callable(getattr(self.cursor, "checkout", None)):
+            reports = await asyncio.gather(*(run(sql) for sql in self.generate_copy_statements()))
+        else:
+            # Create each coroutine only when it is awaited, so a failing
+            # batch leaves no never-awaited coroutines behind.
+            reports = [await run(sql) for sql in self.generate_copy_statements()]
+        report = CopyLoadReport(table=self.table_name)
+        for batch_report in reports:
+            report.merge(batch_report)
+        report.elapsed = time.perf_counter() - start
+        logger.info(f"COPY INTO command executed: {report}")
+        return report
+
+    @profiled("copy_batches")
+    def execute_batches(
+        self,
+        cursor_factory: Optional[Callable[[], Any]] = None,
+        max_workers: int = 4,
+        num_batches: Optional[int] = None,
+        journal: Optional["JobJournal"] = None,
+    ) -> CopySummary:
+        """
+        Run the load as one COPY statement per file batch and aggregate the
+        outcomes; a failing batch does not stop the others.
 
-    def execute(self) -> None:
-        sql = self.generate_copy_sql()
-        self.execute_sql(sql)
-        logger.info(f"COPY INTO command executed for table '{self.table_name}'.")
+        Batches run concurrently on up to ``max_workers`` threads, each with
+        its own cursor from ``cursor_factory`` or, without a factory, from
+        the command's CursorPool. With a plain cursor and no factory they run
+        one after another on that cursor. ``num_batches`` asks for more
+        batches than the FILES limit requires, to spread a load over more
+        concurrent statements. With a ``journal``, batches recorded as
+        loaded by an earlier run are skipped and each successful batch is
+        recorded.
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1.")
+        batches = self.file_batches(num_batches)
+        if journal is not None:
+            batches = [
+                files for files in batches
+                if not journal.done("copy", self.full_table_name, statement_key(self.generate_copy_sql(files)))
+            ]
+            if not batches:
+                logger.info("COPY INTO '%s' already completed according to the journal.", self.table_name)
+                return CopySummary()
+        if cursor_factory is None and not callable(getattr(self.cursor, "checkout", None)):
+            max_workers = 1
+        max_workers = min(max_workers, len(batches))
+        local = threading.local()
+        cursors: List[Any] = []
+        cursors_lock = threading.Lock()
 
-    def generate_copy_sql(self) -> str:
-        copy_into = f"COPY INTO {self.database}.{self.schema}.{self.table_name}"
+        def run(files: Optional[List[str]]) -> CopyBatchResult:
+            sql = self.generate_copy_sql(files)
+            start = time.perf_counter()
+            try:
+                cursor = getattr(local, "cursor", None)
+                if cursor is None and cursor_factory is not None:
+                    cursor = cursor_factory()
+                    if not hasattr(cursor, "execute"):
+                        raise ValueError("Cursor must have an 'execute' method.")
+                    local.cursor = cursor
+                    with cursors_lock:
+                        cursors.append(cursor)
+                report = self.execute_sql(sql, cursor=cursor, consume=self._collect_report)
+            except Exception as exc:
+                return CopyBatchResult(files, sql, False, str(exc), time.perf_counter() - start)
+            report.elapsed = time.perf_counter() - start
+            if journal is not None:
+                journal.record("copy", self.full_table_name, [statement_key(sql)])
+            return CopyBatchResult(files, sql, True, None, report.elapsed, report)
+
+        summary = CopySummary()
+        start = time.perf_counter()
+        try:
+            if max_workers == 1:
+                summary.results = [run(files) for files in batches]
+            else:
+                with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="copy") as executor:
+                    summary.results = list(executor.map(run, batches))
+        finally:
+            for cursor in cursors:
+                close = getattr(cursor, "close", None)
+                if callable(close):
+                    close()
+        summary.elapsed = time.perf_counter() - start
+        logger.info("COPY INTO '%s' finished: %s", self.table_name, summary)
+        _log_failures(
+            "COPY batch failed",
+            [(f"{len(result.files or ())} files", result.error) for result in summary.failed],
+        )
+        return summary
+
+    def file_batches(self, num_batches: Optional[int] = None) -> List[Optional[List[str]]]:
+        """
+        Split ``files`` into batches of at most ``max_files_per_copy`` entries
+        with roughly equal total size (largest files first, each into the
+        currently lightest batch). Files keep their original order within a
+        batch. Returns ``[None]`` when there is no FILES list.
+        """
+        if not self.files:
+            return [None]
+        files = list(self.files)
+        count = max(math.ceil(len(files) / self.max_files_per_copy), num_batches or 1)
+        count = min(count, len(files))
+        if count == 1:
+            return [files]
+        known = [self.file_sizes[file] for file in files if file in self.file_sizes]
+        default_size = sum(known) / len(known) if known else 1
+        order = sorted(range(len(files)), key=lambda i: self.file_sizes.get(files[i], default_size), reverse=True)
+        capacity = math.ceil(len(files) / count)
+        # (total size, batch index); full batches are not pushed back.
+        heap = [(0.0, index) for index in range(count)]
+        members: List[List[int]] = [[] for _ in range(count)]
+        for i in order:
+            total, index = heapq.heappop(heap)
+            members[index].append(i)
+            if len(members[index]) < capacity:
+                heapq.heappush(heap, (total + self.file_sizes.get(files[i], default_size), index))
+        return [[files[i] for i in sorted(batch)] for batch in members if batch]
+
+    def generate_copy_statements(self, num_batches: Optional[int] = None) -> List[str]:
+        """One COPY statement per file batch (see file_batches)."""
+        return [self.generate_copy_sql(files) for files in self.file_batches(num_batches)]
+
+    @timed_phase("render")
+    def generate_copy_sql(self, files: Optional[List[str]] = None) -> str:
+        """
+        The COPY statement for ``files`` (default: the command's own list,
+        which must then fit in one FILES clause).
+        """
+        if files is None and len(self.files or ()) > self.max_files_per_copy:
+            raise ValueError(
+                f"{len(self.files)} files exceed the FILES limit of {self.max_files_per_copy}; "
+                "use generate_copy_statements or execute_batches."
+            )
+        copy_into = f"COPY INTO {self.full_table_name}"
         from_clause = f"FROM {self.source}"
-        files_clause = self._generate_files_clause()
+        files_clause = self._generate_files_clause(files)
         pattern_clause = f"PATTERN = '{self.pattern}'" if self.pattern else ""
         file_format_clause = f"FILE_FORMAT = {self.file_format}" if self.file_format else ""
-        options_sql = "\n".join(self.options.to_sql_options())
-        copy_options_sql = "\n".join(self.copy_options.to_sql_options())
+        options_sql = self.options.to_sql_clause()
+        copy_options_sql = self.copy_options.to_sql_clause()
         sql_parts = [
             copy_into,
             from_clause,
@@ -62,15 +328,131 @@ class CopyIntoCommand(SnowflakeObject):
         ]
         return "\n".join(part for part in sql_parts if part).strip()
 
-    def _generate_files_clause(self) -> str:
-        if self.files:
-            formatted_files = ", ".join(f"'{file}'" for file in self.files)
+    @property
+    def full_table_name(self) -> str:
+        return f"{self.database}.{self.schema}.{self.table_name}"
+
+    def _collect_report(self, cursor: Any) -> CopyLoadReport:
+        return collect_copy_report(cursor, self.table_name, self.file_sizes, self.fetch_size)
+
+    def _generate_files_clause(self, files: Optional[List[str]] = None) -> str:
+        files = self.files if files is None else files
+        if files:
+            formatted_files = ", ".join(f"'{file}'" for file in files)
             return f"FILES = ({formatted_files})"
         return ""
 
+class FileTransform(ABC):
+    """
+    Base class for local preprocessing stages applied before PUT.
+
+    A transform consumes the stream of scanned file paths and yields the
+    paths that should actually be uploaded. Implementations should stay
+    lazy so scanning, preprocessing and uploading overlap. Transforms that
+    yield new files report where each came from through ``sources``, so the
+    manifest and the journal can record the original files.
+    """
+    @abstractmethod
+    def transform(self, file_paths: Iterable[str]) -> Iterator[str]:
+        """Yield the paths to upload for the scanned ``file_paths``."""
+
+    def sources(self, output_path: str) -> Dict[str, int]:
+        """
+        The input paths a yielded path was made from, each with the number
+        of outputs made from that input; an input is only uploaded once all
+        of its outputs are. The default treats the path as an input passed
+        through unchanged.
+        """
+        return {output_path: 1}
+
+    def put_options(self) -> Dict[str, Any]:
+        """PUT options this transform requires, overriding the command's own."""
+        return {}
+
+class _SourceTracker:
+    """
+    Maps uploaded paths back through a chain of transforms to the scanned
+    files they were made from. ``complete`` is called once per successfully
+    handled path and returns the scanned files all of whose outputs have now
+    been handled; a scanned file with a failed output is never returned.
+    """
+    def __init__(self, transforms: Sequence[FileTransform]) -> None:
+        self.transforms = list(transforms)
+        self._counts: Dict[Tuple[int, str], int] = {}
+        self._lock = threading.Lock()
+
+    def complete(self, file_path: str) -> List[str]:
+        completed: List[str] = []
+        with self._lock:
+            self._settle(len(self.transforms) - 1, file_path, completed)
+        return completed
+
+    def _settle(self, level: int, file_path: str, completed: List[str]) -> None:
+        if level < 0:
+            completed.append(file_path)
+            return
+        for source, total in self.transforms[level].sources(file_path).items():
+            key = (level, source)
+            count = self._counts.get(key, 0) + 1
+            if count < total:
+                self._counts[key] = count
+                continue
+            self._counts.pop(key, None)
+            self._settle(level - 1, source, completed)
+
+@dataclass
+class PutResult:
+    """
+    Outcome of uploading a single file.
+    """
+    file_path: str
+    success: bool
+    error: Optional[str] = None
+    elapsed: float = 0.0
+
+@dataclass
+class PutSummary:
+    """
+    Aggregated outcome of a concurrent PUT run.
+    """
+    results: List[PutResult] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def total(self) -> int:
+        return len(self.results)
+
+    @property
+    def succeeded(self) -> List[PutResult]:
+        return [result for result in self.results if result.success]
+
+    @property
+    def failed(self) -> List[PutResult]:
+        return [result for result in self.results if not result.success]
+
+    @property
+    def ok(self) -> bool:
+        return all(result.success for result in self.results)
+
+    def __str__(self) -> str:
+        return (
+            f"{len(self.succeeded)}/{self.total} files uploaded, "
+            f"{len(self.failed)} failed in {self.elapsed:.2f}s"
+        )
+
 class PutCommand(SnowflakeObject):
     """
     Represents a PUT command to upload files to a stage.
+
+    ``profile`` (an output directory, or True for the working directory)
+    profiles ``execute`` and ``execute_concurrent`` runs; see RunProfiler.
+    When None, the SNOWFLAKE_MODULE_PROFILE environment variable decides.
+
+    With a JobJournal, uploaded files are recorded (in batches, see
+    JobJournal.add) and a rerun skips the files already recorded. The
+    journal is keyed by the scanned files and checked before any transform
+    runs; a file a transform replaced is recorded once every output made
+    from it (see FileTransform.sources) has been uploaded.
     """
     def __init__(
         self,
@@ -79,37 +461,287 @@ class PutCommand(SnowflakeObject):
         cursor: Any,
         stage_name: str,
         options: Dict[str, Any],
+        profile: Union[bool, str, None] = None,
     ) -> None:
         super().__init__(name="", database=database, schema=schema, cursor=cursor, no_name=True)
         self.stage_name = stage_name.strip()
+        self.profile = profile
+        start = time.perf_counter()
         try:
             self.options = PutOptions(**options)
         except ValidationError as e:
             raise ValueError(f"Invalid PUT options: {e}") from e
+        self._validation_time = time.perf_counter() - start
+
+    @profiled("put")
+    def execute(
+        self,
+        directory_path: str,
+        transforms: Sequence[FileTransform] = (),
+        manifest: Optional["UploadManifest"] = None,
+        journal: Optional["JobJournal"] = None,
+    ) -> None:
+        options = self._run_options(transforms)
+        tracker = _SourceTracker(transforms)
+        progress = ProgressLogger(f"PUT to '{self.stage_name}'", log=logger)
+        try:
+            for file_path in self._iter_upload_paths(directory_path, transforms, manifest, journal):
+                sql = self._generate_put_sql(file_path, options)
+                self.execute_sql(sql)
+                progress.advance(size=_uploaded_size(file_path))
+                self._record_upload(tracker, file_path, manifest, journal)
+        except BaseException as exc:
+            progress.abort(exc)
+            raise
+        else:
+            progress.finish()
+        finally:
+            if manifest is not None:
+                manifest.flush()
+            if journal is not None:
+                journal.flush()
 
-    def execute(self, directory_path: str) -> None:
-        file_paths = self._get_valid_file_paths(directory_path)
-        for file_path in file_paths:
-            sql = self._generate_put_sql(file_path)
-            self.execute_sql(sql)
-            logger.info(f"Uploaded file: {file_path}")
+    async def execute_async(
+        self,
+        directory_path: str,
+        transforms: Sequence[FileTransform] = (),
+        manifest: Optional["UploadManifest"] = None,
+        executor: Optional[Executor] = None,
+        journal: Optional["JobJournal"] = None,
+    ) -> None:
+        """
+        Async counterpart of execute. PUT runs client-side and cannot be
+        submitted asynchronously, so the scan and uploads run on ``executor``.
+        """
+        import asyncio  # deferred: asyncio is costly to import and only needed here
+
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
+            executor, carry(functools.partial(self.execute, directory_path, transforms, manifest, journal))
+        )
+
+    @profiled("put_concurrent")
+    def execute_concurrent(
+        self,
+        directory_path: str,
+        cursor_factory: Optional[Callable[[], Any]] = None,
+        max_workers: int = 8,
+        queue_size: Optional[int] = None,
+        transforms: Sequence[FileTransform] = (),
+        manifest: Optional["UploadManifest"] = None,
+        journal: Optional["JobJournal"] = None,
+    ) -> PutSummary:
+        """
+        Upload every file in the directory using a pool of worker threads.
+
+        Each worker lazily obtains its own cursor from ``cursor_factory`` so
+        no cursor is shared between threads. Without a factory the command
+        must have been built with a CursorPool, which then hands each upload
+        its own pooled cursor. The directory is scanned on the calling
+        thread and fed to the workers through a bounded queue (``queue_size``
+        entries, default ``4 * max_workers``), so uploads start immediately
+        and memory stays flat for very large trees. ``transforms`` are
+        applied to the scanned paths, in order, before they are queued. With
+        a ``manifest``, files already staged unchanged are skipped and
+        successful uploads are recorded; likewise with a ``journal``, for
+        files uploaded by an interrupted run. Failures are recorded per file
+        instead of aborting the run; inspect the returned summary.
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1.")
+        if cursor_factory is None and not callable(getattr(self.cursor, "checkout", None)):
+            raise ValueError("A cursor_factory is required unless the command uses a CursorPool.")
+        options = self._run_options(transforms)
+        tracker = _SourceTracker(transforms)
+        file_paths = self._iter_upload_paths(directory_path, transforms, manifest, journal)
+        work: "Queue[Optional[str]]" = Queue(maxsize=queue_size or 4 * max_workers)
+        cursors: List[Any] = []
+        cursors_lock = threading.Lock()
+        progress = ProgressLogger(f"PUT to '{self.stage_name}'", log=logger)
+
+        def worker() -> List[PutResult]:
+            results: List[PutResult] = []
+            cursor = None
+            while True:
+                file_path = work.get()
+                if file_path is None:
+                    return results
+                start = time.perf_counter()
+                try:
+                    if cursor is None and cursor_factory is not None:
+                        new_cursor = cursor_factory()
+                        if not hasattr(new_cursor, "execute"):
+                            raise ValueError("Cursor must have an 'execute' method.")
+                        cursor = new_cursor
+                        with cursors_lock:
+                            cursors.append(cursor)
+                    self.execute_sql(self._generate_put_sql(file_path, options), cursor=cursor)
+                except Exception as exc:
+                    # A failing cursor factory must not kill the worker, or the
+                    # scanner would block forever on the bounded queue.
+                    results.append(PutResult(file_path, False, str(exc), time.perf_counter() - start))
+                    progress.advance(failed=1)
+                else:
+                    results.append(PutResult(file_path, True, None, time.perf_counter() - start))
+                    progress.advance(size=_uploaded_size(file_path))
+                    self._record_upload(tracker, file_path, manifest, journal)
+
+        summary = PutSummary()
+        start = time.perf_counter()
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="put") as executor:
+                futures = [executor.submit(carry(worker)) for _ in range(max_workers)]
+                try:
+                    for file_path in file_paths:
+                        work.put(file_path)
+                finally:
+                    for _ in futures:
+                        work.put(None)
+                for future in futures:
+                    summary.results.extend(future.result())
+        finally:
+            for cursor in cursors:
+                close = getattr(cursor, "close", None)
+                if callable(close):
+                    close()
+            if manifest is not None:
+                manifest.flush()
+            if journal is not None:
+                journal.flush()
+        summary.elapsed = time.perf_counter() - start
+        logger.info("PUT to '%s' finished: %s", self.stage_name, summary)
+        _log_failures("Failed to upload file", [(result.file_path, result.error) for result in summary.failed])
+        return summary
+
+    def _statement_bytes(self, sql: str) -> Optional[int]:
+        """Size of the local file a generated PUT uploads (for instrumentation)."""
+        prefix = "PUT 'file://"
+        if not sql.startswith(prefix):
+            return None
+        end = sql.find("'", len(prefix))
+        try:
+            return os.path.getsize(sql[len(prefix):end])
+        except OSError:
+            return None
 
-    def _generate_put_sql(self, file_path: str) -> str:
+    @timed_phase("render")
+    def _generate_put_sql(self, file_path: str, options: Optional[PutOptions] = None) -> str:
         normalized_path = file_path.replace(os.sep, '/')
         put_command = f"PUT 'file://{normalized_path}' '{self.stage_name}'"
-        options_sql = "\n".join(self.options.to_sql_options())
+        options_sql = (options or self.options).to_sql_clause()
         return f"{put_command}\n{options_sql}".strip()
 
+    @timed_phase("validate")
+    def _run_options(self, transforms: Sequence[FileTransform]) -> PutOptions:
+        overrides: Dict[str, Any] = {}
+        for transform in transforms:
+            overrides.update(transform.put_options())
+        if not overrides:
+            return self.options
+        try:
+            return PutOptions(**{**self.options.dict(exclude_none=True), **overrides})
+        except ValidationError as e:
+            raise ValueError(f"Invalid PUT options: {e}") from e
+
+    def _record_upload(
+        self,
+        tracker: _SourceTracker,
+        file_path: str,
+        manifest: Optional["UploadManifest"],
+        journal: Optional["JobJournal"],
+    ) -> None:
+        """Record the scanned files completed by uploading ``file_path``."""
+        if manifest is None and journal is None:
+            return
+        for source in tracker.complete(file_path):
+            if manifest is not None:
+                manifest.record(source)
+            if journal is not None:
+                journal.add("put", self.stage_name, os.path.abspath(source))
+
     def _get_valid_file_paths(self, directory_path: str) -> List[str]:
+        return list(self._iter_file_paths(directory_path))
+
+    def _iter_upload_paths(
+        self,
+        directory_path: str,
+        transforms: Sequence[FileTransform],
+        manifest: Optional["UploadManifest"] = None,
+        journal: Optional["JobJournal"] = None,
+        journal_kind: str = "put",
+        journal_scope: Optional[str] = None,
+    ) -> Iterator[str]:
+        file_paths = timed(self._iter_file_paths(directory_path), "scan")
+        if journal is not None:
+            scope = journal_scope if journal_scope is not None else self.stage_name
+            file_paths = (
+                file_path for file_path in file_paths
+                if not journal.done(journal_kind, scope, os.path.abspath(file_path))
+            )
+        if manifest is not None:
+            root = os.path.normpath(directory_path)
+            file_paths = manifest.changed_files(self.stage_name, root, file_paths)
+        for transform in transforms:
+            file_paths = transform.transform(file_paths)
+        return file_paths
+
+    def _iter_file_paths(self, directory_path: str) -> Iterator[str]:
+        """
+        Validate the directory eagerly, then lazily yield its files.
+        A ValueError is raised once the scan finishes without finding any.
+        """
         normalized_path = os.path.normpath(directory_path)
         if not os.path.isdir(normalized_path):
             raise ValueError(f"Invalid directory path: {normalized_path}")
-        file_paths = [
-            os.path.join(root, file)
-            for root, _, files in os.walk(normalized_path)
-            for file in files
-            if os.path.isfile(os.path.join(root, file))
-        ]
-        if not file_paths:
-            raise ValueError(f"No valid files found in directory: {normalized_path}")
-        return file_paths
+
+        def generate() -> Iterator[str]:
+            found = False
+            for file_path in _scan_directory(normalized_path):
+                found = True
+                yield file_path
+            if not found:
+                raise ValueError(f"No valid files found in directory: {normalized_path}")
+
+        return generate()
+
+def _scan_directory(root: str) -> Iterator[str]:
+    """
+    Yield every regular file below ``root`` using ``os.scandir``.
+
+    File type information comes from the directory entries themselves, so no
+    extra stat is issued per file. Like ``os.walk``, symlinked directories
+    are not followed and a directory that cannot be read (permissions, or
+    removed during the scan) is skipped; it is logged as a warning.
+    """
+    pending = [root]
+    while pending:
+        directory = pending.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        is_directory = entry.is_dir(follow_symlinks=False)
+                    except OSError:
+                        is_directory = False
+                    if is_directory:
+                        pending.append(entry.path)
+                    elif entry.is_file():
+                        yield entry.path
+        except OSError as exc:
+            logger.warning(f"Skipping unreadable directory {directory}: {exc}")
+
+def _uploaded_size(file_path: str) -> int:
+    """Size of an uploaded local file for progress reporting; 0 if it is gone."""
+    try:
+        return os.path.getsize(file_path)
+    except OSError:
+        return 0
+
+# Failures logged individually at the end of a run; the rest are only counted.
+_MAX_LOGGED_FAILURES = 10
+
+def _log_failures(message: str, failures: List[Any]) -> None:
+    for subject, error in failures[:_MAX_LOGGED_FAILURES]:
+        logger.error("%s %s: %s", message, subject, error)
+    if len(failures) > _MAX_LOGGED_FAILURES:
+        logger.error("... and %d more failures; see the returned summary.", len(failures) - _MAX_LOGGED_FAILURES)
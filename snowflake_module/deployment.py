@@ -0,0 +1,279 @@
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .base import logger, run_statement
+from .batch import BatchResult, SqlBatch
+from .file_formats import FileFormat
+from .options import _format_value
+from .stages import Stage
+
+# Columns kept from SHOW output; everything else (created_on, owner, ...) is
+# irrelevant to the diff and not always JSON-serializable.
+_FILE_FORMAT_COLUMNS = ("name", "type", "format_options")
+_STAGE_COLUMNS = ("name", "type", "url", "comment", "storage_integration")
+
+class StateCache:
+    """
+    Fetched SHOW results per (kind, database, schema), valid for ``ttl``
+    seconds. With ``path`` the cache is also kept in a JSON file so
+    consecutive deploys within the TTL skip the SHOW statements entirely.
+    """
+    def __init__(self, ttl: float = 300.0, path: Optional[str] = None) -> None:
+        self.ttl = ttl
+        self.path = path
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as cache_file:
+                    self._entries = json.load(cache_file)
+            except (OSError, ValueError) as exc:
+                logger.warning(f"Ignoring unreadable deployment state cache {path}: {exc}")
+
+    def get(self, kind: str, database: str, schema: str) -> Optional[Dict[str, Dict[str, Any]]]:
+        with self._lock:
+            entry = self._entries.get(_cache_key(kind, database, schema))
+            if entry is None or time.time() - entry["fetched_at"] > self.ttl:
+                return None
+            return entry["objects"]
+
+    def put(self, kind: str, database: str, schema: str, objects: Dict[str, Dict[str, Any]]) -> None:
+        with self._lock:
+            self._entries[_cache_key(kind, database, schema)] = {"fetched_at": time.time(), "objects": objects}
+            self._save()
+
+    def invalidate(self, kind: str, database: str, schema: str) -> None:
+        with self._lock:
+            if self._entries.pop(_cache_key(kind, database, schema), None) is not None:
+                self._save()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._save()
+
+    def _save(self) -> None:
+        if not self.path:
+            return
+        temporary_path = f"{self.path}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as cache_file:
+            json.dump(self._entries, cache_file, default=str)
+        os.replace(temporary_path, self.path)
+
+@dataclass
+class PlannedChange:
+    """
+    One object in a deployment plan.
+
+    ``action`` is ``"create"``, ``"alter"``, ``"replace"`` (the object type
+    changed and cannot be altered in place), ``"unchanged"`` or
+    ``"unverified"`` (everything visible matches, but some properties set on
+    the model cannot be read back, so their drift is unknown). ``changes``
+    lists the differing properties, ``unverified`` the properties that could
+    not be compared, and ``sql`` is empty unless there is something to run.
+    """
+    kind: str
+    full_name: str
+    action: str
+    sql: str = ""
+    changes: List[str] = field(default_factory=list)
+    unverified: List[str] = field(default_factory=list)
+    source: Any = None
+
+@dataclass
+class DeploymentPlan:
+    changes: List[PlannedChange] = field(default_factory=list)
+
+    @property
+    def pending(self) -> List[PlannedChange]:
+        return [change for change in self.changes if change.sql]
+
+    @property
+    def statements(self) -> List[str]:
+        return [change.sql for change in self.pending]
+
+    def __str__(self) -> str:
+        counts: Dict[str, int] = {}
+        for change in self.changes:
+            counts[change.action] = counts.get(change.action, 0) + 1
+        return ", ".join(f"{count} {action}" for action, count in sorted(counts.items())) or "nothing to deploy"
+
+class Deployer:
+    """
+    Plans and applies file formats and stages against their current state.
+
+    ``plan`` reads the existing objects with one ``SHOW FILE FORMATS`` and
+    one ``SHOW STAGES`` per schema (served from the StateCache while fresh),
+    diffs them against the desired models and returns a DeploymentPlan that
+    only contains the ``CREATE``/``ALTER`` statements actually needed.
+    ``apply`` runs those statements through a SqlBatch and invalidates the
+    cached state of every schema it touched.
+
+    Only properties visible in SHOW output are compared: for file formats the
+    type and every option set on the model (unset options are left to their
+    current value); for stages the internal/external type, URL, storage
+    integration and comment. A stage's file format, encryption and directory
+    table settings do not appear in ``SHOW STAGES``; when the model sets them
+    they are listed in ``PlannedChange.unverified`` rather than reported as
+    unchanged. Stage names must be fully qualified
+    (``DB.SCHEMA.NAME``) since Stage models carry no database or schema.
+    """
+    def __init__(self, cursor: Any, cache: Optional[StateCache] = None, chunk_size: int = 50) -> None:
+        if not hasattr(cursor, "execute"):
+            raise ValueError("Cursor must have an 'execute' method.")
+        self.cursor = cursor
+        self.cache = cache if cache is not None else StateCache()
+        self.chunk_size = chunk_size
+
+    def plan(self, file_formats: Iterable[FileFormat] = (), stages: Iterable[Stage] = ()) -> DeploymentPlan:
+        plan = DeploymentPlan()
+        for file_format in file_formats:
+            current = self.current_state("file_formats", file_format.database, file_format.schema)
+            plan.changes.append(_diff_file_format(file_format, current.get(_identifier(file_format.name))))
+        for stage in stages:
+            database, schema, name = _split_full_name(stage.name)
+            current = self.current_state("stages", database, schema)
+            plan.changes.append(_diff_stage(stage, current.get(_identifier(name))))
+        logger.info(f"Deployment plan: {plan}")
+        return plan
+
+    def apply(self, plan: DeploymentPlan) -> List[BatchResult]:
+        pending = plan.pending
+        if not pending:
+            logger.info("Deployment is up to date; no statements to run.")
+            return []
+        batch = SqlBatch(self.cursor, chunk_size=self.chunk_size)
+        for change in pending:
+            batch.add_sql(change.sql, source=change)
+        try:
+            return batch.execute()
+        finally:
+            for change in pending:
+                database, schema, _ = _split_full_name(change.full_name)
+                self.cache.invalidate(change.kind, database, schema)
+
+    def deploy(self, file_formats: Iterable[FileFormat] = (), stages: Iterable[Stage] = ()) -> DeploymentPlan:
+        """Plan and apply in one call; returns the applied plan."""
+        plan = self.plan(file_formats, stages)
+        self.apply(plan)
+        return plan
+
+    def current_state(self, kind: str, database: str, schema: str) -> Dict[str, Dict[str, Any]]:
+        """Existing objects of ``kind`` (``file_formats`` or ``stages``) keyed by normalized name."""
+        objects = self.cache.get(kind, database, schema)
+        if objects is None:
+            objects = self._fetch(kind, database, schema)
+            self.cache.put(kind, database, schema, objects)
+        return objects
+
+    def _fetch(self, kind: str, database: str, schema: str) -> Dict[str, Dict[str, Any]]:
+        sql = f"SHOW {'FILE FORMATS' if kind == 'file_formats' else 'STAGES'} IN SCHEMA {database}.{schema}"
+        columns = _FILE_FORMAT_COLUMNS if kind == "file_formats" else _STAGE_COLUMNS
+        rows = run_statement(self, sql, self.cursor, _rows_as_dicts)
+        objects = {}
+        for row in rows:
+            entry = {column: row.get(column) for column in columns}
+            if isinstance(entry.get("format_options"), str):
+                entry["format_options"] = json.loads(entry["format_options"])
+            objects[_identifier(str(entry["name"]))] = entry
+        return objects
+
+def _diff_file_format(file_format: FileFormat, current: Optional[Dict[str, Any]]) -> PlannedChange:
+    change = PlannedChange("file_formats", file_format.full_name, "unchanged", source=file_format)
+    if current is None:
+        change.action, change.sql = "create", file_format.generate_create_sql()
+        return change
+    if str(current.get("type") or "").upper() != file_format.format_type.upper():
+        change.action, change.sql = "replace", file_format.generate_create_sql(or_replace=True)
+        change.changes = ["TYPE"]
+        return change
+    existing = {key.upper(): value for key, value in (current.get("format_options") or {}).items()}
+    fragments = []
+    options = file_format.options
+    for (_, key_sql, formatter), value in zip(options._sql_plan(), options._frozen_values()):
+        if value is None:
+            continue
+        desired = formatter(value)
+        if key_sql not in existing or _format_value(existing[key_sql]) != desired:
+            change.changes.append(key_sql)
+            fragments.append(f"{key_sql} = {desired}")
+    if fragments:
+        change.action = "alter"
+        change.sql = f"ALTER FILE FORMAT {file_format.full_name} SET {' '.join(fragments)}"
+    return change
+
+def _diff_stage(stage: Stage, current: Optional[Dict[str, Any]]) -> PlannedChange:
+    change = PlannedChange("stages", stage.name, "unchanged", source=stage)
+    if current is None:
+        change.action, change.sql = "create", stage.to_sql()
+        return change
+    external = stage.type != "internal"
+    if str(current.get("type") or "").upper().startswith("EXTERNAL") != external:
+        change.action, change.sql = "replace", stage.to_sql(or_replace=True)
+        change.changes = ["TYPE"]
+        return change
+    params = (stage.aws_params or stage.gcp_params or stage.azure_params) if external else None
+    desired = {"COMMENT": stage.comment}
+    if params is not None:
+        desired["URL"] = params.url
+        desired["STORAGE_INTEGRATION"] = params.storage_integration
+    fragments = []
+    for key, value in desired.items():
+        if value is None:
+            continue
+        if (current.get(key.lower()) or None) != value:
+            change.changes.append(key)
+            fragments.append(f"{key} = '{value}'")
+    change.unverified = _unverifiable_stage_properties(stage, params)
+    if fragments:
+        change.action = "alter"
+        change.sql = f"ALTER STAGE {stage.name} SET {' '.join(fragments)}"
+    elif change.unverified:
+        change.action = "unverified"
+        logger.warning(
+            f"Stage {stage.name}: {', '.join(change.unverified)} cannot be read back from SHOW STAGES; "
+            "drift in these properties is not detected."
+        )
+    return change
+
+def _unverifiable_stage_properties(stage: Stage, params: Any) -> List[str]:
+    """Properties set on ``stage`` that SHOW STAGES does not report."""
+    properties = []
+    if stage.file_format:
+        properties.append("FILE_FORMAT")
+    if params is not None:
+        encrypted = params.encryption_type is not None
+    else:
+        encrypted = bool(stage.internal_params and stage.internal_params.encryption_type)
+    if encrypted:
+        properties.append("ENCRYPTION")
+    if stage.directory_params:
+        properties.append("DIRECTORY")
+    return properties
+
+def _rows_as_dicts(cursor: Any) -> List[Dict[str, Any]]:
+    rows = cursor.fetchall() or []
+    if rows and isinstance(rows[0], dict):
+        return [{str(key).lower(): value for key, value in row.items()} for row in rows]
+    names = [column[0].lower() for column in (cursor.description or [])]
+    return [dict(zip(names, row)) for row in rows]
+
+def _identifier(name: str) -> str:
+    """Snowflake folds unquoted identifiers to upper case."""
+    name = name.strip()
+    if len(name) > 1 and name[0] == name[-1] == '"':
+        return name[1:-1]
+    return name.upper()
+
+def _split_full_name(full_name: str) -> Tuple[str, str, str]:
+    parts = full_name.split(".")
+    if len(parts) != 3:
+        raise ValueError(f"Name '{full_name}' must be fully qualified as DATABASE.SCHEMA.NAME.")
+    return parts[0], parts[1], parts[2]
+
+def _cache_key(kind: str, database: str, schema: str) -> str:
+    return f"{kind}:{_identifier(database)}.{_identifier(schema)}"
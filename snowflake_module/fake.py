@@ -0,0 +1,436 @@
+import gzip
+import json
+import os
+import random
+import re
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Pattern, Sequence, Set, Tuple, Union
+
+from .coalescing import COMPRESSED_EXTENSIONS
+
+_OPTION = re.compile(r"(\w+)\s*=\s*('(?:[^']|'')*'|\([^)]*\)|[^\s,)]+)", re.IGNORECASE)
+_PUT = re.compile(r"^PUT\s+'file://(?P<path>[^']+)'\s+'?(?P<stage>@[^'\s]+)'?(?P<options>.*)$", re.IGNORECASE | re.DOTALL)
+_COPY = re.compile(
+    r"^COPY\s+INTO\s+(?P<table>\S+)\s+FROM\s+(?P<source>@\S+)(?P<options>.*)$", re.IGNORECASE | re.DOTALL
+)
+_CREATE = re.compile(
+    r"^CREATE\s+(?P<replace>OR\s+REPLACE\s+)?(?P<kind>FILE\s+FORMAT|STAGE)\s+(?P<if_not_exists>IF\s+NOT\s+EXISTS\s+)?"
+    r"(?P<name>\S+)(?P<options>.*)$",
+    re.IGNORECASE | re.DOTALL,
+)
+_ALTER = re.compile(r"^ALTER\s+(?P<kind>FILE\s+FORMAT|STAGE)\s+(?P<name>\S+)\s+SET\s+(?P<options>.*)$", re.IGNORECASE | re.DOTALL)
+_SHOW = re.compile(r"^SHOW\s+(?P<kind>FILE\s+FORMATS|STAGES)\s+IN\s+SCHEMA\s+(?P<schema>\S+)\s*$", re.IGNORECASE)
+
+COPY_RESULT_COLUMNS = (
+    "file", "status", "rows_parsed", "rows_loaded", "error_limit", "errors_seen",
+    "first_error", "first_error_line", "first_error_character", "first_error_column_name",
+)
+PUT_RESULT_COLUMNS = (
+    "source", "target", "source_size", "target_size", "source_compression", "target_compression", "status", "message",
+)
+
+class FakeProgrammingError(Exception):
+    """Raised by the fake backend where Snowflake would raise a ProgrammingError."""
+    pass
+
+class _Link:
+    """A shared network link: concurrent transfers queue for its bandwidth."""
+    def __init__(self, bandwidth: Optional[float]) -> None:
+        self.bandwidth = bandwidth
+        self._free_at = 0.0
+        self._lock = threading.Lock()
+
+    def transfer(self, size: int) -> None:
+        if not self.bandwidth:
+            return
+        with self._lock:
+            now = time.monotonic()
+            done = max(now, self._free_at) + size / self.bandwidth
+            self._free_at = done
+        delay = done - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+class FakeSnowflake:
+    """
+    In-process stand-in for a Snowflake account, for offline load testing.
+
+    Understands the statements this package generates: PUT, COPY INTO,
+    CREATE [OR REPLACE] FILE FORMAT / STAGE, ALTER FILE FORMAT / STAGE ...
+    SET and SHOW FILE FORMATS / STAGES IN SCHEMA, including multi-statement
+    scripts. Staged files live under ``root`` (a temporary directory by
+    default), PUT gzips them like AUTO_COMPRESS, and COPY counts their lines
+    and remembers what was loaded, so repeated COPYs skip loaded files
+    unless ``FORCE = TRUE``. Result rows use Snowflake's column names.
+
+    Every statement waits ``latency`` seconds (plus up to ``jitter``); PUT
+    transfers share ``bandwidth`` bytes/s and COPY processes staged bytes at
+    ``load_bandwidth`` bytes/s. ``failure_rate`` fails that fraction of
+    statements at random (``seed`` makes it repeatable) and ``fail_on``, a
+    regex or predicate over the SQL, fails matching statements. Stages used
+    before being created are created on the fly unless ``strict``.
+    """
+    def __init__(
+        self,
+        root: Optional[str] = None,
+        database: str = "DB",
+        schema: str = "PUBLIC",
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        bandwidth: Optional[float] = None,
+        load_bandwidth: Optional[float] = None,
+        failure_rate: float = 0.0,
+        fail_on: Union[None, str, Pattern[str], Callable[[str], bool]] = None,
+        seed: Optional[int] = None,
+        strict: bool = False,
+    ) -> None:
+        self.root = root or tempfile.mkdtemp(prefix="fake_snowflake_")
+        self.database = database.upper()
+        self.schema = schema.upper()
+        self.latency = latency
+        self.jitter = jitter
+        self.upload_link = _Link(bandwidth)
+        self.load_link = _Link(load_bandwidth)
+        self.failure_rate = failure_rate
+        if isinstance(fail_on, (str, re.Pattern)):
+            pattern = re.compile(fail_on) if isinstance(fail_on, str) else fail_on
+            fail_on = lambda sql: pattern.search(sql) is not None
+        self.fail_on = fail_on
+        self.strict = strict
+        self.file_formats: Dict[str, Dict[str, Any]] = {}
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        self.loaded: Dict[str, Set[str]] = {}
+        self.rows_loaded: Dict[str, int] = {}
+        self.statements: List[str] = []
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def cursor(self) -> "FakeCursor":
+        return FakeCursor(self)
+
+    def connect(self) -> "FakeConnection":
+        return FakeConnection(self)
+
+    def staged_files(self, stage: str) -> List[str]:
+        """Paths of the files on a stage, relative to the stage root."""
+        directory = self._stage_directory(self._qualify(stage.lstrip("@").split("/")[0]))
+        files = []
+        for current, _, names in os.walk(directory):
+            for name in names:
+                files.append(os.path.relpath(os.path.join(current, name), directory).replace(os.sep, "/"))
+        return sorted(files)
+
+    def run(self, sql: str) -> Tuple[Sequence[str], List[Tuple[Any, ...]]]:
+        """Execute one statement; returns (column names, rows)."""
+        sql = sql.strip().rstrip(";").strip()
+        with self._lock:
+            self.statements.append(sql)
+            fail = (self.failure_rate and self._random.random() < self.failure_rate) or (
+                self.fail_on is not None and self.fail_on(sql)
+            )
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay:
+            time.sleep(delay)
+        if fail:
+            raise FakeProgrammingError(f"Injected failure for statement: {sql[:80]}")
+        for pattern, handler in (
+            (_PUT, self._put),
+            (_COPY, self._copy),
+            (_CREATE, self._create),
+            (_ALTER, self._alter),
+            (_SHOW, self._show),
+        ):
+            match = pattern.match(sql)
+            if match:
+                return handler(match)
+        raise FakeProgrammingError(f"SQL compilation error: unsupported statement: {sql[:80]}")
+
+    # -- statement handlers --------------------------------------------------
+
+    def _put(self, match: "re.Match[str]") -> Tuple[Sequence[str], List[Tuple[Any, ...]]]:
+        source = match.group("path")
+        options = _parse_options(match.group("options"))
+        stage, _, subpath = match.group("stage").lstrip("@").partition("/")
+        directory = os.path.join(self._stage_directory(self._resolve_stage(stage)), *filter(None, subpath.split("/")))
+        if not os.path.isfile(source):
+            raise FakeProgrammingError(f"File doesn't exist: ['{source}']")
+        name = os.path.basename(source)
+        auto_compress = options.get("AUTO_COMPRESS", "TRUE") != "FALSE"
+        compress = auto_compress and os.path.splitext(name)[1].lower() not in COMPRESSED_EXTENSIONS
+        target_name = name + ".gz" if compress else name
+        target = os.path.join(directory, target_name)
+        source_size = os.path.getsize(source)
+        source_compression = "NONE" if os.path.splitext(name)[1].lower() not in COMPRESSED_EXTENSIONS else "GZIP"
+        if os.path.exists(target) and options.get("OVERWRITE", "FALSE") != "TRUE":
+            row = (name, target_name, source_size, os.path.getsize(target), source_compression,
+                   "GZIP" if compress else source_compression, "SKIPPED", "")
+            return PUT_RESULT_COLUMNS, [row]
+        self.upload_link.transfer(source_size)
+        os.makedirs(directory, exist_ok=True)
+        temporary = f"{target}.{uuid.uuid4().hex}.tmp"
+        with open(source, "rb") as reader:
+            if compress:
+                with gzip.open(temporary, "wb", compresslevel=1) as writer:
+                    shutil.copyfileobj(reader, writer)
+            else:
+                with open(temporary, "wb") as writer:
+                    shutil.copyfileobj(reader, writer)
+        os.replace(temporary, target)
+        row = (name, target_name, source_size, os.path.getsize(target), source_compression,
+               "GZIP" if compress else source_compression, "UPLOADED", "")
+        return PUT_RESULT_COLUMNS, [row]
+
+    def _copy(self, match: "re.Match[str]") -> Tuple[Sequence[str], List[Tuple[Any, ...]]]:
+        table = self._qualify(match.group("table"))
+        options_sql = match.group("options")
+        options = _parse_options(options_sql)
+        stage, _, subpath = match.group("source").lstrip("@").partition("/")
+        base = os.path.join(self._stage_directory(self._resolve_stage(stage)), *filter(None, subpath.split("/")))
+        files_match = re.search(r"FILES\s*=\s*\(([^)]*)\)", options_sql, re.IGNORECASE)
+        if files_match:
+            names = [entry.strip().strip("'") for entry in files_match.group(1).split(",") if entry.strip()]
+            for name in names:
+                if not os.path.isfile(os.path.join(base, name)):
+                    raise FakeProgrammingError(f"Remote file '{name}' was not found.")
+        else:
+            names = []
+            for current, _, entries in os.walk(base):
+                for entry in entries:
+                    names.append(os.path.relpath(os.path.join(current, entry), base).replace(os.sep, "/"))
+            if "PATTERN" in options:
+                pattern = re.compile(options["PATTERN"])
+                names = [name for name in names if pattern.fullmatch(name) or pattern.fullmatch(f"{subpath}/{name}")]
+        force = options.get("FORCE") == "TRUE"
+        skip_header = self._skip_header(options)
+        with self._lock:
+            loaded = self.loaded.setdefault(table, set())
+            names = [name for name in sorted(names) if force or f"{subpath}/{name}" not in loaded]
+        if not names:
+            return ("status",), [("Copy executed with 0 files processed.",)]
+        rows = []
+        for name in names:
+            path = os.path.join(base, name)
+            self.load_link.transfer(os.path.getsize(path))
+            display = "/".join(filter(None, (stage.lower(), subpath, name)))
+            try:
+                parsed = max(0, _count_lines(path) - skip_header)
+            except (OSError, EOFError) as exc:
+                rows.append((display, "LOAD_FAILED", 0, 0, 1, 1, str(exc), 1, 1, None))
+                continue
+            with self._lock:
+                self.loaded[table].add(f"{subpath}/{name}")
+                self.rows_loaded[table] = self.rows_loaded.get(table, 0) + parsed
+            rows.append((display, "LOADED", parsed, parsed, 1, 0, None, None, None, None))
+        return COPY_RESULT_COLUMNS, rows
+
+    def _create(self, match: "re.Match[str]") -> Tuple[Sequence[str], List[Tuple[Any, ...]]]:
+        is_format = match.group("kind").upper().startswith("FILE")
+        registry = self.file_formats if is_format else self.stages
+        name = self._qualify(match.group("name"))
+        options = _parse_options(match.group("options"))
+        label = "File format" if is_format else "Stage area"
+        with self._lock:
+            if name in registry and not match.group("replace"):
+                if match.group("if_not_exists"):
+                    return ("status",), [(f"{name.split('.')[-1]} already exists, statement succeeded.",)]
+                raise FakeProgrammingError(f"SQL compilation error: Object '{name}' already exists.")
+            registry[name] = {"options": options, "comment": options.get("COMMENT")}
+        if not is_format:
+            os.makedirs(self._stage_directory(name), exist_ok=True)
+        return ("status",), [(f"{label} {name.split('.')[-1]} successfully created.",)]
+
+    def _alter(self, match: "re.Match[str]") -> Tuple[Sequence[str], List[Tuple[Any, ...]]]:
+        registry = self.file_formats if match.group("kind").upper().startswith("FILE") else self.stages
+        name = self._qualify(match.group("name"))
+        with self._lock:
+            if name not in registry:
+                raise FakeProgrammingError(f"SQL compilation error: Object '{name}' does not exist or not authorized.")
+            registry[name]["options"].update(_parse_options(match.group("options")))
+        return ("status",), [("Statement executed successfully.",)]
+
+    def _show(self, match: "re.Match[str]") -> Tuple[Sequence[str], List[Tuple[Any, ...]]]:
+        database, _, schema = self._qualify(match.group("schema") + ".X").rpartition(".")[0].partition(".")
+        prefix = f"{database}.{schema}."
+        with self._lock:
+            if match.group("kind").upper().startswith("FILE"):
+                rows = [
+                    (name[len(prefix):], database, schema, entry["options"].get("TYPE", "CSV"),
+                     json.dumps({key: _json_value(value) for key, value in entry["options"].items()}))
+                    for name, entry in sorted(self.file_formats.items()) if name.startswith(prefix)
+                ]
+                return ("name", "database_name", "schema_name", "type", "format_options"), rows
+            rows = []
+            for name, entry in sorted(self.stages.items()):
+                if not name.startswith(prefix):
+                    continue
+                options = entry["options"]
+                url = options.get("URL", "")
+                rows.append((
+                    name[len(prefix):], database, schema, url, options.get("COMMENT", ""),
+                    "EXTERNAL" if url else "INTERNAL", options.get("STORAGE_INTEGRATION"),
+                ))
+            return ("name", "database_name", "schema_name", "url", "comment", "type", "storage_integration"), rows
+
+    # -- helpers ---------------------------------------------------------------
+
+    def _qualify(self, name: str) -> str:
+        parts = [part.strip('"') if part.startswith('"') else part.upper() for part in name.split(".")]
+        if len(parts) == 1:
+            parts = [self.database, self.schema] + parts
+        elif len(parts) == 2:
+            parts = [self.database] + parts
+        return ".".join(parts)
+
+    def _resolve_stage(self, stage: str) -> str:
+        name = self._qualify(stage)
+        with self._lock:
+            if name not in self.stages:
+                if self.strict:
+                    raise FakeProgrammingError(f"SQL compilation error: Stage '{name}' does not exist or not authorized.")
+                self.stages[name] = {"options": {}, "comment": None}
+        return name
+
+    def _stage_directory(self, qualified_name: str) -> str:
+        return os.path.join(self.root, *qualified_name.split("."))
+
+    def _skip_header(self, options: Dict[str, str]) -> int:
+        file_format = options.get("FILE_FORMAT", "")
+        inline = _parse_options(file_format.strip("()"))
+        if "FORMAT_NAME" in inline:
+            with self._lock:
+                entry = self.file_formats.get(self._qualify(inline["FORMAT_NAME"]))
+            inline = entry["options"] if entry else {}
+        try:
+            return int(inline.get("SKIP_HEADER", 0))
+        except ValueError:
+            return 0
+
+class FakeConnection:
+    """Minimal connection exposing the async query status API."""
+    def __init__(self, backend: FakeSnowflake) -> None:
+        self.backend = backend
+        self._queries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def cursor(self) -> "FakeCursor":
+        return FakeCursor(self.backend, self)
+
+    def get_query_status_throw_if_error(self, query_id: str) -> str:
+        with self._lock:
+            query = self._queries[query_id]
+        if query["error"] is not None:
+            raise query["error"]
+        return "RUNNING" if not query["done"].is_set() else "SUCCESS"
+
+    def is_still_running(self, status: str) -> bool:
+        return status == "RUNNING"
+
+    def _submit(self, sql: str) -> str:
+        query_id = uuid.uuid4().hex
+        query: Dict[str, Any] = {"done": threading.Event(), "error": None, "result": ((), [])}
+        with self._lock:
+            self._queries[query_id] = query
+
+        def run() -> None:
+            try:
+                query["result"] = self.backend.run(sql)
+            except Exception as exc:
+                query["error"] = exc
+            finally:
+                query["done"].set()
+
+        threading.Thread(target=run, name=f"fake-query-{query_id[:8]}", daemon=True).start()
+        return query_id
+
+    def _result(self, query_id: str) -> Tuple[Sequence[str], List[Tuple[Any, ...]]]:
+        with self._lock:
+            query = self._queries.pop(query_id)
+        query["done"].wait()
+        if query["error"] is not None:
+            raise query["error"]
+        return query["result"]
+
+class FakeCursor:
+    """DB-API style cursor over a FakeSnowflake; one per thread, like the real one."""
+    def __init__(self, backend: FakeSnowflake, connection: Optional[FakeConnection] = None) -> None:
+        self.backend = backend
+        self.connection = connection or FakeConnection(backend)
+        self.description: Optional[List[Tuple[Any, ...]]] = None
+        self.sfqid: Optional[str] = None
+        self._rows: List[Tuple[Any, ...]] = []
+        self._closed = False
+
+    def execute(self, sql: str, num_statements: Optional[int] = None) -> "FakeCursor":
+        self._check_open()
+        statements = [sql] if num_statements is None else [part for part in sql.split(";\n") if part.strip()]
+        if num_statements and len(statements) != num_statements:
+            raise FakeProgrammingError(
+                f"Actual statement count {len(statements)} did not match the desired statement count {num_statements}."
+            )
+        for statement in statements:
+            self._set_result(self.backend.run(statement))
+        return self
+
+    def execute_async(self, sql: str) -> None:
+        self._check_open()
+        self.sfqid = self.connection._submit(sql)
+
+    def get_results_from_sfqid(self, query_id: str) -> None:
+        self._set_result(self.connection._result(query_id))
+
+    def fetchone(self) -> Optional[Tuple[Any, ...]]:
+        return self._rows.pop(0) if self._rows else None
+
+    def fetchmany(self, size: int = 1) -> List[Tuple[Any, ...]]:
+        rows, self._rows = self._rows[:size], self._rows[size:]
+        return rows
+
+    def fetchall(self) -> List[Tuple[Any, ...]]:
+        rows, self._rows = self._rows, []
+        return rows
+
+    def close(self) -> None:
+        self._closed = True
+
+    def is_closed(self) -> bool:
+        return self._closed
+
+    def _check_open(self) -> None:
+        if self._closed:
+            raise FakeProgrammingError("Cursor is closed in execute.")
+
+    def _set_result(self, result: Tuple[Sequence[str], List[Tuple[Any, ...]]]) -> None:
+        columns, rows = result
+        self.description = [(column, None, None, None, None, None, None) for column in columns]
+        self._rows = list(rows)
+
+def _parse_options(text: str) -> Dict[str, str]:
+    options = {}
+    for key, value in _OPTION.findall(text or ""):
+        if value.startswith("'"):
+            value = value[1:-1].replace("''", "'")
+        options[key.upper()] = value
+    return options
+
+def _json_value(value: str) -> Any:
+    if value in ("TRUE", "FALSE"):
+        return value == "TRUE"
+    if re.fullmatch(r"-?\d+", value):
+        return int(value)
+    if value.startswith("(") and value.endswith(")"):
+        return [item.strip().strip("'") for item in value[1:-1].split(",") if item.strip()]
+    return value
+
+def _count_lines(path: str) -> int:
+    opener = gzip.open if path.endswith(".gz") else open
+    lines = 0
+    last = b"\n"
+    with opener(path, "rb") as reader:
+        for block in iter(lambda: reader.read(1024 * 1024), b""):
+            lines += block.count(b"\n")
+            last = block[-1:]
+    return lines + (last != b"\n")
@@ -1,4 +1,4 @@
-from typing import Any, Dict
+from typing import TYPE_CHECKING, Any, Dict, Optional
 from textwrap import dedent
 
 from .base import SnowflakeObject, logger
@@ -11,6 +11,9 @@ from .options import (
     XMLFileFormatOptions,
 )
 
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
 class FileFormat(SnowflakeObject):
     """
     Base class for file formats.
@@ -34,11 +37,25 @@ class FileFormat(SnowflakeObject):
         self.execute_sql(sql)
         logger.info(f"File format '{self.name}' created successfully.")
 
-    def generate_create_sql(self, if_not_exists: bool = False) -> str:
+    async def create_async(
+        self,
+        if_not_exists: bool = False,
+        executor: Optional["Executor"] = None,
+        poll_interval: float = 0.5,
+    ) -> None:
+        """Async counterpart of create; see SnowflakeObject.execute_sql_async."""
+        sql = self.generate_create_sql(if_not_exists)
+        await self.execute_sql_async(sql, executor=executor, poll_interval=poll_interval)
+        logger.info(f"File format '{self.name}' created successfully.")
+
+    def generate_create_sql(self, if_not_exists: bool = False, or_replace: bool = False) -> str:
+        if if_not_exists and or_replace:
+            raise ValueError("if_not_exists and or_replace cannot be combined.")
         clause = "IF NOT EXISTS " if if_not_exists else ""
-        options_sql = "\n".join(self.options.to_sql_options())
+        create = "CREATE OR REPLACE" if or_replace else "CREATE"
+        options_sql = self.options.to_sql_clause()
         sql = f"""
-            CREATE FILE FORMAT {clause}{self.full_name}
+            {create} FILE FORMAT {clause}{self.full_name}
             TYPE = '{self.format_type}'
             {options_sql}
         """
@@ -46,36 +63,30 @@ class FileFormat(SnowflakeObject):
 
 class CSVFileFormat(FileFormat):
     def __init__(self, name: str, database: str, schema: str, cursor: Any, options: Dict[str, Any]) -> None:
-        from .options import CSVFileFormatOptions
         super().__init__(name, database, schema, cursor, "CSV", options)
         self.options = CSVFileFormatOptions(**options)
 
 class JSONFileFormat(FileFormat):
     def __init__(self, name: str, database: str, schema: str, cursor: Any, options: Dict[str, Any]) -> None:
-        from .options import JSONFileFormatOptions
         super().__init__(name, database, schema, cursor, "JSON", options)
         self.options = JSONFileFormatOptions(**options)
 
 class AvroFileFormat(FileFormat):
     def __init__(self, name: str, database: str, schema: str, cursor: Any, options: Dict[str, Any]) -> None:
-        from .options import AvroFileFormatOptions
         super().__init__(name, database, schema, cursor, "AVRO", options)
         self.options = AvroFileFormatOptions(**options)
 
 class ORCFileFormat(FileFormat):
     def __init__(self, name: str, database: str, schema: str, cursor: Any, options: Dict[str, Any]) -> None:
-        from .options import ORCFileFormatOptions
         super().__init__(name, database, schema, cursor, "ORC", options)
         self.options = ORCFileFormatOptions(**options)
 
 class ParquetFileFormat(FileFormat):
     def __init__(self, name: str, database: str, schema: str, cursor: Any, options: Dict[str, Any]) -> None:
-        from .options import ParquetFileFormatOptions
         super().__init__(name, database, schema, cursor, "PARQUET", options)
         self.options = ParquetFileFormatOptions(**options)
 
 class XMLFileFormat(FileFormat):
     def __init__(self, name: str, database: str, schema: str, cursor: Any, options: Dict[str, Any]) -> None:
-        from .options import XMLFileFormatOptions
         super().__init__(name, database, schema, cursor, "XML", options)
         self.options = XMLFileFormatOptions(**options)
@@ -0,0 +1,124 @@
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Active recorder; None means classic logging of every statement at INFO.
+_RECORDER: Optional["FlightRecorder"] = None
+
+class _Truncated:
+    """Defers truncating a statement until a log record is actually emitted."""
+    __slots__ = ("text", "limit")
+
+    def __init__(self, text: str, limit: int) -> None:
+        self.text = text
+        self.limit = limit
+
+    def __str__(self) -> str:
+        text = " ".join(self.text.split())
+        if len(text) <= self.limit:
+            return text
+        return f"{text[:self.limit]}... [{len(self.text)} chars]"
+
+class FlightRecorder:
+    """
+    Keeps the full text of the last ``capacity`` statements in memory while
+    the log only gets a truncated line per statement at DEBUG.
+
+    Whenever a statement fails with a SnowflakeError the buffer is written
+    to the log at ERROR and emptied, so each failure comes with the
+    statements that led up to it and concurrent failures do not repeat them.
+    """
+    def __init__(self, capacity: int = 100, max_log_chars: int = 200) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1.")
+        self.capacity = capacity
+        self.max_log_chars = max_log_chars
+        self._statements: Deque[Tuple[float, str, str]] = deque(maxlen=capacity)
+
+    def record(self, full_name: str, sql: str) -> None:
+        self._statements.append((time.time(), full_name, sql))
+
+    def truncate(self, sql: str) -> _Truncated:
+        return _Truncated(sql, self.max_log_chars)
+
+    def statements(self) -> List[Tuple[float, str, str]]:
+        """(timestamp, object full_name, SQL) of the buffered statements, oldest first."""
+        return list(self._statements)
+
+    def dump(self, reason: Any = None) -> None:
+        statements = []
+        while True:
+            try:
+                statements.append(self._statements.popleft())
+            except IndexError:
+                break
+        if not statements:
+            return
+        lines = [
+            f"[{index}] {time.strftime('%H:%M:%S', time.localtime(ts))} {full_name}\n{sql}"
+            for index, (ts, full_name, sql) in enumerate(statements, 1)
+        ]
+        logger.error(
+            "Last %d statements before failure (%s):\n%s",
+            len(statements), reason if reason is not None else "SnowflakeError", "\n".join(lines),
+        )
+
+    def clear(self) -> None:
+        self._statements.clear()
+
+def enable_flight_recorder(capacity: int = 100, max_log_chars: int = 200) -> FlightRecorder:
+    """Switch statement logging to flight-recorder mode and return the recorder."""
+    global _RECORDER
+    _RECORDER = FlightRecorder(capacity, max_log_chars)
+    return _RECORDER
+
+def disable_flight_recorder() -> None:
+    global _RECORDER
+    _RECORDER = None
+
+class ProgressLogger:
+    """
+    Thread-safe counter that logs a progress summary at most every
+    ``interval`` seconds, in place of a log line per file.
+    """
+    def __init__(self, label: str, interval: float = 10.0, log: logging.Logger = logger) -> None:
+        self.label = label
+        self.interval = interval
+        self.log = log
+        self.count = 0
+        self.failed = 0
+        self.bytes = 0
+        self._start = self._last = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def advance(self, count: int = 1, size: int = 0, failed: int = 0) -> None:
+        with self._lock:
+            self.count += count
+            self.failed += failed
+            self.bytes += size
+            now = time.perf_counter()
+            if now - self._last < self.interval:
+                return
+            self._last = now
+        self._emit("in progress")
+
+    def finish(self) -> None:
+        self._emit("finished")
+
+    def abort(self, error: BaseException) -> None:
+        """Log the progress reached before the run failed with ``error``."""
+        self._emit("aborted", logging.ERROR, f" ({type(error).__name__}: {error})")
+
+    def _emit(self, state: str, level: int = logging.INFO, detail: str = "") -> None:
+        elapsed = time.perf_counter() - self._start
+        rate = self.count / elapsed if elapsed > 0 else 0.0
+        self.log.log(
+            level,
+            "%s %s: %d files (%d failed%s) in %.1fs, %.1f files/s%s",
+            self.label, state, self.count, self.failed,
+            f", {self.bytes} bytes" if self.bytes else "", elapsed, rate, detail,
+        )
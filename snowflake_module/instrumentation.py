@@ -0,0 +1,265 @@
+import bisect
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Registered hooks. Replaced, never mutated, so execute_sql can read it
+# without a lock; an empty tuple is the whole cost when nothing is registered.
+_HOOKS: Tuple["StatementHook", ...] = ()
+_HOOKS_LOCK = threading.Lock()
+
+@dataclass
+class StatementEvent:
+    """
+    One statement run through SnowflakeObject.execute_sql or run_statement.
+
+    ``latency`` (seconds) is set before ``after``/``on_error`` are called.
+    ``bytes`` is the local file size for PUT and the bytes of the loaded
+    files with known sizes for COPY; None when unknown.
+    """
+    kind: str
+    sql: str
+    full_name: str
+    started: float
+    bytes: Optional[int] = None
+    latency: Optional[float] = None
+    error: Optional[BaseException] = None
+    _start: float = 0.0
+
+class StatementHook:
+    """
+    Base class for instrumentation hooks; override any of the callbacks.
+    Callbacks run on the thread executing the statement and must be
+    thread-safe. Exceptions they raise are logged and swallowed.
+    """
+    def before(self, event: StatementEvent) -> None:
+        pass
+
+    def after(self, event: StatementEvent) -> None:
+        pass
+
+    def on_error(self, event: StatementEvent) -> None:
+        pass
+
+def register_hook(hook: StatementHook) -> None:
+    global _HOOKS
+    with _HOOKS_LOCK:
+        if hook not in _HOOKS:
+            _HOOKS = _HOOKS + (hook,)
+
+def unregister_hook(hook: StatementHook) -> None:
+    global _HOOKS
+    with _HOOKS_LOCK:
+        _HOOKS = tuple(registered for registered in _HOOKS if registered is not hook)
+
+@contextmanager
+def instrument(*hooks: StatementHook) -> Iterator[None]:
+    """Register ``hooks`` for the duration of a ``with`` block."""
+    for hook in hooks:
+        register_hook(hook)
+    try:
+        yield
+    finally:
+        for hook in hooks:
+            unregister_hook(hook)
+
+def statement_kind(sql: str) -> str:
+    """
+    Classify a statement: ``PUT``, ``COPY``, ``CREATE FILE FORMAT``,
+    ``CREATE STAGE``, ``ALTER STAGE``, ... or its first keyword.
+    """
+    words = sql.split(None, 6)[:6]
+    upper = [word.upper() for word in words]
+    if not upper:
+        return ""
+    if upper[0] in ("CREATE", "ALTER", "DROP", "SHOW", "DESCRIBE"):
+        rest = upper[1:]
+        if rest[:2] == ["OR", "REPLACE"]:
+            rest = rest[2:]
+        if rest[:2] == ["FILE", "FORMAT"] or rest[:2] == ["FILE", "FORMATS"]:
+            return f"{upper[0]} {rest[0]} {rest[1]}"
+        if rest:
+            return f"{upper[0]} {rest[0]}"
+    return upper[0]
+
+def start_event(obj: Any, sql: str, hooks: Sequence[StatementHook]) -> StatementEvent:
+    event = StatementEvent(
+        kind=statement_kind(sql),
+        sql=sql,
+        full_name=getattr(obj, "full_name", ""),
+        started=time.time(),
+        bytes=obj._statement_bytes(sql) if hasattr(obj, "_statement_bytes") else None,
+    )
+    _dispatch(hooks, "before", event)
+    event._start = time.perf_counter()
+    return event
+
+def finish_event(event: StatementEvent, hooks: Sequence[StatementHook], result: Any = None) -> None:
+    event.latency = time.perf_counter() - event._start
+    if event.bytes is None:
+        event.bytes = getattr(result, "bytes_loaded", None)
+    _dispatch(hooks, "after", event)
+
+def fail_event(event: StatementEvent, hooks: Sequence[StatementHook], error: BaseException) -> None:
+    event.latency = time.perf_counter() - event._start
+    event.error = error
+    _dispatch(hooks, "on_error", event)
+
+def _dispatch(hooks: Sequence[StatementHook], callback: str, event: StatementEvent) -> None:
+    for hook in hooks:
+        try:
+            getattr(hook, callback)(event)
+        except Exception as exc:
+            logger.warning(f"Instrumentation hook {type(hook).__name__}.{callback} failed: {exc}")
+
+# Default latency bucket upper bounds in seconds (roughly x2.5 apart).
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+class _Series:
+    __slots__ = ("counts", "count", "errors", "total", "minimum", "maximum", "bytes")
+
+    def __init__(self, buckets: int) -> None:
+        self.counts = [0] * (buckets + 1)
+        self.count = self.errors = self.bytes = 0
+        self.total = 0.0
+        self.minimum = float("inf")
+        self.maximum = 0.0
+
+class LatencyHistogram(StatementHook):
+    """
+    In-memory latency histogram per statement kind, with counts, errors,
+    bytes and min/mean/max. Percentiles are estimated from the buckets
+    (upper bound of the bucket the percentile falls in).
+    """
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[str, _Series] = {}
+        self._lock = threading.Lock()
+
+    def after(self, event: StatementEvent) -> None:
+        self._record(event, error=False)
+
+    def on_error(self, event: StatementEvent) -> None:
+        self._record(event, error=True)
+
+    def _record(self, event: StatementEvent, error: bool) -> None:
+        latency = event.latency or 0.0
+        index = bisect.bisect_left(self.buckets, latency)
+        with self._lock:
+            series = self._series.get(event.kind)
+            if series is None:
+                series = self._series[event.kind] = _Series(len(self.buckets))
+            series.counts[index] += 1
+            series.count += 1
+            series.errors += error
+            series.bytes += event.bytes or 0
+            series.total += latency
+            series.minimum = min(series.minimum, latency)
+            series.maximum = max(series.maximum, latency)
+
+    def percentile(self, kind: str, q: float) -> Optional[float]:
+        """Estimated ``q``-th percentile (0-100) latency for ``kind``; None if unseen."""
+        with self._lock:
+            series = self._series.get(kind)
+            if series is None or series.count == 0:
+                return None
+            rank = q / 100 * series.count
+            seen = 0
+            for index, count in enumerate(series.counts):
+                seen += count
+                if seen >= rank and count:
+                    return self.buckets[index] if index < len(self.buckets) else series.maximum
+            return series.maximum
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            kinds = list(self._series)
+        result = {}
+        for kind in kinds:
+            with self._lock:
+                series = self._series.get(kind)
+                if series is None:
+                    continue
+                stats = {
+                    "count": series.count,
+                    "errors": series.errors,
+                    "bytes": series.bytes,
+                    "min": series.minimum,
+                    "mean": series.total / series.count,
+                    "max": series.maximum,
+                    "buckets": dict(zip([*map(str, self.buckets), "+Inf"], series.counts)),
+                }
+            stats["p50"] = self.percentile(kind, 50)
+            stats["p99"] = self.percentile(kind, 99)
+            result[kind] = stats
+        return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+    def __str__(self) -> str:
+        lines = []
+        for kind, stats in sorted(self.snapshot().items()):
+            lines.append(
+                f"{kind}: {stats['count']} statements, {stats['errors']} errors, "
+                f"mean {stats['mean'] * 1000:.1f} ms, p50 <= {stats['p50'] * 1000:.1f} ms, "
+                f"p99 <= {stats['p99'] * 1000:.1f} ms, max {stats['max'] * 1000:.1f} ms"
+            )
+        return "\n".join(lines)
+
+class JsonlExporter(StatementHook):
+    """
+    Appends one JSON object per finished statement to ``path``: timestamp,
+    kind, full_name, latency, bytes, status and error. The SQL text is only
+    included with ``include_sql`` (it can be long and may contain secrets).
+    """
+    def __init__(self, path: str, include_sql: bool = False) -> None:
+        self.path = path
+        self.include_sql = include_sql
+        self._file = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def after(self, event: StatementEvent) -> None:
+        self._write(event, "success")
+
+    def on_error(self, event: StatementEvent) -> None:
+        self._write(event, "failed")
+
+    def _write(self, event: StatementEvent, status: str) -> None:
+        record: Dict[str, Any] = {
+            "ts": event.started,
+            "kind": event.kind,
+            "full_name": event.full_name,
+            "latency": event.latency,
+            "bytes": event.bytes,
+            "status": status,
+        }
+        if event.error is not None:
+            record["error"] = str(event.error)
+        if self.include_sql:
+            record["sql"] = event.sql
+        line = json.dumps(record) + "\n"
+        with self._lock:
+            self._file.write(line)
+
+    def flush(self) -> None:
+        with self._lock:
+            self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    def __enter__(self) -> "JsonlExporter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,180 @@
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, Iterable, List, Set, Tuple
+
+from .base import logger
+
+# Keys per line when the journal is compacted.
+_COMPACT_CHUNK = 10000
+
+def statement_key(sql: str) -> str:
+    """Journal key of a SQL statement: a digest of its text."""
+    return hashlib.blake2b(sql.encode("utf-8"), digest_size=16).hexdigest()
+
+class JobJournal:
+    """
+    Durable record of the completed steps of a load job, so a restarted job
+    continues where the previous process stopped instead of starting over.
+
+    Every entry is a (kind, scope, key) triple: ``put`` entries are keyed by
+    stage and absolute local path, ``copy`` entries by table and
+    ``statement_key`` of the COPY statement, and ``load`` entries (written by
+    PutCopyPipeline) by table and local path of a loaded file.
+
+    The journal is a JSON-lines file. ``record`` appends one line per
+    completed batch with a single ``O_APPEND`` write (fsynced unless
+    ``fsync=False``), so a crash loses at most the line being written; a
+    torn last line is dropped when the journal is reopened. ``add`` buffers
+    single keys and appends them ``batch_size`` at a time. After
+    ``compact_every`` appended lines the file is rewritten with the keys
+    merged into few large lines and atomically swapped in, and the
+    directory is fsynced so the swap itself survives a crash. ``complete``
+    deletes the journal once the job has finished.
+    """
+    def __init__(self, path: str, batch_size: int = 100, compact_every: int = 1000, fsync: bool = True) -> None:
+        if batch_size < 1 or compact_every < 1:
+            raise ValueError("batch_size and compact_every must be at least 1.")
+        self.path = path
+        self.batch_size = batch_size
+        self.compact_every = compact_every
+        self.fsync = fsync
+        self._done: Dict[Tuple[str, str], Set[str]] = {}
+        self._buffer: Dict[Tuple[str, str], List[str]] = {}
+        self._lines = 0
+        self._lock = threading.Lock()
+        created = not os.path.exists(path)
+        self._load()
+        self._fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        if created and fsync:
+            _fsync_directory(path)
+
+    def __enter__(self) -> "JobJournal":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def done(self, kind: str, scope: str, key: str) -> bool:
+        with self._lock:
+            keys = self._done.get((kind, scope))
+            return keys is not None and key in keys
+
+    def completed(self, kind: str, scope: str) -> Set[str]:
+        with self._lock:
+            return set(self._done.get((kind, scope), ()))
+
+    def record(self, kind: str, scope: str, keys: Iterable[str]) -> None:
+        """Durably mark a completed batch."""
+        keys = list(keys)
+        if not keys:
+            return
+        with self._lock:
+            self._append(kind, scope, keys)
+
+    def add(self, kind: str, scope: str, key: str) -> None:
+        """Mark one completed key; written with the next full batch or ``flush``."""
+        with self._lock:
+            buffered = self._buffer.setdefault((kind, scope), [])
+            buffered.append(key)
+            if len(buffered) >= self.batch_size:
+                del self._buffer[(kind, scope)]
+                self._append(kind, scope, buffered)
+
+    def flush(self) -> None:
+        with self._lock:
+            buffers, self._buffer = self._buffer, {}
+            for (kind, scope), keys in buffers.items():
+                self._append(kind, scope, keys)
+
+    def compact(self) -> None:
+        with self._lock:
+            self._compact()
+
+    def close(self) -> None:
+        self.flush()
+        with self._lock:
+            if self._fd >= 0:
+                os.close(self._fd)
+                self._fd = -1
+
+    def complete(self) -> None:
+        """The job finished: close and delete the journal."""
+        self.close()
+        with self._lock:
+            self._done.clear()
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+
+    def _append(self, kind: str, scope: str, keys: List[str]) -> None:
+        if self._fd < 0:
+            raise ValueError(f"Journal {self.path} is closed.")
+        line = json.dumps({"kind": kind, "scope": scope, "keys": keys}, separators=(",", ":")) + "\n"
+        _write_all(self._fd, line.encode("utf-8"))
+        if self.fsync:
+            os.fsync(self._fd)
+        self._done.setdefault((kind, scope), set()).update(keys)
+        self._lines += 1
+        if self._lines >= self.compact_every:
+            self._compact()
+
+    def _compact(self) -> None:
+        temporary_path = f"{self.path}.tmp"
+        lines = 0
+        with open(temporary_path, "w", encoding="utf-8") as journal_file:
+            for (kind, scope), keys in self._done.items():
+                ordered = sorted(keys)
+                for start in range(0, len(ordered), _COMPACT_CHUNK):
+                    record = {"kind": kind, "scope": scope, "keys": ordered[start:start + _COMPACT_CHUNK]}
+                    journal_file.write(json.dumps(record, separators=(",", ":")) + "\n")
+                    lines += 1
+            journal_file.flush()
+            os.fsync(journal_file.fileno())
+        os.replace(temporary_path, self.path)
+        _fsync_directory(self.path)
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        # Count appends from here on, so a journal that compacts to many
+        # lines is not rewritten again after every append.
+        self._lines = 0
+        logger.debug("Compacted journal %s to %d lines.", self.path, lines)
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as journal_file:
+            data = journal_file.read()
+        end = data.rfind(b"\n") + 1
+        if end < len(data):
+            logger.warning(f"Dropping incomplete last entry of journal {self.path}.")
+            with open(self.path, "r+b") as journal_file:
+                journal_file.truncate(end)
+        for number, line in enumerate(data[:end].splitlines(), 1):
+            try:
+                record = json.loads(line)
+                self._done.setdefault((record["kind"], record["scope"]), set()).update(record["keys"])
+            except (ValueError, KeyError, TypeError) as exc:
+                logger.warning(f"Ignoring unreadable line {number} of journal {self.path}: {exc}")
+                continue
+            self._lines += 1
+
+def _fsync_directory(path: str) -> None:
+    """Persist the directory entry of ``path`` (a create or rename)."""
+    if os.name == "nt":
+        # Directories cannot be opened, and NTFS journals renames itself.
+        return
+    fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def _write_all(fd: int, data: bytes) -> None:
+    view = memoryview(data)
+    while view:
+        written = os.write(fd, view)
+        view = view[written:]
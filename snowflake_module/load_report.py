@@ -0,0 +1,140 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+# Statuses Snowflake reports for files that (at least partly) loaded.
+LOADED_STATUSES = {"LOADED", "PARTIALLY_LOADED"}
+
+@dataclass
+class CopyFileResult:
+    """
+    One row of a COPY INTO result set: the outcome for a single staged file.
+    """
+    file: str
+    status: str
+    rows_parsed: int = 0
+    rows_loaded: int = 0
+    errors_seen: int = 0
+    first_error: Optional[str] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self.status.upper() in LOADED_STATUSES
+
+@dataclass
+class CopyLoadReport:
+    """
+    Per-file results and totals of one or more COPY INTO statements.
+
+    ``bytes_loaded`` only counts files whose size was known (CopyIntoCommand's
+    ``file_sizes``), so ``bytes_per_second`` is a lower bound otherwise.
+    """
+    table: str = ""
+    files: List[CopyFileResult] = field(default_factory=list)
+    rows_parsed: int = 0
+    rows_loaded: int = 0
+    errors_seen: int = 0
+    bytes_loaded: int = 0
+    elapsed: float = 0.0
+
+    def add(self, result: CopyFileResult, size: Optional[int] = None) -> None:
+        self.files.append(result)
+        self.rows_parsed += result.rows_parsed
+        self.rows_loaded += result.rows_loaded
+        self.errors_seen += result.errors_seen
+        if size is not None and result.loaded:
+            self.bytes_loaded += size
+
+    def merge(self, other: "CopyLoadReport") -> None:
+        """Fold another report's files and totals into this one (elapsed is left alone)."""
+        self.files.extend(other.files)
+        self.rows_parsed += other.rows_parsed
+        self.rows_loaded += other.rows_loaded
+        self.errors_seen += other.errors_seen
+        self.bytes_loaded += other.bytes_loaded
+
+    @property
+    def failed(self) -> List[CopyFileResult]:
+        return [result for result in self.files if not result.loaded]
+
+    @property
+    def ok(self) -> bool:
+        return self.errors_seen == 0 and not self.failed
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows_loaded / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.bytes_loaded / self.elapsed if self.elapsed > 0 else 0.0
+
+    def status_counts(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for result in self.files:
+            counts[result.status] = counts.get(result.status, 0) + 1
+        return counts
+
+    def __str__(self) -> str:
+        return (
+            f"{len(self.files) - len(self.failed)}/{len(self.files)} files loaded into '{self.table}', "
+            f"{self.rows_loaded}/{self.rows_parsed} rows, {self.errors_seen} errors in {self.elapsed:.2f}s "
+            f"({self.rows_per_second:.0f} rows/s, {self.bytes_per_second:.0f} bytes/s)"
+        )
+
+def iter_copy_results(cursor: Any, fetch_size: int = 1000) -> Iterator[CopyFileResult]:
+    """
+    Stream the result set of a COPY INTO from ``cursor``, ``fetch_size`` rows
+    at a time. Yields nothing for cursors without a result set and for the
+    single-row "0 files processed" result.
+    """
+    description = getattr(cursor, "description", None)
+    names = [column[0].lower() for column in description] if description else None
+    fetchmany = getattr(cursor, "fetchmany", None)
+    if callable(fetchmany):
+        chunks: Iterator[List[Any]] = iter(lambda: fetchmany(fetch_size), [])
+    elif callable(getattr(cursor, "fetchall", None)):
+        chunks = iter([cursor.fetchall() or []])
+    else:
+        return
+    for chunk in chunks:
+        if not chunk:
+            return
+        for row in chunk:
+            if isinstance(row, dict):
+                values = {str(key).lower(): value for key, value in row.items()}
+            elif names is not None:
+                values = dict(zip(names, row))
+            else:
+                continue
+            if "file" not in values:
+                continue
+            yield CopyFileResult(
+                file=str(values["file"]),
+                status=str(values.get("status") or ""),
+                rows_parsed=int(values.get("rows_parsed") or 0),
+                rows_loaded=int(values.get("rows_loaded") or 0),
+                errors_seen=int(values.get("errors_seen") or 0),
+                first_error=values.get("first_error"),
+            )
+
+def collect_copy_report(
+    cursor: Any,
+    table: str = "",
+    file_sizes: Optional[Dict[str, int]] = None,
+    fetch_size: int = 1000,
+) -> CopyLoadReport:
+    """Build a CopyLoadReport from the cursor's COPY result set, streaming its rows."""
+    report = CopyLoadReport(table=table)
+    for result in iter_copy_results(cursor, fetch_size):
+        report.add(result, _lookup_size(result.file, file_sizes) if file_sizes else None)
+    return report
+
+def _lookup_size(file: str, file_sizes: Dict[str, int]) -> Optional[int]:
+    # COPY reports files with the stage (or bucket URL) in front of the
+    # FILES entry, so match on progressively shorter path suffixes.
+    parts = file.split("/")
+    for start in range(len(parts)):
+        size = file_sizes.get("/".join(parts[start:]))
+        if size is not None:
+            return size
+    return None
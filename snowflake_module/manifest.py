@@ -0,0 +1,148 @@
+import hashlib
+import os
+import sqlite3
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Deque, Dict, Iterable, Iterator, Optional, Tuple
+
+from .base import logger
+
+_READ_SIZE = 1024 * 1024
+
+def file_digest(file_path: str, algorithm: str = "blake2b") -> str:
+    """Hash a file incrementally, one block at a time."""
+    digest = hashlib.new(algorithm)
+    with open(file_path, "rb") as source:
+        for block in iter(lambda: source.read(_READ_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+class UploadManifest:
+    """
+    Persistent SQLite record of files already uploaded to a stage.
+
+    Entries are keyed by stage name and path relative to the uploaded
+    directory and store size, mtime and a content hash. ``changed_files``
+    filters a stream of paths down to new or modified files: an unchanged
+    size and mtime skips the file without reading it, otherwise the content
+    is hashed incrementally on ``hash_workers`` threads and compared with the
+    stored digest. Files are only recorded once ``record`` confirms their upload.
+
+    Files replaced by a FileTransform (compressed, coalesced or split) are
+    recorded once every output made from them is uploaded. Yielded paths
+    that were never recorded, because an upload failed, are forgotten at
+    ``flush``, which the commands call when a run ends; a manifest serves
+    one run at a time.
+    """
+    def __init__(
+        self,
+        path: str,
+        hash_workers: int = 4,
+        algorithm: str = "blake2b",
+        commit_every: int = 1000,
+    ) -> None:
+        if hash_workers < 1:
+            raise ValueError("hash_workers must be at least 1.")
+        hashlib.new(algorithm)
+        self.path = path
+        self.hash_workers = hash_workers
+        self.algorithm = algorithm
+        self.commit_every = commit_every
+        self.skipped = 0
+        self._lock = threading.Lock()
+        self._uncommitted = 0
+        self._pending: Dict[str, Tuple[str, str, int, int, str]] = {}
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS uploads (
+                stage TEXT NOT NULL,
+                path TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                digest TEXT NOT NULL,
+                PRIMARY KEY (stage, path)
+            )
+            """
+        )
+        self._connection.commit()
+
+    def __enter__(self) -> "UploadManifest":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def changed_files(self, stage_name: str, root: str, file_paths: Iterable[str]) -> Iterator[str]:
+        """Yield the paths below ``root`` that are not yet staged in their current state."""
+        window: Deque[Tuple[str, str, os.stat_result, Optional[str], Future]] = deque()
+        skipped_before = self.skipped
+        with ThreadPoolExecutor(max_workers=self.hash_workers, thread_name_prefix="manifest") as executor:
+            for file_path in file_paths:
+                relative_path = os.path.relpath(file_path, root).replace(os.sep, "/")
+                stat = os.stat(file_path)
+                stored = self._lookup(stage_name, relative_path)
+                if stored is not None and stored[0] == stat.st_size and stored[1] == stat.st_mtime_ns:
+                    self.skipped += 1
+                    continue
+                future = executor.submit(file_digest, file_path, self.algorithm)
+                window.append((file_path, relative_path, stat, stored[2] if stored else None, future))
+                while len(window) > 4 * self.hash_workers:
+                    yield from self._resolve(stage_name, window.popleft())
+            while window:
+                yield from self._resolve(stage_name, window.popleft())
+        logger.info(f"Manifest skipped {self.skipped - skipped_before} unchanged files for '{stage_name}'.")
+
+    def record(self, file_path: str) -> None:
+        """Mark a path yielded by ``changed_files`` as successfully uploaded."""
+        with self._lock:
+            entry = self._pending.pop(file_path, None)
+            if entry is None:
+                return
+            self._upsert(*entry)
+
+    def flush(self) -> None:
+        """Commit recorded uploads and forget paths yielded but never recorded."""
+        with self._lock:
+            self._connection.commit()
+            self._uncommitted = 0
+            if self._pending:
+                logger.debug(f"Manifest dropped {len(self._pending)} paths that were not recorded as uploaded.")
+                self._pending.clear()
+
+    def close(self) -> None:
+        self.flush()
+        self._connection.close()
+
+    def _resolve(
+        self, stage_name: str, item: Tuple[str, str, os.stat_result, Optional[str], Future]
+    ) -> Iterator[str]:
+        file_path, relative_path, stat, stored_digest, future = item
+        digest = future.result()
+        if digest == stored_digest:
+            # Touched but identical: refresh size/mtime so the next run takes the fast path.
+            with self._lock:
+                self._upsert(stage_name, relative_path, stat.st_size, stat.st_mtime_ns, digest)
+            self.skipped += 1
+            return
+        with self._lock:
+            self._pending[file_path] = (stage_name, relative_path, stat.st_size, stat.st_mtime_ns, digest)
+        yield file_path
+
+    def _lookup(self, stage_name: str, relative_path: str) -> Optional[Tuple[int, int, str]]:
+        with self._lock:
+            return self._connection.execute(
+                "SELECT size, mtime_ns, digest FROM uploads WHERE stage = ? AND path = ?",
+                (stage_name, relative_path),
+            ).fetchone()
+
+    def _upsert(self, stage_name: str, relative_path: str, size: int, mtime_ns: int, digest: str) -> None:
+        self._connection.execute(
+            "INSERT OR REPLACE INTO uploads (stage, path, size, mtime_ns, digest) VALUES (?, ?, ?, ?, ?)",
+            (stage_name, relative_path, size, mtime_ns, digest),
+        )
+        self._uncommitted += 1
+        if self._uncommitted >= self.commit_every:
+            self._connection.commit()
+            self._uncommitted = 0
@@ -1,6 +1,10 @@
+import hashlib
+import threading
+from collections import OrderedDict
 from enum import Enum
-from typing import List, Optional
-from pydantic import BaseModel, Field
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union, get_args, get_origin, get_type_hints
+from pydantic import BaseModel, Field, PrivateAttr
 
 # ---------------------------------------------------------------------------
 # Enums for allowed option values
@@ -41,9 +45,167 @@ class EncryptionTypeEnum(str, Enum):
 # Base Options Model - extra keys are forbidden for strict validation.
 # ---------------------------------------------------------------------------
 
-class OptionsModel(BaseModel):
+def _format_value(value: Any) -> str:
+    """Render any option value, dispatching on its runtime type."""
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if isinstance(value, (int, float)):
+        return str(value)
+    if isinstance(value, (list, tuple)):
+        formatted_list = ", ".join(f"'{v}'" for v in value)
+        return f"({formatted_list})"
+    if isinstance(value, Enum):
+        return f"'{value.value}'"
+    return f"'{value}'"
+
+def _format_bool(value: bool) -> str:
+    return "TRUE" if value else "FALSE"
+
+def _format_list(value: Tuple[Any, ...]) -> str:
+    formatted_list = ", ".join(f"'{v}'" for v in value)
+    return f"({formatted_list})"
+
+def _format_enum(value: Enum) -> str:
+    # Tolerate plain strings assigned after validation.
+    return f"'{getattr(value, 'value', value)}'"
+
+def _format_string(value: Any) -> str:
+    return f"'{value}'"
+
+def _formatter_for(annotation: Any) -> Callable[[Any], str]:
+    """Pick the value formatter for a field from its (Optional-unwrapped) type."""
+    args = [arg for arg in get_args(annotation) if arg is not type(None)]
+    if get_origin(annotation) is Union and len(args) == 1:
+        annotation = args[0]
+    if annotation is bool:
+        return _format_bool
+    if annotation in (int, float):
+        return str
+    if get_origin(annotation) in (list, List, tuple, Tuple):
+        return _format_list
+    if isinstance(annotation, type) and issubclass(annotation, Enum):
+        return _format_enum
+    if annotation is str:
+        return _format_string
+    return _format_value
+
+# Rendering plans per options class: (field name, SQL key, formatter) in field order.
+_SQL_PLANS: Dict[type, Tuple[Tuple[str, str, Callable[[Any], str]], ...]] = {}
+
+def _freeze(value: Any) -> Any:
+    return tuple(value) if isinstance(value, list) else value
+
+@lru_cache(maxsize=1024)
+def _render_options(cls: type, frozen_values: Tuple[Any, ...]) -> Tuple[str, ...]:
+    """
+    Render one set of option values. Identical option sets, even on different
+    instances or commands, share a single interned rendering.
+    """
+    return tuple(
+        f"{key_sql} = {formatter(value)}"
+        for (_, key_sql, formatter), value in zip(cls._sql_plan(), frozen_values)
+        if value is not None
+    )
+
+# ---------------------------------------------------------------------------
+# Cached construction shared by options and stage models.
+# ---------------------------------------------------------------------------
+
+class _ValidatedCache:
+    """Thread-safe bounded LRU of validated models keyed by class and input."""
+    def __init__(self, maxsize: int = 4096) -> None:
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Tuple[type, bytes], BaseModel]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[type, bytes]) -> Optional[BaseModel]:
+        with self._lock:
+            model = self._entries.get(key)
+            if model is not None:
+                self._entries.move_to_end(key)
+            return model
+
+    def put(self, key: Tuple[type, bytes], model: BaseModel) -> None:
+        with self._lock:
+            self._entries[key] = model
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+_VALIDATED_CACHE = _ValidatedCache()
+
+class TrustedConstructionMixin:
+    """
+    Fast construction path for frozen models rebuilt from the same configs.
+
+    ``from_trusted`` validates an input strictly the first time it sees it
+    and afterwards returns the same immutable instance for an equal input,
+    skipping re-validation. The bounded LRU is keyed by class and a digest of
+    the input, so the key holds no option values. Plain construction keeps
+    full validation on every call, including ``extra = "forbid"``.
+    """
+    @classmethod
+    def from_trusted(cls, data: Dict[str, Any]) -> Any:
+        key = (cls, hashlib.blake2b(repr(data).encode("utf-8"), digest_size=16).digest())
+        model = _VALIDATED_CACHE.get(key)
+        if model is None:
+            model = cls(**data)
+            _VALIDATED_CACHE.put(key, model)
+        return model
+
+class OptionsModel(TrustedConstructionMixin, BaseModel):
+    """
+    Immutable, hashable set of validated options. List-valued options are
+    stored as tuples so instances cannot be changed in place.
+
+    The rendered SQL fragments are memoized on the instance and shared across
+    equal instances through a bounded LRU, so a command reusing the same
+    options renders them once per run. Equality compares the option values
+    only, never the memo.
+    """
+    _sql_fragments: Optional[Tuple[str, ...]] = PrivateAttr(default=None)
+    _sql_clause: Optional[str] = PrivateAttr(default=None)
+
     class Config:
         extra = "forbid"
+        frozen = True
+
+    def _frozen_values(self) -> Tuple[Any, ...]:
+        values = self.__dict__
+        return tuple(_freeze(values.get(name)) for name, _, _ in self._sql_plan())
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, OptionsModel):
+            return NotImplemented
+        return type(other) is type(self) and other._frozen_values() == self._frozen_values()
+
+    def __hash__(self) -> int:
+        return hash((type(self), self._frozen_values()))
+
+    @classmethod
+    def _sql_plan(cls) -> Tuple[Tuple[str, str, Callable[[Any], str]], ...]:
+        """
+        Compile (once per class) the field order, SQL key names and value
+        formatter for each field, so rendering is a loop over set fields.
+        """
+        plan = _SQL_PLANS.get(cls)
+        if plan is None:
+            hints = get_type_hints(cls)
+            plan = tuple(
+                (
+                    name,
+                    # Special handling: Convert "parquetcompression" to "COMPRESSION"
+                    "COMPRESSION" if name.lower() == "parquetcompression" else name.upper(),
+                    _formatter_for(hints.get(name)),
+                )
+                for name in cls.__fields__
+            )
+            _SQL_PLANS[cls] = plan
+        return plan
 
     def to_sql_options(self) -> List[str]:
         """
@@ -51,21 +213,37 @@ class OptionsModel(BaseModel):
         Booleans become TRUE/FALSE; strings get single-quoted.
         Lists are rendered as comma-separated strings.
         """
-        sql_parts = []
-        for key, value in self.dict(exclude_none=True).items():
-            if isinstance(value, bool):
-                val_str = "TRUE" if value else "FALSE"
-            elif isinstance(value, (int, float)):
-                val_str = str(value)
-            elif isinstance(value, list):
-                formatted_list = ", ".join(f"'{v}'" for v in value)
-                val_str = f"({formatted_list})"
-            else:
-                val_str = f"'{value}'"
-            # Special handling: Convert "parquetcompression" to "COMPRESSION"
-            key_sql = "COMPRESSION" if key.lower() == "parquetcompression" else key.upper()
-            sql_parts.append(f"{key_sql} = {val_str}")
-        return sql_parts
+        return list(self.sql_fragments())
+
+    def sql_fragments(self) -> Tuple[str, ...]:
+        """Memoized, shared tuple behind to_sql_options."""
+        memo = self._memo()
+        fragments = memo.get("_sql_fragments")
+        if fragments is None:
+            fragments = _render_options(type(self), self._frozen_values())
+            self._remember("_sql_fragments", fragments)
+        return fragments
+
+    def to_sql_clause(self, separator: str = "\n") -> str:
+        """The options joined into one clause, as embedded in generated statements."""
+        if separator != "\n":
+            return separator.join(self.sql_fragments())
+        clause = self._memo().get("_sql_clause")
+        if clause is None:
+            clause = "\n".join(self.sql_fragments())
+            self._remember("_sql_clause", clause)
+        return clause
+
+    def _memo(self) -> Dict[str, Any]:
+        # pydantic 2 keeps private attributes in __pydantic_private__; reading
+        # that dict directly avoids the much slower __getattr__ fallback.
+        private = getattr(self, "__pydantic_private__", None)
+        if private is not None:
+            return private
+        return {"_sql_fragments": self._sql_fragments, "_sql_clause": self._sql_clause}
+
+    def _remember(self, name: str, value: Any) -> None:
+        setattr(self, name, value)
 
 # ---------------------------------------------------------------------------
 # File Format Options Models
@@ -88,7 +266,7 @@ class CSVFileFormatOptions(OptionsModel):
     escape_unenclosed_field: Optional[str] = None
     trim_space: Optional[bool] = None
     field_optionally_enclosed_by: Optional[str] = None
-    null_if: Optional[List[str]] = None
+    null_if: Optional[Tuple[str, ...]] = None
     error_on_column_count_mismatch: Optional[bool] = None
     replace_invalid_characters: Optional[bool] = None
     empty_field_as_null: Optional[bool] = None
@@ -103,7 +281,7 @@ class JSONFileFormatOptions(OptionsModel):
     binary_format: Optional[BinaryFormatEnum] = None
     trim_space: Optional[bool] = None
     multi_line: Optional[bool] = None
-    null_if: Optional[List[str]] = None
+    null_if: Optional[Tuple[str, ...]] = None
     file_extension: Optional[str] = None
     enable_octal: Optional[bool] = None
     allow_duplicate: Optional[bool] = None
@@ -117,12 +295,12 @@ class AvroFileFormatOptions(OptionsModel):
     compression: Optional[CompressionEnum] = None
     trim_space: Optional[bool] = None
     replace_invalid_characters: Optional[bool] = None
-    null_if: Optional[List[str]] = None
+    null_if: Optional[Tuple[str, ...]] = None
 
 class ORCFileFormatOptions(OptionsModel):
     trim_space: Optional[bool] = None
     replace_invalid_characters: Optional[bool] = None
-    null_if: Optional[List[str]] = None
+    null_if: Optional[Tuple[str, ...]] = None
 
 class ParquetFileFormatOptions(OptionsModel):
     parquetcompression: Optional[ParquetCompressionEnum] = None
@@ -132,7 +310,7 @@ class ParquetFileFormatOptions(OptionsModel):
     trim_space: Optional[bool] = None
     use_vectorized_scanner: Optional[bool] = None
     replace_invalid_characters: Optional[bool] = None
-    null_if: Optional[List[str]] = None
+    null_if: Optional[Tuple[str, ...]] = None
 
 class XMLFileFormatOptions(OptionsModel):
     compression: Optional[CompressionEnum] = None
@@ -0,0 +1,253 @@
+import copy
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, List, Optional, Sequence
+
+from .base import logger
+from .flight_recorder import ProgressLogger
+from .coalescing import COMPRESSED_EXTENSIONS
+from .data_operations import (
+    CopyBatchResult,
+    CopyIntoCommand,
+    CopySummary,
+    FileTransform,
+    PutCommand,
+    PutResult,
+    PutSummary,
+    _SourceTracker,
+    _uploaded_size,
+)
+from .options import PutOptions
+from .profiling import carry, profiled
+
+if TYPE_CHECKING:
+    from .journal import JobJournal
+    from .manifest import UploadManifest
+
+@dataclass
+class PipelineSummary:
+    """
+    Outcome of a PutCopyPipeline run: per-file uploads and per-batch loads.
+    """
+    put: PutSummary = field(default_factory=PutSummary)
+    copy: CopySummary = field(default_factory=CopySummary)
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.put.ok and self.copy.ok
+
+    def __str__(self) -> str:
+        return f"{self.put}; {self.copy}; pipeline finished in {self.elapsed:.2f}s"
+
+class _Batch:
+    def __init__(self, index: int, file_paths: List[str]) -> None:
+        self.index = index
+        self.file_paths = file_paths
+        self.remaining = len(file_paths)
+        self.uploaded: List[str] = []
+        self.lock = threading.Lock()
+
+class PutCopyPipeline:
+    """
+    Uploads a directory and loads it in overlapping batches.
+
+    Scanned files are grouped into batches of ``batch_size``. As soon as every
+    file of a batch has been PUT, a COPY INTO restricted to that batch's
+    staged files (an explicit ``files`` list) is started, while later batches
+    keep uploading. At most ``max_in_flight`` batches are uploading or loading
+    at any time; the scan blocks until a batch finishes its COPY, so a slow
+    warehouse throttles the upload instead of letting work pile up.
+
+    ``copy_command`` is a template: its table, source, file format and
+    options are reused for every batch and its own ``files``/``pattern`` are
+    ignored. Its source must be the PUT stage location or a parent of it.
+    Each worker thread gets its own cursor from ``cursor_factory`` or, without
+    a factory, from the commands' CursorPool. Failed uploads are left out of
+    their batch's COPY; a failed COPY does not stop later batches.
+    Runs are profiled when ``put_command`` is (see PutCommand's ``profile``).
+
+    With a JobJournal, uploads are recorded as ``put`` entries and loaded
+    batches as ``load`` entries per local file. A rerun skips loaded files
+    entirely and does not upload again files that were staged but not yet
+    loaded; their batches only run the COPY for them.
+    """
+    def __init__(
+        self,
+        put_command: PutCommand,
+        copy_command: CopyIntoCommand,
+        batch_size: int = 200,
+        max_in_flight: int = 4,
+        put_workers: int = 8,
+        copy_workers: int = 2,
+        cursor_factory: Optional[Callable[[], Any]] = None,
+    ) -> None:
+        if not 1 <= batch_size <= copy_command.max_files_per_copy:
+            raise ValueError(f"batch_size must be between 1 and {copy_command.max_files_per_copy}.")
+        if max_in_flight < 1 or put_workers < 1 or copy_workers < 1:
+            raise ValueError("max_in_flight, put_workers and copy_workers must be at least 1.")
+        for command in (put_command, copy_command):
+            if cursor_factory is None and not callable(getattr(command.cursor, "checkout", None)):
+                raise ValueError("A cursor_factory is required unless the commands use a CursorPool.")
+        self.put_command = put_command
+        self.copy_command = copy_command
+        self.batch_size = batch_size
+        self.max_in_flight = max_in_flight
+        self.put_workers = put_workers
+        self.copy_workers = copy_workers
+        self.cursor_factory = cursor_factory
+        self.stage_prefix = _stage_prefix(put_command.stage_name, copy_command.source)
+        self.profile = put_command.profile
+        self._validation_time = put_command._validation_time + copy_command._validation_time
+
+    @profiled("pipeline")
+    def run(
+        self,
+        directory_path: str,
+        transforms: Sequence[FileTransform] = (),
+        manifest: Optional["UploadManifest"] = None,
+        journal: Optional["JobJournal"] = None,
+    ) -> PipelineSummary:
+        put_options = self.put_command._run_options(transforms)
+        stage_name = self.put_command.stage_name
+        table_name = self.copy_command.full_table_name
+        # Files loaded by an earlier run are dropped before the transforms.
+        file_paths = self.put_command._iter_upload_paths(
+            directory_path, transforms, manifest, journal, journal_kind="load", journal_scope=table_name
+        )
+        # Scanned files are journaled once all of their transformed outputs
+        # are staged (put) or loaded (load).
+        put_tracker = _SourceTracker(transforms)
+        load_tracker = _SourceTracker(transforms)
+        slots = threading.BoundedSemaphore(self.max_in_flight)
+        local = threading.local()
+        cursors: List[Any] = []
+        results_lock = threading.Lock()
+        summary = PipelineSummary()
+        progress = ProgressLogger(f"PUT to '{self.put_command.stage_name}'", log=logger)
+
+        def worker_cursor() -> Any:
+            cursor = getattr(local, "cursor", None)
+            if cursor is None and self.cursor_factory is not None:
+                cursor = self.cursor_factory()
+                if not hasattr(cursor, "execute"):
+                    raise ValueError("Cursor must have an 'execute' method.")
+                local.cursor = cursor
+                with results_lock:
+                    cursors.append(cursor)
+            return cursor
+
+        def load(batch: _Batch) -> None:
+            try:
+                if not batch.uploaded:
+                    return
+                files = [self.stage_prefix + _staged_name(path, put_options) for path in batch.uploaded]
+                sql = ""
+                start = time.perf_counter()
+                try:
+                    command = copy.copy(self.copy_command)
+                    command.files, command.pattern = files, None
+                    sql = command.generate_copy_sql()
+                    report = command.execute_sql(sql, cursor=worker_cursor(), consume=command._collect_report)
+                    if journal is not None:
+                        loaded = [source for path in batch.uploaded for source in load_tracker.complete(path)]
+                        journal.record("load", table_name, [os.path.abspath(source) for source in loaded])
+                except Exception as exc:
+                    result = CopyBatchResult(files, sql, False, str(exc), time.perf_counter() - start)
+                    logger.error(f"COPY of batch {batch.index} failed: {exc}")
+                else:
+                    report.elapsed = time.perf_counter() - start
+                    result = CopyBatchResult(files, sql, True, None, report.elapsed, report)
+                with results_lock:
+                    summary.copy.results.append(result)
+            finally:
+                slots.release()
+
+        def upload(batch: _Batch, file_path: str, copy_executor: ThreadPoolExecutor) -> None:
+            start = time.perf_counter()
+            # Files staged as-is by an interrupted run only need their COPY.
+            staged = journal is not None and journal.done("put", stage_name, os.path.abspath(file_path))
+            try:
+                if not staged:
+                    try:
+                        sql = self.put_command._generate_put_sql(file_path, put_options)
+                        self.put_command.execute_sql(sql, cursor=worker_cursor())
+                        self.put_command._record_upload(put_tracker, file_path, manifest, journal)
+                    except Exception as exc:
+                        result = PutResult(file_path, False, str(exc), time.perf_counter() - start)
+                    else:
+                        result = PutResult(file_path, True, None, time.perf_counter() - start)
+                        staged = True
+                    with results_lock:
+                        summary.put.results.append(result)
+                    if result.success:
+                        progress.advance(size=_uploaded_size(file_path))
+                    else:
+                        progress.advance(failed=1)
+            finally:
+                # Account for the file whatever happened above, or the batch
+                # never starts its COPY and its in-flight slot is never freed.
+                with batch.lock:
+                    if staged:
+                        batch.uploaded.append(file_path)
+                    batch.remaining -= 1
+                    done = batch.remaining == 0
+                if done:
+                    copy_executor.submit(carry(load), batch)
+
+        start = time.perf_counter()
+        try:
+            with ThreadPoolExecutor(self.copy_workers, thread_name_prefix="pipeline-copy") as copy_executor:
+                with ThreadPoolExecutor(self.put_workers, thread_name_prefix="pipeline-put") as put_executor:
+                    for index, batch_paths in enumerate(_chunks(file_paths, self.batch_size)):
+                        slots.acquire()
+                        batch = _Batch(index, batch_paths)
+                        for file_path in batch_paths:
+                            put_executor.submit(carry(upload), batch, file_path, copy_executor)
+        except BaseException as exc:
+            progress.abort(exc)
+            raise
+        else:
+            progress.finish()
+        finally:
+            for cursor in cursors:
+                close = getattr(cursor, "close", None)
+                if callable(close):
+                    close()
+            if manifest is not None:
+                manifest.flush()
+            if journal is not None:
+                journal.flush()
+        summary.elapsed = summary.put.elapsed = summary.copy.elapsed = time.perf_counter() - start
+        logger.info(f"PUT->COPY pipeline into '{self.copy_command.table_name}' finished: {summary}")
+        return summary
+
+def _chunks(items: Iterable[str], size: int) -> Iterator[List[str]]:
+    chunk: List[str] = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def _staged_name(file_path: str, options: PutOptions) -> str:
+    """Name PUT gives a file on the stage: gzip-compressed unless AUTO_COMPRESS is off."""
+    name = os.path.basename(file_path)
+    if options.auto_compress is False or os.path.splitext(name)[1].lower() in COMPRESSED_EXTENSIONS:
+        return name
+    return name + ".gz"
+
+def _stage_prefix(put_stage: str, copy_source: str) -> str:
+    """Path of the PUT location relative to the COPY source, e.g. ``daily/`` or ``""``."""
+    put_location = put_stage.strip().rstrip("/")
+    source = copy_source.strip().rstrip("/")
+    if put_location.lower() == source.lower():
+        return ""
+    if put_location.lower().startswith(source.lower() + "/"):
+        return put_location[len(source) + 1:] + "/"
+    raise ValueError(f"COPY source '{copy_source}' does not contain the PUT stage location '{put_stage}'.")
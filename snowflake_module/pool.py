@@ -0,0 +1,154 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+
+from .base import SnowflakeError, logger
+
+class CursorPool:
+    """
+    Bounded, thread-safe pool of cursors created lazily from a factory.
+
+    At most ``max_size`` cursors exist at once; ``checkout`` blocks (up to
+    ``checkout_timeout`` seconds) when all of them are in use. Idle cursors
+    are health-checked before being handed out and closed once they have been
+    idle for more than ``idle_timeout`` seconds. The default health check
+    rejects cursors whose ``is_closed()`` returns True.
+
+    A pool can be passed anywhere a cursor is expected: SnowflakeObject checks
+    out a cursor for each statement, so several commands sharing one pool run
+    concurrently without sharing a cursor.
+    """
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        max_size: int = 8,
+        health_check: Optional[Callable[[Any], bool]] = None,
+        idle_timeout: Optional[float] = 300.0,
+        checkout_timeout: Optional[float] = None,
+    ) -> None:
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1.")
+        self.factory = factory
+        self.max_size = max_size
+        self.health_check = health_check or _default_health_check
+        self.idle_timeout = idle_timeout
+        self.checkout_timeout = checkout_timeout
+        self._idle: List[Tuple[Any, float]] = []
+        self._size = 0
+        self._closed = False
+        self._condition = threading.Condition()
+
+    @property
+    def size(self) -> int:
+        """Number of cursors currently open (idle or checked out)."""
+        return self._size
+
+    @property
+    def idle(self) -> int:
+        return len(self._idle)
+
+    def acquire(self, timeout: Optional[float] = None) -> Any:
+        """Check out a cursor; pair every call with ``release``."""
+        timeout = self.checkout_timeout if timeout is None else timeout
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise SnowflakeError("Cursor pool is closed.")
+                self._evict_idle()
+                while self._idle:
+                    cursor, _ = self._idle.pop()
+                    if self._is_healthy(cursor):
+                        return cursor
+                    self._discard(cursor)
+                if self._size < self.max_size:
+                    self._size += 1
+                    break
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise SnowflakeError(f"Timed out waiting for a cursor from the pool (max_size={self.max_size}).")
+                self._condition.wait(remaining)
+        try:
+            cursor = self.factory()
+            if not hasattr(cursor, "execute"):
+                raise ValueError("Cursor must have an 'execute' method.")
+        except Exception:
+            with self._condition:
+                self._size -= 1
+                self._condition.notify()
+            raise
+        return cursor
+
+    def release(self, cursor: Any, discard: bool = False) -> None:
+        """Return a cursor to the pool, or close it when ``discard`` is set."""
+        with self._condition:
+            if discard or self._closed:
+                self._discard(cursor)
+            else:
+                self._idle.append((cursor, time.monotonic()))
+            self._condition.notify()
+
+    @contextmanager
+    def checkout(self, timeout: Optional[float] = None) -> Iterator[Any]:
+        """
+        Context manager around acquire/release. A cursor whose block raised
+        is discarded when it fails its health check.
+        """
+        cursor = self.acquire(timeout)
+        try:
+            yield cursor
+        except BaseException:
+            self.release(cursor, discard=not self._is_healthy(cursor))
+            raise
+        self.release(cursor)
+
+    def execute(self, sql: str) -> None:
+        """Run one statement on a pooled cursor (drop-in for ``cursor.execute``)."""
+        with self.checkout() as cursor:
+            cursor.execute(sql)
+
+    def close(self) -> None:
+        """Close idle cursors; cursors still checked out are closed on release."""
+        with self._condition:
+            self._closed = True
+            while self._idle:
+                self._discard(self._idle.pop()[0])
+            self._condition.notify_all()
+
+    def __enter__(self) -> "CursorPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _evict_idle(self) -> None:
+        if self.idle_timeout is None:
+            return
+        cutoff = time.monotonic() - self.idle_timeout
+        keep = []
+        for cursor, released_at in self._idle:
+            if released_at < cutoff:
+                self._discard(cursor)
+            else:
+                keep.append((cursor, released_at))
+        self._idle = keep
+
+    def _is_healthy(self, cursor: Any) -> bool:
+        try:
+            return bool(self.health_check(cursor))
+        except Exception:
+            return False
+
+    def _discard(self, cursor: Any) -> None:
+        self._size -= 1
+        close = getattr(cursor, "close", None)
+        if callable(close):
+            try:
+                close()
+            except Exception as exc:
+                logger.warning(f"Failed to close pooled cursor: {exc}")
+
+def _default_health_check(cursor: Any) -> bool:
+    is_closed = getattr(cursor, "is_closed", None)
+    return not (callable(is_closed) and is_closed())
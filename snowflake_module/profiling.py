@@ -0,0 +1,257 @@
+import functools
+import logging
+import os
+import threading
+import time
+from contextlib import ExitStack, nullcontext
+from contextvars import ContextVar
+from typing import Any, Callable, ContextManager, Dict, Iterable, Iterator, List, Optional, TypeVar, Union
+
+logger = logging.getLogger(__name__)
+
+# Set to an output directory (or "1" for the working directory) to profile
+# every load run of commands that do not pass ``profile`` explicitly.
+PROFILE_ENV_VAR = "SNOWFLAKE_MODULE_PROFILE"
+
+PHASES = ("scan", "validate", "render", "execute")
+
+# Profiler of the run the current thread or task works for; None (the normal
+# case) keeps every phase check down to a single lookup. Worker threads join
+# a run through ``carry``, so runs on unrelated threads are never mixed.
+_PROFILER: ContextVar[Optional["RunProfiler"]] = ContextVar("snowflake_module_profiler", default=None)
+# cProfile and tracemalloc are process-wide: one run is profiled at a time.
+_PROFILING_LOCK = threading.Lock()
+
+_NO_PHASE: ContextManager[None] = nullcontext()
+
+T = TypeVar("T")
+
+class _PhaseTimer:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler: "RunProfiler", name: str) -> None:
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.profiler.add(self.name, time.perf_counter() - self.start)
+
+class RunProfiler:
+    """
+    Profiles one load run: cProfile over the calling thread, tracemalloc
+    snapshots at start and end, and wall time per phase (scan, validate,
+    render, execute) summed over every thread taking part in the run. Only
+    one run per process is profiled at a time; entering a second one raises
+    RuntimeError, while ``profiled`` commands run unprofiled instead.
+
+    On exit, also when the run fails, ``<label>-<timestamp>.pstats`` and a
+    human-readable ``<label>-<timestamp>.txt`` summary are written to
+    ``output_dir``. Worker threads show up in the phase timings but not in
+    the cProfile statistics, which only cover the thread that started the
+    run. ``memory=False`` skips tracemalloc, which slows allocation-heavy
+    code considerably.
+    """
+    def __init__(self, label: str, output_dir: str = ".", memory: bool = True, top: int = 25) -> None:
+        self.label = label
+        self.output_dir = output_dir
+        self.memory = memory
+        self.top = top
+        self.phases: Dict[str, List[float]] = {name: [0.0, 0] for name in PHASES}
+        self.elapsed = 0.0
+        self.stats_path: Optional[str] = None
+        self.summary_path: Optional[str] = None
+        self._lock = threading.Lock()
+        self._profile: Any = None
+        self._snapshot: Any = None
+        self._memory_lines: List[str] = []
+        self._peak = 0
+        self._started_tracing = False
+
+    def add(self, phase: str, seconds: float, calls: int = 1) -> None:
+        with self._lock:
+            totals = self.phases.setdefault(phase, [0.0, 0])
+            totals[0] += seconds
+            totals[1] += calls
+
+    def phase(self, name: str) -> ContextManager[None]:
+        return _PhaseTimer(self, name)
+
+    def timed(self, iterable: Iterable[T], phase: str) -> Iterator[T]:
+        """Yield from ``iterable``, charging the time spent producing each item to ``phase``."""
+        iterator = iter(iterable)
+        clock = time.perf_counter
+        while True:
+            start = clock()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self.add(phase, clock() - start, 0)
+                return
+            self.add(phase, clock() - start)
+            yield item
+
+    def __enter__(self) -> "RunProfiler":
+        import cProfile
+        import tracemalloc
+
+        if not _PROFILING_LOCK.acquire(blocking=False):
+            raise RuntimeError("Another profiled run is already in progress.")
+        try:
+            if self.memory:
+                self._started_tracing = not tracemalloc.is_tracing()
+                if self._started_tracing:
+                    tracemalloc.start()
+                tracemalloc.reset_peak()
+                self._snapshot = tracemalloc.take_snapshot()
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        except BaseException:
+            if self._started_tracing:
+                tracemalloc.stop()
+            _PROFILING_LOCK.release()
+            raise
+        self._token = _PROFILER.set(self)
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        import tracemalloc
+
+        self._profile.disable()
+        self.elapsed = time.perf_counter() - self._start
+        _PROFILER.reset(self._token)
+        try:
+            if self.memory:
+                self._peak = tracemalloc.get_traced_memory()[1]
+                snapshot = tracemalloc.take_snapshot()
+                if self._started_tracing:
+                    tracemalloc.stop()
+                filters = [tracemalloc.Filter(False, tracemalloc.__file__)]
+                growth = snapshot.filter_traces(filters).compare_to(self._snapshot.filter_traces(filters), "lineno")
+                self._memory_lines = [str(stat) for stat in growth[:self.top]]
+                self._snapshot = None
+        finally:
+            _PROFILING_LOCK.release()
+        try:
+            self.write()
+        except OSError as exc:
+            logger.error("Could not write profile for %s: %s", self.label, exc)
+
+    def write(self) -> None:
+        os.makedirs(self.output_dir, exist_ok=True)
+        now = time.time()
+        stamp = f"{time.strftime('%Y%m%d-%H%M%S', time.localtime(now))}.{int(now * 1000) % 1000:03d}"
+        base = os.path.join(self.output_dir, f"{self.label}-{stamp}-{os.getpid()}")
+        self.stats_path = f"{base}.pstats"
+        self.summary_path = f"{base}.txt"
+        self._profile.dump_stats(self.stats_path)
+        with open(self.summary_path, "w", encoding="utf-8") as handle:
+            handle.write(self.summary())
+        logger.info("Profile of %s written to %s and %s", self.label, self.summary_path, self.stats_path)
+
+    def summary(self) -> str:
+        import io
+        import pstats
+
+        lines = [f"Profile of {self.label}: {self.elapsed:.3f}s wall time", "", "Phase        seconds      calls   share"]
+        with self._lock:
+            phases = {name: list(totals) for name, totals in self.phases.items()}
+        for name, (seconds, calls) in phases.items():
+            share = seconds / self.elapsed * 100 if self.elapsed > 0 else 0.0
+            lines.append(f"{name:<10} {seconds:10.3f} {calls:10d} {share:6.1f}%")
+        lines.append("(phase time is summed over threads, so shares can exceed 100% in concurrent runs)")
+        if self.memory:
+            lines += ["", f"Peak traced memory: {self._peak / 1024 / 1024:.1f} MiB", "Top allocation growth:"]
+            lines += [f"  {line}" for line in self._memory_lines] or ["  (none)"]
+        stream = io.StringIO()
+        pstats.Stats(self._profile, stream=stream).sort_stats("cumulative").print_stats(self.top)
+        lines += ["", stream.getvalue().strip()]
+        return "\n".join(lines) + "\n"
+
+def profile_output_dir(profile: Union[bool, str, None] = None) -> Optional[str]:
+    """
+    Where a run's profile goes: ``profile`` when given (True or "1" meaning
+    the working directory, False or "" meaning off), else the
+    SNOWFLAKE_MODULE_PROFILE environment variable. None when profiling is off.
+    """
+    if profile is None:
+        profile = os.environ.get(PROFILE_ENV_VAR, "")
+    if profile is True:
+        return os.getcwd()
+    if not profile or profile in ("0", "false", "False"):
+        return None
+    if profile in ("1", "true", "True"):
+        return os.getcwd()
+    return str(profile)
+
+def phase(name: str) -> ContextManager[None]:
+    """Time a block as ``name`` in the active profiled run, if any."""
+    profiler = _PROFILER.get()
+    return profiler.phase(name) if profiler is not None else _NO_PHASE
+
+def timed(iterable: Iterable[T], name: str) -> Iterable[T]:
+    """``iterable`` with its iteration time charged to ``name`` in the active profiled run, if any."""
+    profiler = _PROFILER.get()
+    return profiler.timed(iterable, name) if profiler is not None else iterable
+
+def carry(func: Callable[..., T]) -> Callable[..., T]:
+    """
+    ``func`` bound to the current profiled run, if any, for calling on a
+    worker thread; phases it times are then charged to that run.
+    """
+    profiler = _PROFILER.get()
+    if profiler is None:
+        return func
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> T:
+        token = _PROFILER.set(profiler)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _PROFILER.reset(token)
+    return wrapper
+
+def timed_phase(name: str) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    """Decorator charging a function's time to phase ``name`` while a run is profiled."""
+    def decorate(func: Callable[..., T]) -> Callable[..., T]:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> T:
+            profiler = _PROFILER.get()
+            if profiler is None:
+                return func(*args, **kwargs)
+            with profiler.phase(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+def profiled(label: str) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    """
+    Decorator for the run methods of command classes: profiles the call when
+    the object's ``profile`` attribute (or the environment variable) asks for
+    it. Runs nested in an already profiled run are part of that run. While
+    another thread's run is being profiled the call runs unprofiled, so
+    profiling never fails a load. Validation time the object recorded while
+    being built (``_validation_time``) is charged to the validate phase.
+    """
+    def decorate(method: Callable[..., T]) -> Callable[..., T]:
+        @functools.wraps(method)
+        def wrapper(self: Any, *args: Any, **kwargs: Any) -> T:
+            if _PROFILER.get() is not None:
+                return method(self, *args, **kwargs)
+            output_dir = profile_output_dir(getattr(self, "profile", None))
+            if output_dir is None:
+                return method(self, *args, **kwargs)
+            with ExitStack() as stack:
+                try:
+                    profiler = stack.enter_context(RunProfiler(label, output_dir))
+                except (RuntimeError, ValueError) as exc:
+                    logger.warning("Running %s unprofiled: %s", label, exc)
+                    return method(self, *args, **kwargs)
+                profiler.add("validate", getattr(self, "_validation_time", 0.0))
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorate
@@ -0,0 +1,297 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .base import SnowflakeObject, logger
+from .data_operations import CopyIntoCommand
+from .file_formats import (
+    AvroFileFormat,
+    CSVFileFormat,
+    FileFormat,
+    JSONFileFormat,
+    ORCFileFormat,
+    ParquetFileFormat,
+    XMLFileFormat,
+)
+from .stages import Stage
+
+FILE_FORMAT_CLASSES = {
+    "CSV": CSVFileFormat,
+    "JSON": JSONFileFormat,
+    "AVRO": AvroFileFormat,
+    "ORC": ORCFileFormat,
+    "PARQUET": ParquetFileFormat,
+    "XML": XMLFileFormat,
+}
+
+# (kind, database, schema, name) - kind is "file_format", "stage" or "load".
+# Loads are named "TABLE[index]" by their position in the target's loads, so
+# several loads into one table stay distinct.
+NodeKey = Tuple[str, str, str, str]
+
+@dataclass
+class ProvisioningNode:
+    """
+    One statement in a provisioning plan and the nodes it depends on.
+    """
+    key: NodeKey
+    obj: Any
+    run: Callable[[], None]
+    dependencies: List[NodeKey] = field(default_factory=list)
+
+    @property
+    def label(self) -> str:
+        kind, database, schema, name = self.key
+        return f"{kind} {database}.{schema}.{name}"
+
+@dataclass
+class NodeResult:
+    """
+    Outcome of one node: ``success``, ``failed`` or ``skipped`` (a dependency failed).
+    """
+    key: NodeKey
+    status: str
+    error: Optional[str] = None
+    elapsed: float = 0.0
+
+@dataclass
+class ProvisioningReport:
+    results: Dict[NodeKey, NodeResult] = field(default_factory=dict)
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return all(result.status == "success" for result in self.results.values())
+
+    def by_status(self, status: str) -> List[NodeResult]:
+        return [result for result in self.results.values() if result.status == status]
+
+    def __str__(self) -> str:
+        return (
+            f"{len(self.by_status('success'))} succeeded, {len(self.by_status('failed'))} failed, "
+            f"{len(self.by_status('skipped'))} skipped in {self.elapsed:.2f}s"
+        )
+
+class _SerializedCursor:
+    """Serializes access to a plain cursor shared by several worker threads."""
+    def __init__(self, cursor: Any) -> None:
+        self._cursor = cursor
+        self._lock = threading.Lock()
+
+    def execute(self, sql: str, *args: Any, **kwargs: Any) -> Any:
+        with self._lock:
+            return self._cursor.execute(sql, *args, **kwargs)
+
+def load_spec(path: str) -> Dict[str, Any]:
+    """Read a provisioning spec from a JSON or YAML file (YAML needs PyYAML)."""
+    with open(path, "r", encoding="utf-8") as spec_file:
+        if os.path.splitext(path)[1].lower() in (".yaml", ".yml"):
+            try:
+                import yaml
+            except ImportError as e:
+                raise ImportError("Reading YAML specs requires the optional 'PyYAML' package.") from e
+            return yaml.safe_load(spec_file)
+        return json.load(spec_file)
+
+class ProvisioningPlan:
+    """
+    Dependency graph of file formats, stages and loads built from a spec.
+
+    The spec is a dict (see ``load_spec`` for JSON/YAML files)::
+
+        {"targets": [{
+            "database": "DB", "schema": "S",
+            "file_formats": [{"name": "csv", "type": "CSV", "options": {...}, "if_not_exists": true}],
+            "stages": [{"name": "st", "type": "internal", "file_format": "csv"}],
+            "loads": [{"table": "t", "stage": "st", "file_format": "csv", "copy_options": {...}}]
+        }]}
+
+    Stage entries take the Stage fields plus ``if_not_exists`` and
+    ``or_replace``; unknown keys are rejected. A stage depends on its ``file_format`` and a load on its ``stage`` and
+    ``file_format`` when those are defined in the spec; unqualified names
+    resolve within the same database and schema. Everything is validated up
+    front, before any SQL runs.
+
+    ``execute`` runs independent nodes concurrently, at most
+    ``max_parallelism`` at a time. Pass a CursorPool so workers get their own
+    cursors; a plain cursor is shared and its statements serialized. When a
+    node fails, the nodes depending on it are skipped and the rest continue.
+    """
+    def __init__(self, nodes: Dict[NodeKey, ProvisioningNode]) -> None:
+        self.nodes = nodes
+        for node in nodes.values():
+            for dependency in node.dependencies:
+                if dependency not in nodes:
+                    raise ValueError(f"{node.label} depends on unknown node {dependency}.")
+        self._check_acyclic()
+
+    @classmethod
+    def from_spec(cls, spec: Dict[str, Any], cursor: Any) -> "ProvisioningPlan":
+        if not callable(getattr(cursor, "checkout", None)):
+            cursor = _SerializedCursor(cursor)
+        nodes: Dict[NodeKey, ProvisioningNode] = {}
+
+        def add(node: ProvisioningNode) -> None:
+            if node.key in nodes:
+                raise ValueError(f"Duplicate {node.label} in provisioning spec.")
+            nodes[node.key] = node
+
+        for target in spec.get("targets", []):
+            database, schema = target["database"], target["schema"]
+            for entry in target.get("file_formats", []):
+                add(cls._file_format_node(entry, database, schema, cursor))
+            for entry in target.get("stages", []):
+                add(cls._stage_node(entry, database, schema, cursor))
+            for index, entry in enumerate(target.get("loads", [])):
+                add(cls._load_node(entry, index, database, schema, cursor))
+        defined = set(nodes)
+        for node in nodes.values():
+            node.dependencies = [key for key in node.dependencies if key in defined]
+        return cls(nodes)
+
+    @staticmethod
+    def _file_format_node(entry: Dict[str, Any], database: str, schema: str, cursor: Any) -> ProvisioningNode:
+        format_type = entry["type"].upper()
+        format_class = FILE_FORMAT_CLASSES.get(format_type)
+        if format_class is None:
+            raise ValueError(f"Unsupported file format type: {entry['type']}")
+        file_format: FileFormat = format_class(entry["name"], database, schema, cursor, entry.get("options", {}))
+        if_not_exists = entry.get("if_not_exists", False)
+        return ProvisioningNode(
+            key=("file_format", database, schema, file_format.name),
+            obj=file_format,
+            run=lambda: file_format.create(if_not_exists=if_not_exists),
+        )
+
+    @staticmethod
+    def _stage_node(entry: Dict[str, Any], database: str, schema: str, cursor: Any) -> ProvisioningNode:
+        fields = dict(entry)
+        if_not_exists = fields.pop("if_not_exists", False)
+        or_replace = fields.pop("or_replace", False)
+        unknown = sorted(set(fields) - set(Stage.__fields__))
+        if unknown:
+            raise ValueError(f"Unknown stage keys in provisioning spec: {', '.join(unknown)}")
+        name = entry["name"]
+        fields["name"] = _qualify(name, database, schema)
+        dependencies = []
+        if entry.get("file_format"):
+            dependencies.append(("file_format",) + _split_name(entry["file_format"], database, schema))
+            fields["file_format"] = _qualify(entry["file_format"], database, schema)
+        stage = Stage(**fields)
+        sql = stage.to_sql(or_replace=or_replace, if_not_exists=if_not_exists)
+        executor = SnowflakeObject(None, database, schema, cursor, no_name=True)
+        return ProvisioningNode(
+            key=("stage", database, schema, name),
+            obj=stage,
+            run=lambda: executor.execute_sql(sql),
+            dependencies=dependencies,
+        )
+
+    @staticmethod
+    def _load_node(entry: Dict[str, Any], index: int, database: str, schema: str, cursor: Any) -> ProvisioningNode:
+        stage_key = ("stage",) + _split_name(entry["stage"], database, schema)
+        dependencies = [stage_key]
+        file_format = entry.get("file_format")
+        if file_format and not file_format.lstrip().startswith("("):
+            dependencies.append(("file_format",) + _split_name(file_format, database, schema))
+            file_format = f"(FORMAT_NAME = '{_qualify(file_format, database, schema)}')"
+        command = CopyIntoCommand(
+            database=database,
+            schema=schema,
+            table_name=entry["table"],
+            cursor=cursor,
+            source=f"@{'.'.join(stage_key[1:])}",
+            file_format=file_format,
+            options=entry.get("options", {}),
+            copy_options=entry.get("copy_options", {}),
+            files=entry.get("files"),
+            pattern=entry.get("pattern"),
+        )
+        return ProvisioningNode(
+            key=("load", database, schema, f"{command.table_name}[{index}]"),
+            obj=command,
+            run=command.execute,
+            dependencies=dependencies,
+        )
+
+    def execute(self, max_parallelism: int = 8) -> ProvisioningReport:
+        if max_parallelism < 1:
+            raise ValueError("max_parallelism must be at least 1.")
+        dependents: Dict[NodeKey, List[NodeKey]] = {key: [] for key in self.nodes}
+        remaining = {key: len(node.dependencies) for key, node in self.nodes.items()}
+        for key, node in self.nodes.items():
+            for dependency in node.dependencies:
+                dependents[dependency].append(key)
+        ready = [key for key, count in remaining.items() if count == 0]
+        report = ProvisioningReport()
+        start = time.perf_counter()
+        running: Dict[Future, NodeKey] = {}
+
+        def skip(key: NodeKey, reason: str) -> None:
+            for dependent in dependents[key]:
+                if dependent not in report.results:
+                    report.results[dependent] = NodeResult(dependent, "skipped", reason)
+                    skip(dependent, reason)
+
+        with ThreadPoolExecutor(max_workers=max_parallelism, thread_name_prefix="provision") as executor:
+            while ready or running:
+                while ready and len(running) < max_parallelism:
+                    key = ready.pop()
+                    running[executor.submit(self._run_node, self.nodes[key])] = key
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    key = running.pop(future)
+                    result = future.result()
+                    report.results[key] = result
+                    if result.status != "success":
+                        skip(key, f"Dependency {self.nodes[key].label} failed.")
+                        continue
+                    for dependent in dependents[key]:
+                        remaining[dependent] -= 1
+                        if remaining[dependent] == 0 and dependent not in report.results:
+                            ready.append(dependent)
+        report.elapsed = time.perf_counter() - start
+        logger.info(f"Provisioned {len(self.nodes)} objects: {report}")
+        return report
+
+    @staticmethod
+    def _run_node(node: ProvisioningNode) -> NodeResult:
+        start = time.perf_counter()
+        try:
+            node.run()
+        except Exception as exc:
+            logger.error(f"Provisioning {node.label} failed: {exc}")
+            return NodeResult(node.key, "failed", str(exc), time.perf_counter() - start)
+        return NodeResult(node.key, "success", None, time.perf_counter() - start)
+
+    def _check_acyclic(self) -> None:
+        visiting, visited = set(), set()
+
+        def visit(key: NodeKey) -> None:
+            if key in visited:
+                return
+            if key in visiting:
+                raise ValueError(f"Dependency cycle involving {self.nodes[key].label}.")
+            visiting.add(key)
+            for dependency in self.nodes[key].dependencies:
+                visit(dependency)
+            visiting.discard(key)
+            visited.add(key)
+
+        for key in self.nodes:
+            visit(key)
+
+def _split_name(name: str, database: str, schema: str) -> Tuple[str, str, str]:
+    parts = name.split(".")
+    if len(parts) == 3:
+        return parts[0], parts[1], parts[2]
+    if len(parts) == 2:
+        return database, parts[0], parts[1]
+    return database, schema, name
+
+def _qualify(name: str, database: str, schema: str) -> str:
+    return ".".join(_split_name(name, database, schema))
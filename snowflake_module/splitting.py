@@ -0,0 +1,202 @@
+import hashlib
+import math
+import mmap
+import os
+import re
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .base import logger
+from .coalescing import COMPRESSED_EXTENSIONS, _header_line_count, _record_delimiter
+from .data_operations import FileTransform
+from .options import CSVFileFormatOptions
+
+# Block size used when scanning or copying memory-mapped data, so no single
+# slice of a huge file is materialized at once.
+_BLOCK_SIZE = 16 * 1024 * 1024
+
+def _count(mm: mmap.mmap, needle: bytes, start: int, end: int) -> int:
+    total = 0
+    while start < end:
+        stop = min(start + _BLOCK_SIZE, end)
+        total += mm[start:stop].count(needle)
+        start = stop
+    return total
+
+class FileSplitter(FileTransform):
+    """
+    Splits large CSV files into chunks cut at real record boundaries so a
+    single huge file can be loaded by many COPY threads.
+
+    Files are memory-mapped and cut near evenly spaced offsets: into
+    ``num_chunks`` pieces when given, otherwise into pieces of roughly
+    ``chunk_size`` bytes. A cut is only placed right after ``record_delimiter``.
+    When ``multi_line`` is enabled (Snowflake's default) and
+    ``field_optionally_enclosed_by`` is set, the enclosure characters are
+    counted and a delimiter inside an open quoted field is skipped; doubled
+    quotes keep the count even and a quote preceded by the ``escape``
+    character is not counted. The ``skip_header`` (or ``parse_header``)
+    records of the original file are copied to the start of every chunk so the
+    same file format applies to each of them.
+
+    Only files of at least ``split_threshold`` bytes with the format's
+    extension are split; everything else is passed through. Chunks are
+    named ``<stem>.<digest>.partNNNN<ext>``, the digest being taken from the
+    original's absolute path, so files with the same name in different
+    directories neither overwrite each other's chunks nor collide on the
+    stage. The chunk paths produced for each original file are kept in
+    ``self.splits``.
+    """
+    def __init__(
+        self,
+        output_dir: str,
+        file_format_options: Optional[CSVFileFormatOptions] = None,
+        num_chunks: Optional[int] = None,
+        chunk_size: int = 256 * 1024 * 1024,
+        split_threshold: int = 1024 * 1024 * 1024,
+        extensions: Optional[Sequence[str]] = None,
+    ) -> None:
+        if num_chunks is not None and num_chunks < 1:
+            raise ValueError("num_chunks must be at least 1.")
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive.")
+        os.makedirs(output_dir, exist_ok=True)
+        options = file_format_options or CSVFileFormatOptions()
+        self.output_dir = output_dir
+        self.num_chunks = num_chunks
+        self.chunk_size = chunk_size
+        self.split_threshold = split_threshold
+        if extensions is None:
+            extensions = [options.file_extension or ".csv"]
+        self.extensions = {ext.lower() for ext in extensions}
+        self.splits: Dict[str, List[str]] = {}
+        self._sources: Dict[str, Dict[str, int]] = {}
+        self._header_lines = _header_line_count(options)
+        self._delimiter = _record_delimiter(options)
+        enclosure = options.field_optionally_enclosed_by
+        multi_line = options.multi_line is not False
+        if multi_line and enclosure and enclosure.upper() != "NONE":
+            self._quote: Optional[bytes] = enclosure.encode(options.encoding or "utf-8")
+        else:
+            self._quote = None
+        escape = options.escape
+        self._escape = escape.encode(options.encoding or "utf-8") if escape and escape.upper() != "NONE" else b""
+        self._escaped: Optional["re.Pattern[bytes]"] = None
+        if self._quote is not None and self._escape and self._escape != self._quote:
+            # An escape consumes the byte after it; a lone escape at the end
+            # of a scanned range escapes the first byte of the next one.
+            self._escaped = re.compile(re.escape(self._escape) + b".?|" + re.escape(self._quote), re.DOTALL)
+
+    def transform(self, file_paths: Iterable[str]) -> Iterator[str]:
+        for file_path in file_paths:
+            extension = os.path.splitext(file_path)[1].lower()
+            if (
+                extension in COMPRESSED_EXTENSIONS
+                or extension not in self.extensions
+                or os.path.getsize(file_path) < max(self.split_threshold, 1)
+            ):
+                yield file_path
+                continue
+            yield from self.split(file_path)
+
+    def sources(self, output_path: str) -> Dict[str, int]:
+        return self._sources.get(output_path) or {output_path: 1}
+
+    def split(self, file_path: str) -> Iterator[str]:
+        """Split one file and yield each chunk path as soon as it is written."""
+        with open(file_path, "rb") as source, mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            header_end = self._header_end(mm)
+            boundaries = self._find_boundaries(mm, header_end, self._chunk_count(len(mm)))
+            if len(boundaries) <= 2:
+                yield file_path
+                return
+            stem, extension = os.path.splitext(os.path.basename(file_path))
+            digest = hashlib.sha1(os.path.abspath(file_path).encode("utf-8")).hexdigest()[:10]
+            chunks = self.splits[file_path] = []
+            origin = {file_path: len(boundaries) - 1}
+            for index, (start, end) in enumerate(zip(boundaries, boundaries[1:]), start=1):
+                chunk_path = os.path.join(self.output_dir, f"{stem}.{digest}.part{index:04d}{extension}")
+                with open(chunk_path, "wb") as chunk:
+                    self._copy(mm, chunk, 0, header_end)
+                    self._copy(mm, chunk, start, end)
+                chunks.append(chunk_path)
+                self._sources[chunk_path] = origin
+                yield chunk_path
+        logger.info(f"Split {file_path} into {len(chunks)} chunks.")
+
+    def _chunk_count(self, size: int) -> int:
+        return self.num_chunks or max(1, math.ceil(size / self.chunk_size))
+
+    def _header_end(self, mm: mmap.mmap) -> int:
+        position = 0
+        for _ in range(self._header_lines):
+            index = mm.find(self._delimiter, position)
+            if index == -1:
+                return len(mm)
+            position = index + len(self._delimiter)
+        return position
+
+    def _find_boundaries(self, mm: mmap.mmap, data_start: int, chunks: int) -> List[int]:
+        size = len(mm)
+        boundaries = [data_start]
+        scanned = data_start
+        in_quotes = False
+        escaped = False
+        for k in range(1, chunks):
+            target = data_start + k * (size - data_start) // chunks
+            if target <= boundaries[-1]:
+                continue
+            if self._quote is not None:
+                quotes, escaped = self._count_quotes(mm, scanned, target, escaped)
+                in_quotes ^= quotes % 2 == 1
+            position = target
+            while True:
+                index = mm.find(self._delimiter, position)
+                if index == -1:
+                    position = size
+                    break
+                if self._quote is not None:
+                    quotes, escaped = self._count_quotes(mm, position, index, escaped)
+                    in_quotes ^= quotes % 2 == 1
+                position = index + len(self._delimiter)
+                if not in_quotes and not escaped:
+                    break
+                # The delimiter itself was escaped (or is inside quotes).
+                escaped = False
+            scanned = position
+            if position >= size:
+                break
+            boundaries.append(position)
+        boundaries.append(size)
+        return boundaries
+
+    def _count_quotes(self, mm: mmap.mmap, start: int, end: int, escaped: bool) -> Tuple[int, bool]:
+        """
+        Unescaped enclosure characters in ``mm[start:end]``, and whether the
+        range ends with a lone escape (so the byte at ``end`` is escaped).
+        ``escaped`` says the same about the byte at ``start``.
+        """
+        if escaped and start < end:
+            start += 1
+            escaped = False
+        if self._escaped is None:
+            return _count(mm, self._quote, start, end), escaped
+        total = 0
+        while start < end:
+            stop = min(start + _BLOCK_SIZE, end)
+            for match in self._escaped.finditer(mm[start:stop]):
+                if match.group() == self._quote:
+                    total += 1
+                elif match.end() - match.start() == len(self._escape):
+                    escaped = True
+            start = stop
+            if escaped and start < end:
+                start += 1
+                escaped = False
+        return total, escaped
+
+    @staticmethod
+    def _copy(mm: mmap.mmap, target, start: int, end: int) -> None:
+        while start < end:
+            stop = min(start + _BLOCK_SIZE, end)
+            target.write(mm[start:stop])
+            start = stop
@@ -1,4 +1,4 @@
-from typing import Optional, Dict
+from typing import Optional, Dict, Literal
 from pydantic import BaseModel, Field, ValidationError
 from textwrap import dedent
 
@@ -45,8 +45,6 @@ class AzureExternalStageParams(BaseModel):
 # Top-Level Stage Model
 # ------------------------------------------------------------------------------
 
-from typing import Literal
-
 class Stage(BaseModel):
     name: str
     type: Literal['internal', 'aws', 'gcp', 'azure']
@@ -58,7 +56,9 @@ class Stage(BaseModel):
     gcp_params: Optional[GCPExternalStageParams] = None
     azure_params: Optional[AzureExternalStageParams] = None
 
-    def to_sql(self) -> str:
+    def to_sql(self, or_replace: bool = False, if_not_exists: bool = False) -> str:
+        if if_not_exists and or_replace:
+            raise ValueError("if_not_exists and or_replace cannot be combined.")
         options = []
         if self.file_format:
             options.append(f"FILE_FORMAT = '{self.file_format}'")
@@ -109,7 +109,9 @@ class Stage(BaseModel):
             if self.directory_params.notification_integration:
                 options.append(f"NOTIFICATION_INTEGRATION = '{self.directory_params.notification_integration}'")
         options_sql = "\n".join(options)
-        return f"CREATE STAGE {self.name}\n{options_sql}"
+        create = "CREATE OR REPLACE" if or_replace else "CREATE"
+        clause = "IF NOT EXISTS " if if_not_exists else ""
+        return f"{create} STAGE {clause}{self.name}\n{options_sql}"
 
 # ------------------------------------------------------------------------------
 # (Optional) Example usage within the module for testing
@@ -0,0 +1,51 @@
+from typing import Callable, List
+
+import pytest
+
+from snowflake_module import FakeSnowflake, FileTransform, ProgressLogger, data_operations, pipeline
+
+class SeenTransform(FileTransform):
+    """Passes every path through unchanged and remembers it."""
+    def __init__(self) -> None:
+        self.paths: List[str] = []
+
+    def transform(self, file_paths):
+        for file_path in file_paths:
+            self.paths.append(file_path)
+            yield file_path
+
+@pytest.fixture
+def fake(tmp_path) -> FakeSnowflake:
+    return FakeSnowflake(root=str(tmp_path / "account"))
+
+@pytest.fixture
+def make_files(tmp_path) -> Callable[..., List[str]]:
+    """Create ``count`` small CSV files (``rows`` lines each) under tmp_path/``name``."""
+    def make(count: int, rows: int = 3, name: str = "source", subdirectories: int = 1) -> List[str]:
+        paths = []
+        for index in range(count):
+            directory = tmp_path / name / f"d{index % subdirectories}"
+            directory.mkdir(parents=True, exist_ok=True)
+            path = directory / f"f{index:04d}.csv"
+            path.write_text("".join(f"{index},{row}\n" for row in range(rows)))
+            paths.append(str(path))
+        return paths
+    return make
+
+@pytest.fixture
+def seen() -> SeenTransform:
+    return SeenTransform()
+
+@pytest.fixture
+def progress_loggers(monkeypatch) -> List[ProgressLogger]:
+    """Every ProgressLogger the commands and the pipeline create during the test."""
+    loggers: List[ProgressLogger] = []
+
+    class RecordingProgressLogger(ProgressLogger):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            loggers.append(self)
+
+    monkeypatch.setattr(data_operations, "ProgressLogger", RecordingProgressLogger)
+    monkeypatch.setattr(pipeline, "ProgressLogger", RecordingProgressLogger)
+    return loggers
@@ -0,0 +1,82 @@
+import asyncio
+import gc
+import time
+import warnings
+
+import pytest
+
+from snowflake_module import CopyIntoCommand, PutCommand, SnowflakeError
+from snowflake_module.fake import FakeConnection
+
+class SlowStatusConnection(FakeConnection):
+    """Status checks block like a network round trip."""
+    def get_query_status_throw_if_error(self, query_id):
+        time.sleep(0.2)
+        return super().get_query_status_throw_if_error(query_id)
+
+def test_submit_and_poll_keeps_the_event_loop_free(fake, make_files, tmp_path):
+    make_files(4)
+    PutCommand("DB", "PUBLIC", fake.cursor(), "@st", {}).execute(str(tmp_path / "source"))
+    commands = [
+        CopyIntoCommand("DB", "PUBLIC", f"T{index}", SlowStatusConnection(fake).cursor(), "@st")
+        for index in range(4)
+    ]
+
+    async def main():
+        ticks = 0
+        stop = asyncio.Event()
+
+        async def ticker():
+            nonlocal ticks
+            while not stop.is_set():
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        ticking = asyncio.create_task(ticker())
+        start = time.perf_counter()
+        reports = await asyncio.gather(*(command.execute_async(poll_interval=0.01) for command in commands))
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await ticking
+        return reports, elapsed, ticks
+
+    reports, elapsed, ticks = asyncio.run(main())
+
+    assert [report.rows_loaded for report in reports] == [12] * 4
+    # Four statements with blocking status checks overlap instead of
+    # serializing on the loop, and the loop keeps running other tasks.
+    assert elapsed < 0.6
+    assert ticks >= 10
+
+def test_execute_async_without_async_submission_runs_on_executor(fake, make_files, tmp_path):
+    make_files(3)
+    PutCommand("DB", "PUBLIC", fake.cursor(), "@st", {}).execute(str(tmp_path / "source"))
+
+    class PlainCursor:
+        def __init__(self):
+            self.cursor = fake.cursor()
+            self.description = None
+
+        def execute(self, sql):
+            self.cursor.execute(sql)
+            self.description = self.cursor.description
+
+        def fetchmany(self, size):
+            return self.cursor.fetchmany(size)
+
+    report = asyncio.run(CopyIntoCommand("DB", "PUBLIC", "T", PlainCursor(), "@st").execute_async())
+    assert report.rows_loaded == 9 and report.ok
+
+def test_failing_sequential_batch_leaves_no_unawaited_coroutines(fake):
+    # No files were staged, so the first COPY batch already fails.
+    command = CopyIntoCommand(
+        "DB", "PUBLIC", "T", fake.cursor(), "@st",
+        files=[f"f{index}.csv" for index in range(4)], max_files_per_copy=1,
+    )
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        with pytest.raises(SnowflakeError):
+            asyncio.run(command.execute_async())
+        gc.collect()
+
+    assert not [warning for warning in caught if "never awaited" in str(warning.message)]
@@ -0,0 +1,52 @@
+import pytest
+
+from snowflake_module import CopyIntoCommand, Deployer, SnowflakeError, SqlBatch, Stage
+from snowflake_module.instrumentation import StatementHook, instrument
+
+class Recorder(StatementHook):
+    def __init__(self):
+        self.statements = []
+        self.errors = []
+
+    def after(self, event):
+        self.statements.append(event.sql)
+
+    def on_error(self, event):
+        self.errors.append(event.sql)
+
+def test_add_honors_if_not_exists_for_stages(fake):
+    stage = Stage(name="DB.PUBLIC.ST", type="internal")
+    with SqlBatch(fake.cursor()) as batch:
+        batch.add(stage)
+        result = batch.add(stage, if_not_exists=True)
+
+    assert "CREATE STAGE IF NOT EXISTS DB.PUBLIC.ST" in result.sql
+    assert [result.status for result in batch.results] == ["success", "success"]
+
+def test_add_rejects_if_not_exists_for_copy(fake):
+    command = CopyIntoCommand("DB", "PUBLIC", "T", fake.cursor(), "@st")
+    with pytest.raises(ValueError):
+        SqlBatch(fake.cursor()).add(command, if_not_exists=True)
+
+@pytest.mark.parametrize("multi_statement", [True, False])
+def test_batch_statements_reach_statement_hooks(fake, multi_statement):
+    hook = Recorder()
+    batch = SqlBatch(fake.cursor(), chunk_size=2, multi_statement=multi_statement)
+    for name in ("A", "B", "C"):
+        batch.add(Stage(name=f"DB.PUBLIC.{name}", type="internal"))
+    batch.add(Stage(name="DB.PUBLIC.A", type="internal"))
+
+    with instrument(hook), pytest.raises(SnowflakeError):
+        batch.execute()
+
+    # One script per chunk, or one statement each without multi-statement support.
+    assert len(hook.statements) == (1 if multi_statement else 3)
+    assert len(hook.errors) == 1
+    assert batch.results[-1].status == "failed" and "already exists" in batch.results[-1].error
+
+def test_deployer_show_statements_reach_statement_hooks(fake):
+    hook = Recorder()
+    with instrument(hook):
+        Deployer(fake.cursor()).plan(stages=[Stage(name="DB.PUBLIC.ST", type="internal")])
+
+    assert hook.statements == ["SHOW STAGES IN SCHEMA DB.PUBLIC"]
@@ -0,0 +1,74 @@
+import pytest
+
+from snowflake_module import CodecChoice, CompressionEnum, CopyIntoCommand, CSVFileFormat, FileCompressor, PutCommand
+
+def csv_format(cursor):
+    return CSVFileFormat("fmt", "DB", "PUBLIC", cursor, {})
+
+def test_codec_choice_returns_a_compressor_that_really_compresses(fake, make_files, tmp_path):
+    make_files(5, rows=50)
+    command = PutCommand("DB", "PUBLIC", fake.cursor(), "@st", {})
+    file_format = csv_format(fake.cursor())
+
+    compressor = CodecChoice(CompressionEnum.GZIP).apply(command, file_format, output_dir=str(tmp_path / "gz"))
+
+    assert isinstance(compressor, FileCompressor)
+    assert file_format.options.compression == CompressionEnum.GZIP
+    command.execute(str(tmp_path / "source"), transforms=[compressor])
+    staged = fake.staged_files("@st")
+    assert len(staged) == 5 and all(name.endswith(".csv.gz") for name in staged)
+    report = CopyIntoCommand("DB", "PUBLIC", "T", fake.cursor(), "@st").execute()
+    assert report.ok and report.rows_loaded == 250
+
+def test_codec_choice_requires_scratch_space_for_compression(fake):
+    command = PutCommand("DB", "PUBLIC", fake.cursor(), "@st", {})
+    with pytest.raises(ValueError):
+        CodecChoice(CompressionEnum.GZIP).apply(command)
+    assert command.options.source_compression is None
+
+def test_codec_choice_none_turns_auto_compress_off(fake, make_files, tmp_path):
+    make_files(2)
+    command = PutCommand("DB", "PUBLIC", fake.cursor(), "@st", {})
+    file_format = csv_format(fake.cursor())
+
+    assert CodecChoice(CompressionEnum.NONE).apply(command, file_format) is None
+
+    assert command.options.auto_compress is False
+    assert file_format.options.compression == CompressionEnum.NONE
+    command.execute(str(tmp_path / "source"))
+    assert all(name.endswith(".csv") for name in fake.staged_files("@st"))
+
+def test_files_compressed_with_another_codec_are_skipped_not_fatal(fake, make_files, tmp_path):
+    paths = make_files(4)
+    with open(paths[0] + ".bz2", "wb") as handle:
+        handle.write(b"BZh9")
+    compressor = FileCompressor(str(tmp_path / "gz"), CompressionEnum.GZIP, max_workers=1)
+
+    summary = PutCommand("DB", "PUBLIC", fake.cursor(), "@st", {}).execute_concurrent(
+        str(tmp_path / "source"), cursor_factory=fake.cursor, transforms=[compressor]
+    )
+
+    assert summary.ok and summary.total == 4
+    assert compressor.rejected == [paths[0] + ".bz2"]
+
+def test_compression_workers_are_not_forked_from_upload_threads(fake, make_files, tmp_path, monkeypatch):
+    from snowflake_module import compression
+
+    start_methods = []
+
+    class RecordingPool(compression.ProcessPoolExecutor):
+        def __init__(self, *args, mp_context=None, **kwargs):
+            start_methods.append(mp_context.get_start_method() if mp_context else None)
+            super().__init__(*args, mp_context=mp_context, **kwargs)
+
+    monkeypatch.setattr(compression, "ProcessPoolExecutor", RecordingPool)
+    make_files(12, subdirectories=3)
+    command = PutCommand("DB", "PUBLIC", fake.cursor(), "@st", {})
+    compressor = FileCompressor(str(tmp_path / "gz"), max_workers=2)
+
+    summary = command.execute_concurrent(
+        str(tmp_path / "source"), cursor_factory=fake.cursor, max_workers=4, transforms=[compressor]
+    )
+
+    assert summary.ok and summary.total == 12
+    assert start_methods and None not in start_methods and "fork" not in start_methods
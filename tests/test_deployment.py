@@ -0,0 +1,54 @@
+from snowflake_module import AWSExternalStageParams, CSVFileFormat, Deployer, Stage, StateCache
+
+def csv_format(fake, **options):
+    return CSVFileFormat("fmt", "DB", "PUBLIC", fake.cursor(), {"field_delimiter": ",", **options})
+
+def aws_stage(**fields):
+    params = AWSExternalStageParams(url="s3://bucket/data", encryption_type=None)
+    return Stage(name="DB.PUBLIC.ST", type="aws", aws_params=params, **fields)
+
+def deployer(fake):
+    return Deployer(fake.cursor(), cache=StateCache())
+
+def test_missing_objects_are_created(fake):
+    plan = deployer(fake).deploy([csv_format(fake)], [aws_stage()])
+
+    assert [change.action for change in plan.changes] == ["create", "create"]
+    assert "DB.PUBLIC.FMT" in fake.file_formats and "DB.PUBLIC.ST" in fake.stages
+
+def test_replanning_deployed_objects_is_unchanged(fake):
+    deployer(fake).deploy([csv_format(fake)], [aws_stage(comment="raw")])
+    statements = len(fake.statements)
+
+    plan = deployer(fake).plan([csv_format(fake)], [aws_stage(comment="raw")])
+
+    assert [change.action for change in plan.changes] == ["unchanged", "unchanged"]
+    assert plan.statements == []
+    assert deployer(fake).apply(plan) == []
+    # Only the two SHOW statements of the fresh deployer ran.
+    assert len(fake.statements) == statements + 2
+
+def test_changed_options_are_altered(fake):
+    deployer(fake).deploy([csv_format(fake)], [aws_stage(comment="raw")])
+
+    plan = deployer(fake).deploy([csv_format(fake, field_delimiter="|")], [aws_stage(comment="landing")])
+
+    assert [change.action for change in plan.changes] == ["alter", "alter"]
+    assert plan.statements == [
+        "ALTER FILE FORMAT DB.PUBLIC.fmt SET FIELD_DELIMITER = '|'",
+        "ALTER STAGE DB.PUBLIC.ST SET COMMENT = 'landing'",
+    ]
+    replan = deployer(fake).plan([csv_format(fake, field_delimiter="|")], [aws_stage(comment="landing")])
+    assert replan.pending == []
+
+def test_hidden_stage_properties_are_unverified(fake):
+    deployer(fake).deploy(stages=[aws_stage()])
+
+    stage = aws_stage(file_format="DB.PUBLIC.FMT", directory_params={"enable": True})
+    stage.aws_params.encryption_type = "AWS_SSE_S3"
+    plan = deployer(fake).plan(stages=[stage])
+
+    change = plan.changes[0]
+    assert change.action == "unverified"
+    assert change.unverified == ["FILE_FORMAT", "ENCRYPTION", "DIRECTORY"]
+    assert plan.pending == []
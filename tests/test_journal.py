@@ -0,0 +1,149 @@
+import json
+import os
+
+from snowflake_module import (
+    CopyIntoCommand,
+    FakeSnowflake,
+    FileCoalescer,
+    FileCompressor,
+    FileSplitter,
+    JobJournal,
+    PutCommand,
+    PutCopyPipeline,
+)
+
+def test_rerun_skips_files_uploaded_before_a_failure(make_files, tmp_path, seen):
+    make_files(10)
+    journal_path = str(tmp_path / "job.journal")
+    failing = FakeSnowflake(root=str(tmp_path / "account"), fail_on=r"f000[7-9]\.csv")
+    command = PutCommand("DB", "PUBLIC", failing.cursor(), "@st", {})
+    with JobJournal(journal_path, batch_size=3) as journal:
+        summary = command.execute_concurrent(
+            str(tmp_path / "source"), cursor_factory=failing.cursor, max_workers=2, journal=journal
+        )
+    assert len(summary.failed) == 3
+
+    fake = FakeSnowflake(root=str(tmp_path / "account"))
+    with JobJournal(journal_path) as journal:
+        PutCommand("DB", "PUBLIC", fake.cursor(), "@st", {}).execute(
+            str(tmp_path / "source"), transforms=[seen], journal=journal
+        )
+
+    # Recorded source files are skipped before the transforms see them.
+    assert sorted(os.path.basename(path) for path in seen.paths) == ["f0007.csv", "f0008.csv", "f0009.csv"]
+
+def test_torn_last_line_is_dropped(tmp_path):
+    path = str(tmp_path / "job.journal")
+    with JobJournal(path) as journal:
+        journal.record("put", "@st", ["a", "b"])
+    with open(path, "a", encoding="utf-8") as handle:
+        handle.write('{"kind":"put","scope":"@st","keys":["c"')
+
+    with JobJournal(path) as journal:
+        assert journal.completed("put", "@st") == {"a", "b"}
+        journal.record("put", "@st", ["d"])
+
+    with JobJournal(path) as journal:
+        assert journal.completed("put", "@st") == {"a", "b", "d"}
+
+def test_compaction_keeps_every_key(tmp_path):
+    path = str(tmp_path / "job.journal")
+    with JobJournal(path, compact_every=5) as journal:
+        for index in range(12):
+            journal.record("put", "@st", [f"k{index}"])
+        assert journal.done("put", "@st", "k11")
+
+    with open(path, encoding="utf-8") as handle:
+        lines = [json.loads(line) for line in handle]
+    assert len(lines) < 12
+    assert not os.path.exists(f"{path}.tmp")
+    with JobJournal(path) as journal:
+        assert journal.completed("put", "@st") == {f"k{index}" for index in range(12)}
+
+def test_complete_deletes_the_journal(tmp_path):
+    path = str(tmp_path / "job.journal")
+    journal = JobJournal(path)
+    journal.add("copy", "DB.PUBLIC.T", "key")
+    journal.complete()
+    assert not os.path.exists(path)
+
+def test_rerun_skips_copy_batches_already_loaded(fake, make_files, tmp_path):
+    make_files(6)
+    PutCommand("DB", "PUBLIC", fake.cursor(), "@st", {}).execute(str(tmp_path / "source"))
+    command = CopyIntoCommand(
+        "DB", "PUBLIC", "T", fake.cursor(), "@st", files=fake.staged_files("@st"), max_files_per_copy=2
+    )
+    journal_path = str(tmp_path / "job.journal")
+
+    def copies():
+        return [sql for sql in fake.statements if sql.startswith("COPY")]
+
+    with JobJournal(journal_path) as journal:
+        assert command.execute_batches(journal=journal).ok
+    assert len(copies()) == 3
+
+    with JobJournal(journal_path) as journal:
+        command.execute_batches(journal=journal)
+    assert len(copies()) == 3
+    assert fake.rows_loaded["DB.PUBLIC.T"] == 18
+
+def puts(fake):
+    return [sql for sql in fake.statements if sql.startswith("PUT")]
+
+def test_rerun_with_a_compressor_skips_compressed_uploads(fake, make_files, tmp_path):
+    make_files(5)
+    journal_path = str(tmp_path / "job.journal")
+    command = PutCommand("DB", "PUBLIC", fake.cursor(), "@st", {})
+
+    for _ in range(2):
+        compressor = FileCompressor(str(tmp_path / "scratch"), max_workers=1)
+        with JobJournal(journal_path) as journal:
+            command.execute(str(tmp_path / "source"), transforms=[compressor], journal=journal)
+
+    assert len(puts(fake)) == 5
+    with JobJournal(journal_path) as journal:
+        assert {os.path.basename(key) for key in journal.completed("put", "@st")} == {
+            f"f{index:04d}.csv" for index in range(5)
+        }
+
+def test_rerun_with_a_coalescer_skips_bundled_uploads(fake, make_files, tmp_path):
+    make_files(6)
+    journal_path = str(tmp_path / "job.journal")
+    command = PutCommand("DB", "PUBLIC", fake.cursor(), "@st", {})
+
+    for _ in range(2):
+        with JobJournal(journal_path) as journal:
+            command.execute_concurrent(
+                str(tmp_path / "source"), transforms=[FileCoalescer(str(tmp_path / "bundles"))],
+                cursor_factory=fake.cursor, max_workers=2, journal=journal,
+            )
+
+    assert len(puts(fake)) == 1
+
+def test_split_file_is_journaled_only_once_every_chunk_is_staged(make_files, tmp_path):
+    make_files(2, rows=40)
+    journal_path = str(tmp_path / "job.journal")
+    # The second chunk of f0001.csv fails to upload.
+    failing = FakeSnowflake(root=str(tmp_path / "account"), fail_on=r"f0001\.\w+\.part0002")
+    splitter = FileSplitter(str(tmp_path / "chunks"), num_chunks=3, split_threshold=1)
+    with JobJournal(journal_path) as journal:
+        summary = PutCommand("DB", "PUBLIC", failing.cursor(), "@st", {}).execute_concurrent(
+            str(tmp_path / "source"), transforms=[splitter], cursor_factory=failing.cursor, max_workers=2, journal=journal
+        )
+        assert len(summary.failed) == 1
+        assert {os.path.basename(key) for key in journal.completed("put", "@st")} == {"f0000.csv"}
+
+def test_pipeline_rerun_with_a_compressor_loads_nothing_twice(fake, make_files, tmp_path):
+    make_files(6, rows=1)
+    journal_path = str(tmp_path / "job.journal")
+    for _ in range(2):
+        put = PutCommand("DB", "PUBLIC", fake.cursor(), "@st", {})
+        copy = CopyIntoCommand("DB", "PUBLIC", "T", fake.cursor(), "@st")
+        pipeline = PutCopyPipeline(put, copy, cursor_factory=fake.cursor, batch_size=2)
+        compressor = FileCompressor(str(tmp_path / "scratch"), max_workers=1)
+        with JobJournal(journal_path) as journal:
+            assert pipeline.run(str(tmp_path / "source"), transforms=[compressor], journal=journal).ok
+
+    assert len(puts(fake)) == 6
+    assert len([sql for sql in fake.statements if sql.startswith("COPY")]) == 3
+    assert fake.rows_loaded["DB.PUBLIC.T"] == 6
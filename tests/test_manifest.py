@@ -0,0 +1,51 @@
+from snowflake_module import FakeSnowflake, FileCoalescer, FileCompressor, PutCommand, UploadManifest
+
+def puts(fake):
+    return [sql for sql in fake.statements if sql.startswith("PUT")]
+
+def test_rerun_skips_recorded_files(fake, make_files, tmp_path):
+    make_files(10)
+    command = PutCommand("DB", "PUBLIC", fake.cursor(), "@st", {})
+    with UploadManifest(str(tmp_path / "manifest.db")) as manifest:
+        command.execute(str(tmp_path / "source"), manifest=manifest)
+        command.execute(str(tmp_path / "source"), manifest=manifest)
+
+        assert manifest.skipped == 10
+    assert len(puts(fake)) == 10
+
+def test_failed_uploads_are_retried(make_files, tmp_path):
+    fake = FakeSnowflake(root=str(tmp_path / "account"), fail_on=r"f000[0-2]\.csv")
+    make_files(10)
+    command = PutCommand("DB", "PUBLIC", fake.cursor(), "@st", {})
+    with UploadManifest(str(tmp_path / "manifest.db")) as manifest:
+        summary = command.execute_concurrent(
+            str(tmp_path / "source"), cursor_factory=fake.cursor, max_workers=2, manifest=manifest
+        )
+        assert len(summary.failed) == 3
+
+        rerun = command.execute_concurrent(
+            str(tmp_path / "source"), cursor_factory=fake.cursor, max_workers=2, manifest=manifest
+        )
+        assert manifest.skipped == 7 and rerun.total == 3
+
+def test_compressed_files_are_recorded_by_source(fake, make_files, tmp_path):
+    make_files(5)
+    command = PutCommand("DB", "PUBLIC", fake.cursor(), "@st", {})
+    with UploadManifest(str(tmp_path / "manifest.db")) as manifest:
+        for _ in range(2):
+            compressor = FileCompressor(str(tmp_path / "scratch"), max_workers=1)
+            command.execute(str(tmp_path / "source"), transforms=[compressor], manifest=manifest)
+
+        assert manifest.skipped == 5
+    assert len(puts(fake)) == 5
+
+def test_coalesced_files_are_recorded_by_source(fake, make_files, tmp_path):
+    make_files(10)
+    command = PutCommand("DB", "PUBLIC", fake.cursor(), "@st", {})
+    with UploadManifest(str(tmp_path / "manifest.db")) as manifest:
+        for _ in range(2):
+            coalescer = FileCoalescer(str(tmp_path / "bundles"))
+            command.execute(str(tmp_path / "source"), transforms=[coalescer], manifest=manifest)
+
+        assert manifest.skipped == 10
+    assert len(puts(fake)) == 1
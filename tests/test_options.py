@@ -0,0 +1,31 @@
+from snowflake_module import AWSExternalStageParams, CopyOptions, CSVFileFormatOptions, Stage
+from snowflake_module.options import _VALIDATED_CACHE
+
+def test_stages_have_no_trusted_path():
+    # Stages are mutable, so they cannot be shared, and copying one costs more than validating it.
+    assert not hasattr(Stage, "from_trusted")
+    assert not hasattr(AWSExternalStageParams, "from_trusted")
+
+def test_trusted_options_are_shared_and_immutable():
+    first = CopyOptions.from_trusted({"on_error": "CONTINUE"})
+    assert CopyOptions.from_trusted({"on_error": "CONTINUE"}) is first
+
+def test_trusted_cache_keys_hold_no_values():
+    CopyOptions.from_trusted({"on_error": "SECRET_VALUE_123"})
+    assert not any("SECRET_VALUE_123" in repr(key) for key in _VALIDATED_CACHE._entries)
+
+def test_equality_ignores_rendered_memo():
+    rendered = CSVFileFormatOptions(skip_header=1, null_if=["NULL"])
+    fresh = CSVFileFormatOptions(skip_header=1, null_if=["NULL"])
+    rendered.sql_fragments()
+    rendered.to_sql_clause()
+
+    assert rendered == fresh and hash(rendered) == hash(fresh)
+    assert len({rendered, fresh}) == 1
+    assert {rendered: "x"}[fresh] == "x"
+    assert rendered != CSVFileFormatOptions(skip_header=2, null_if=["NULL"])
+
+def test_list_options_are_immutable():
+    options = CSVFileFormatOptions(null_if=["NULL", ""])
+    assert options.null_if == ("NULL", "")
+    assert "NULL_IF = ('NULL', '')" in options.to_sql_options()
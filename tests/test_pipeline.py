@@ -0,0 +1,101 @@
+import os
+import threading
+
+import pytest
+
+from snowflake_module import CopyIntoCommand, CursorPool, JobJournal, PutCommand, PutCopyPipeline, UploadManifest
+
+def run_with_timeout(func, timeout=20):
+    outcome = {}
+
+    def target():
+        try:
+            outcome["value"] = func()
+        except BaseException as exc:  # surfaced to the test below
+            outcome["error"] = exc
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "pipeline run hung"
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["value"]
+
+def make_pipeline(fake, **kwargs):
+    put = PutCommand("DB", "PUBLIC", fake.cursor(), "@st/daily", {})
+    copy = CopyIntoCommand("DB", "PUBLIC", "T", fake.cursor(), "@st")
+    return PutCopyPipeline(put, copy, cursor_factory=fake.cursor, **kwargs)
+
+def test_pipeline_uploads_and_loads_every_file(fake, make_files, tmp_path):
+    make_files(55, rows=2)
+    summary = run_with_timeout(
+        lambda: make_pipeline(fake, batch_size=10, max_in_flight=2).run(str(tmp_path / "source"))
+    )
+    assert summary.ok
+    assert summary.put.total == 55 and summary.copy.total == 6
+    assert fake.rows_loaded["DB.PUBLIC.T"] == 110
+
+def test_failed_uploads_are_left_out_of_their_copy(make_files, tmp_path):
+    from snowflake_module import FakeSnowflake
+
+    fake = FakeSnowflake(root=str(tmp_path / "account"), fail_on=r"PUT .*f000[0-2]\.csv")
+    make_files(10, rows=1)
+    summary = run_with_timeout(lambda: make_pipeline(fake, batch_size=5).run(str(tmp_path / "source")))
+    assert len(summary.put.failed) == 3 and summary.copy.ok
+    assert fake.rows_loaded["DB.PUBLIC.T"] == 7
+
+def test_failing_manifest_does_not_deadlock_the_pipeline(fake, make_files, tmp_path):
+    make_files(12)
+
+    class BrokenManifest(UploadManifest):
+        def record(self, file_path):
+            raise OSError("disk full")
+
+    with BrokenManifest(str(tmp_path / "manifest.db")) as manifest:
+        summary = run_with_timeout(
+            lambda: make_pipeline(fake, batch_size=4, max_in_flight=1).run(str(tmp_path / "source"), manifest=manifest)
+        )
+
+    assert summary.put.total == 12 and len(summary.put.failed) == 12
+    assert all("disk full" in result.error for result in summary.put.failed)
+
+def test_pipeline_with_a_shared_pool(fake, make_files, tmp_path):
+    make_files(20)
+    with CursorPool(fake.cursor, max_size=4) as pool:
+        put = PutCommand("DB", "PUBLIC", pool, "@st", {})
+        copy = CopyIntoCommand("DB", "PUBLIC", "T", pool, "@st")
+        summary = run_with_timeout(lambda: PutCopyPipeline(put, copy, batch_size=5).run(str(tmp_path / "source")))
+    assert summary.ok and summary.copy.total == 4
+
+def test_failed_run_is_not_reported_as_finished(fake, tmp_path, caplog):
+    (tmp_path / "empty").mkdir()
+
+    with pytest.raises(ValueError):
+        run_with_timeout(lambda: make_pipeline(fake).run(str(tmp_path / "empty")))
+
+    assert "aborted: 0 files" in caplog.text
+    assert "finished" not in caplog.text
+
+def test_pipeline_progress_counts_uploaded_bytes(fake, make_files, tmp_path, progress_loggers):
+    total = sum(os.path.getsize(path) for path in make_files(6))
+
+    run_with_timeout(lambda: make_pipeline(fake, batch_size=2).run(str(tmp_path / "source")))
+
+    assert [(progress.count, progress.bytes) for progress in progress_loggers] == [(6, total)]
+
+def test_journaled_rerun_drops_loaded_files_before_transforms(fake, make_files, tmp_path, seen):
+    make_files(8, rows=1)
+    journal_path = str(tmp_path / "job.journal")
+    with JobJournal(journal_path) as journal:
+        run_with_timeout(lambda: make_pipeline(fake, batch_size=3).run(str(tmp_path / "source"), journal=journal))
+    make_files(10, rows=1)
+
+    with JobJournal(journal_path) as journal:
+        summary = run_with_timeout(
+            lambda: make_pipeline(fake, batch_size=3).run(str(tmp_path / "source"), transforms=[seen], journal=journal)
+        )
+
+    assert sorted(os.path.basename(path) for path in seen.paths) == ["f0008.csv", "f0009.csv"]
+    assert summary.put.total == 2
+    assert fake.rows_loaded["DB.PUBLIC.T"] == 10
@@ -0,0 +1,45 @@
+import threading
+import time
+
+from snowflake_module import CursorPool, PutCommand
+
+def test_pool_bounds_concurrent_cursors(fake):
+    pool = CursorPool(fake.cursor, max_size=2)
+    in_use = []
+    peak = []
+    lock = threading.Lock()
+
+    def work():
+        with pool.checkout() as cursor:
+            with lock:
+                in_use.append(cursor)
+                peak.append(len(in_use))
+            time.sleep(0.02)
+            with lock:
+                in_use.remove(cursor)
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert max(peak) <= 2 and pool.size <= 2
+    pool.close()
+
+def test_closed_cursors_are_replaced(fake):
+    pool = CursorPool(fake.cursor, max_size=1)
+    with pool.checkout() as cursor:
+        first = cursor
+    first.close()
+    with pool.checkout() as cursor:
+        assert cursor is not first and not cursor.is_closed()
+    pool.close()
+
+def test_commands_share_a_pool(fake, make_files, tmp_path):
+    make_files(20)
+    with CursorPool(fake.cursor, max_size=3) as pool:
+        summary = PutCommand("DB", "PUBLIC", pool, "@st", {}).execute_concurrent(
+            str(tmp_path / "source"), max_workers=4
+        )
+    assert summary.ok and len(fake.staged_files("@st")) == 20
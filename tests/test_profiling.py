@@ -0,0 +1,48 @@
+import os
+import threading
+
+from snowflake_module import PutCommand, RunProfiler
+
+def test_concurrent_workers_are_charged_to_the_run(fake, make_files, tmp_path):
+    make_files(12)
+    command = PutCommand("DB", "PUBLIC", fake.cursor(), "@st", {})
+
+    with RunProfiler("put", str(tmp_path / "profiles"), memory=False) as profiler:
+        command.execute_concurrent(str(tmp_path / "source"), cursor_factory=fake.cursor, max_workers=3)
+
+    assert profiler.phases["execute"][1] == 12
+    assert os.path.exists(profiler.summary_path)
+
+def test_unrelated_threads_are_not_merged_into_a_run(fake, make_files, tmp_path):
+    make_files(5)
+    command = PutCommand("DB", "PUBLIC", fake.cursor(), "@st", {}, profile=False)
+
+    with RunProfiler("idle", str(tmp_path / "profiles"), memory=False) as profiler:
+        thread = threading.Thread(target=command.execute, args=(str(tmp_path / "source"),))
+        thread.start()
+        thread.join()
+
+    assert profiler.phases["execute"][1] == 0
+
+def test_second_profiled_run_falls_back_to_unprofiled(fake, make_files, tmp_path):
+    make_files(5)
+    output_dir = tmp_path / "profiles"
+    command = PutCommand("DB", "PUBLIC", fake.cursor(), "@st", {}, profile=str(output_dir))
+    started, release = threading.Event(), threading.Event()
+
+    def hold_profiler():
+        with RunProfiler("holder", str(output_dir), memory=False):
+            started.set()
+            release.wait(10)
+
+    holder = threading.Thread(target=hold_profiler)
+    holder.start()
+    started.wait(10)
+    try:
+        command.execute(str(tmp_path / "source"))
+    finally:
+        release.set()
+        holder.join()
+
+    assert len(fake.staged_files("@st")) == 5
+    assert [name for name in os.listdir(output_dir) if name.startswith("put-")] == []
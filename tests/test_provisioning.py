@@ -0,0 +1,56 @@
+import pytest
+
+from snowflake_module import FakeSnowflake, ProvisioningPlan
+from snowflake_module.provisioning import ProvisioningNode
+
+def spec(**target):
+    return {"targets": [{"database": "DB", "schema": "PUBLIC", **target}]}
+
+FILE_FORMATS = [{"name": "csv", "type": "CSV", "options": {"field_delimiter": ","}}]
+STAGES = [{"name": "st", "type": "internal", "file_format": "csv"}]
+LOADS = [
+    {"table": "t", "stage": "st", "file_format": "csv", "pattern": ".*a.*"},
+    {"table": "t", "stage": "st", "file_format": "csv", "pattern": ".*b.*"},
+]
+SPEC = spec(file_formats=FILE_FORMATS, stages=STAGES, loads=LOADS)
+
+def kinds(fake):
+    return [sql.split()[0] + " " + sql.split()[1] for sql in fake.statements]
+
+def test_nodes_run_after_their_dependencies(tmp_path):
+    # A strict backend rejects COPY from a stage that was not created yet.
+    fake = FakeSnowflake(root=str(tmp_path / "account"), strict=True)
+    report = ProvisioningPlan.from_spec(SPEC, fake.cursor()).execute(max_parallelism=4)
+
+    assert report.ok and len(report.results) == 4
+    assert kinds(fake) == ["CREATE FILE", "CREATE STAGE", "COPY INTO", "COPY INTO"]
+
+def test_dependents_of_a_failed_node_are_skipped(tmp_path):
+    fake = FakeSnowflake(root=str(tmp_path / "account"), fail_on=r"FILE FORMAT DB\.PUBLIC\.csv")
+    stages = STAGES + [{"name": "other", "type": "internal"}]
+    plan = ProvisioningPlan.from_spec(spec(file_formats=FILE_FORMATS, stages=stages, loads=LOADS), fake.cursor())
+
+    report = plan.execute()
+
+    assert len(report.by_status("failed")) == 1
+    assert len(report.by_status("skipped")) == 3
+    assert [result.key for result in report.by_status("success")] == [("stage", "DB", "PUBLIC", "other")]
+    assert not any(sql.startswith("COPY") for sql in fake.statements)
+
+def test_dependency_cycles_are_rejected():
+    first, second = ("stage", "DB", "S", "a"), ("stage", "DB", "S", "b")
+    nodes = {
+        first: ProvisioningNode(first, None, lambda: None, [second]),
+        second: ProvisioningNode(second, None, lambda: None, [first]),
+    }
+    with pytest.raises(ValueError, match="cycle"):
+        ProvisioningPlan(nodes)
+
+def test_stage_entries_map_create_flags_and_reject_unknown_keys(fake):
+    stages = [{"name": "st", "type": "internal", "if_not_exists": True}]
+    ProvisioningPlan.from_spec(spec(stages=stages), fake.cursor()).execute()
+    assert ProvisioningPlan.from_spec(spec(stages=stages), fake.cursor()).execute().ok
+    assert fake.statements[0].startswith("CREATE STAGE IF NOT EXISTS DB.PUBLIC.st")
+
+    with pytest.raises(ValueError, match="commnet"):
+        ProvisioningPlan.from_spec(spec(stages=[{"name": "st", "type": "internal", "commnet": "x"}]), fake.cursor())
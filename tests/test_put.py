@@ -0,0 +1,137 @@
+import os
+import threading
+
+import pytest
+
+from snowflake_module import PutCommand, SnowflakeError
+
+def test_execute_concurrent_uploads_every_file(fake, make_files, tmp_path):
+    make_files(50, subdirectories=5)
+    command = PutCommand("DB", "PUBLIC", fake.cursor(), "@st/daily", {})
+
+    summary = command.execute_concurrent(str(tmp_path / "source"), cursor_factory=fake.cursor, max_workers=4)
+
+    assert summary.ok and summary.total == 50
+    assert len(fake.staged_files("@st")) == 50
+
+def test_execute_concurrent_records_failures_per_file(make_files, tmp_path):
+    from snowflake_module import FakeSnowflake
+
+    fake = FakeSnowflake(root=str(tmp_path / "account"), fail_on=r"f000[0-4]\.csv")
+    make_files(20)
+    command = PutCommand("DB", "PUBLIC", fake.cursor(), "@st", {})
+
+    summary = command.execute_concurrent(str(tmp_path / "source"), cursor_factory=fake.cursor, max_workers=3)
+
+    assert summary.total == 20
+    assert sorted(os.path.basename(result.file_path) for result in summary.failed) == [
+        f"f000{index}.csv" for index in range(5)
+    ]
+
+def test_failing_cursor_factory_does_not_block_the_scan(fake, make_files, tmp_path):
+    make_files(40)
+    command = PutCommand("DB", "PUBLIC", fake.cursor(), "@st", {})
+
+    def broken_factory():
+        raise RuntimeError("no connection")
+
+    result = {}
+    thread = threading.Thread(
+        target=lambda: result.update(summary=command.execute_concurrent(
+            str(tmp_path / "source"), cursor_factory=broken_factory, max_workers=2, queue_size=2
+        )),
+        daemon=True,
+    )
+    thread.start()
+    thread.join(timeout=10)
+
+    assert not thread.is_alive()
+    assert result["summary"].total == 40 and len(result["summary"].failed) == 40
+
+def test_each_worker_gets_its_own_cursor(fake, make_files, tmp_path):
+    make_files(30)
+    created = []
+
+    def factory():
+        cursor = fake.cursor()
+        created.append(cursor)
+        return cursor
+
+    command = PutCommand("DB", "PUBLIC", fake.cursor(), "@st", {})
+    command.execute_concurrent(str(tmp_path / "source"), cursor_factory=factory, max_workers=3)
+
+    assert 1 <= len(created) <= 3
+    assert all(cursor.is_closed() for cursor in created)
+
+def test_concurrent_upload_requires_a_factory_or_pool(fake, make_files, tmp_path):
+    make_files(1)
+    command = PutCommand("DB", "PUBLIC", fake.cursor(), "@st", {})
+    with pytest.raises(ValueError):
+        command.execute_concurrent(str(tmp_path / "source"))
+
+def test_sequential_execute_raises_on_failure(make_files, tmp_path, caplog):
+    from snowflake_module import FakeSnowflake
+
+    fake = FakeSnowflake(root=str(tmp_path / "account"), fail_on="PUT")
+    make_files(2)
+    with pytest.raises(SnowflakeError):
+        PutCommand("DB", "PUBLIC", fake.cursor(), "@st", {}).execute(str(tmp_path / "source"))
+
+    assert "PUT to '@st' aborted" in caplog.text
+    assert "finished" not in caplog.text
+
+def test_empty_directory_is_rejected(fake, tmp_path):
+    (tmp_path / "empty").mkdir()
+    command = PutCommand("DB", "PUBLIC", fake.cursor(), "@st", {})
+    with pytest.raises(ValueError):
+        command.execute_concurrent(str(tmp_path / "empty"), cursor_factory=fake.cursor)
+
+def test_unreadable_directories_are_skipped(fake, make_files, tmp_path, monkeypatch, caplog):
+    make_files(6, subdirectories=2)
+    unreadable = str(tmp_path / "source" / "d1")
+    scandir = os.scandir
+
+    def failing_scandir(path):
+        if path == unreadable:
+            raise PermissionError(13, "Permission denied", path)
+        return scandir(path)
+
+    monkeypatch.setattr(os, "scandir", failing_scandir)
+    command = PutCommand("DB", "PUBLIC", fake.cursor(), "@st", {})
+    summary = command.execute_concurrent(str(tmp_path / "source"), cursor_factory=fake.cursor)
+
+    assert summary.ok and summary.total == 3
+    assert "Skipping unreadable directory" in caplog.text
+
+def test_file_transform_requires_transform():
+    from snowflake_module import FileTransform
+
+    class Incomplete(FileTransform):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+def test_custom_transform_filters_uploads(fake, make_files, tmp_path):
+    from snowflake_module import FileTransform
+
+    class EvenOnly(FileTransform):
+        def transform(self, file_paths):
+            return (path for path in file_paths if int(path[-6:-4]) % 2 == 0)
+
+    make_files(10)
+    PutCommand("DB", "PUBLIC", fake.cursor(), "@st", {}).execute(str(tmp_path / "source"), transforms=[EvenOnly()])
+
+    assert len(fake.staged_files("@st")) == 5
+
+@pytest.mark.parametrize("concurrent", [False, True])
+def test_progress_counts_uploaded_bytes(fake, make_files, tmp_path, progress_loggers, concurrent):
+    total = sum(os.path.getsize(path) for path in make_files(8))
+    command = PutCommand("DB", "PUBLIC", fake.cursor(), "@st", {})
+
+    if concurrent:
+        command.execute_concurrent(str(tmp_path / "source"), cursor_factory=fake.cursor, max_workers=2)
+    else:
+        command.execute(str(tmp_path / "source"))
+
+    assert [(progress.count, progress.bytes) for progress in progress_loggers] == [(8, total)]
@@ -0,0 +1,67 @@
+import csv
+import io
+import os
+
+from snowflake_module import CSVFileFormatOptions, FileSplitter, PutCommand
+
+def write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", newline="") as handle:
+        handle.write(text)
+
+def read_records(paths, header_lines=0):
+    records = []
+    for path in paths:
+        with open(path, newline="") as handle:
+            rows = list(csv.reader(handle, escapechar="\\", doublequote=True))
+        records.extend(rows[header_lines:])
+    return records
+
+def test_same_file_name_in_two_directories_does_not_collide(tmp_path, fake):
+    for directory in ("a", "b"):
+        write(str(tmp_path / "source" / directory / "data.csv"), "".join(f"{directory},{i}\n" for i in range(200)))
+    splitter = FileSplitter(str(tmp_path / "chunks"), num_chunks=4, split_threshold=1)
+
+    chunks = list(splitter.transform([
+        str(tmp_path / "source" / "a" / "data.csv"),
+        str(tmp_path / "source" / "b" / "data.csv"),
+    ]))
+
+    assert len(chunks) == len(set(chunks)) == 8
+    assert len({os.path.basename(chunk) for chunk in chunks}) == 8
+    assert sorted(read_records(chunks)) == sorted(
+        [directory, str(i)] for directory in ("a", "b") for i in range(200)
+    )
+
+    command = PutCommand("DB", "PUBLIC", fake.cursor(), "@st", {})
+    command.execute(str(tmp_path / "source"), transforms=[splitter])
+    assert len(fake.staged_files("@st")) == 8
+
+def test_escaped_quote_does_not_flip_quote_state(tmp_path):
+    # Every record has an escaped quote followed by an embedded newline; a
+    # parity count that ignores ESCAPE would cut inside the quoted field.
+    records = [f'{i},"say \\"hi\nthere",end\n' for i in range(300)]
+    source = str(tmp_path / "escaped.csv")
+    write(source, "".join(records))
+    options = CSVFileFormatOptions(field_optionally_enclosed_by='"', escape="\\")
+    splitter = FileSplitter(str(tmp_path / "chunks"), options, num_chunks=7, split_threshold=1)
+
+    chunks = list(splitter.transform([source]))
+
+    assert len(chunks) > 1
+    for chunk in chunks:
+        with open(chunk, newline="") as handle:
+            assert handle.read().count("\n") % 2 == 0
+    assert read_records(chunks) == list(csv.reader(io.StringIO("".join(records)), escapechar="\\"))
+
+def test_header_is_repeated_in_every_chunk(tmp_path):
+    source = str(tmp_path / "with_header.csv")
+    write(source, "id,value\n" + "".join(f"{i},{i * 2}\n" for i in range(100)))
+    options = CSVFileFormatOptions(skip_header=1)
+    chunks = list(FileSplitter(str(tmp_path / "chunks"), options, num_chunks=3, split_threshold=1).transform([source]))
+
+    assert len(chunks) == 3
+    for chunk in chunks:
+        with open(chunk) as handle:
+            assert handle.readline() == "id,value\n"
+    assert len(read_records(chunks, header_lines=1)) == 100